@@ -0,0 +1,329 @@
+# bench_texas.py
+# Banc de performance de texas.py : génération, familles _simulate_*, tendances,
+# insights, rendu des figures et ensembles, paramétrés par région, horizon,
+# fréquence et nombre de scénarios. Les résultats s'ajoutent à un historique JSON
+# et la sous-commande compare signale les régressions entre deux exécutions.
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+import texas
+
+HISTORY_FILE = 'bench_history.json'
+
+# Seuil de régression par défaut (rapport des médianes nouvelle / référence)
+REGRESSION_THRESHOLD = 1.10
+
+# Durée minimale d'un échantillon : les appels rapides sont répétés dans la boucle
+MIN_SAMPLE_SECONDS = 0.05
+
+BENCH_SEED = 42
+
+# Grilles de paramètres (complète et rapide)
+GRID = {
+    'region': ['Austin Area', 'Houston Metro', 'Rio Grande Valley'],
+    'years': [24, 100],
+    'freq': ['annual', 'monthly'],
+    'scenarios': [1_000, 10_000],
+}
+QUICK_GRID = {
+    'region': ['Austin Area'],
+    'years': [24],
+    'freq': ['annual'],
+    'scenarios': [1_000],
+}
+
+# Familles de simulateurs, dans l'ordre des sections de COLUMN_GRAPH
+SIMULATE_FAMILIES = {
+    'demographics': ['Population', 'Households', 'Median_Income'],
+    'revenue': ['Total_Revenue', 'Property_Tax_Revenue', 'State_Federal_Funding',
+                'Business_Tax_Revenue', 'Energy_Revenue', 'Other_Revenue'],
+    'expenses': ['Total_Expenses', 'Infrastructure_Expenses', 'Public_Services_Expenses',
+                 'Education_Expenses', 'Healthcare_Expenses'],
+    'finance': ['Budget_Surplus_Deficit', 'Regional_Debt', 'Debt_to_Revenue_Ratio'],
+    'real_estate': ['Median_Home_Price', 'Price_per_Sqft', 'Home_Sales_Volume',
+                    'New_Construction_Permits', 'Rental_Vacancy_Rate', 'Average_Rent'],
+    'investment': ['Energy_Investment', 'Tech_Investment', 'Infrastructure_Investment',
+                   'Housing_Development_Investment', 'Manufacturing_Investment',
+                   'Agricultural_Investment'],
+}
+
+
+def _analyzer(region, years=24, freq='annual'):
+    """Analyseur à graine fixe sur un horizon de `years` années à partir de 2002"""
+    return texas.TexasRealEstateAnalyzer(region, seed=BENCH_SEED, start_year=2002,
+                                         end_year=2002 + years - 1, frequency=freq)
+
+
+def _quiet(function):
+    """Exécute function sans sortie console (les méthodes du module affichent leur progression)"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function()
+    return run
+
+
+def bench_generate_financial_data(region, years, freq):
+    """Génération complète du DataFrame"""
+    analyzer = _analyzer(region, years, freq)
+    
+    def run():
+        # Sans état incrémental : chaque appel recalcule toutes les colonnes
+        analyzer._previous = None
+        return analyzer.generate_financial_data()
+    return _quiet(run)
+
+
+def _bench_family(family):
+    """Fabrique le banc d'une famille de simulateurs _simulate_*"""
+    def bench(region, years, freq):
+        analyzer = _analyzer(region, years, freq)
+        grid, _ = analyzer._period_grid()
+        frame = _quiet(analyzer.generate_financial_data)()
+        calls = []
+        for column in SIMULATE_FAMILIES[family]:
+            method, inputs = texas.COLUMN_GRAPH[column]
+            args = [frame[dep].to_numpy() for dep in inputs]
+            calls.append((getattr(analyzer, method), args))
+        
+        def run():
+            for method, args in calls:
+                method(grid, *args)
+        return run
+    bench.__doc__ = f"Simulateurs de la famille {family}"
+    return bench
+
+
+def bench_trend_multipliers(region, years, freq):
+    """Compilation du calendrier des chocs en multiplicateurs (période × colonne)"""
+    analyzer = _analyzer(region, years, freq)
+    grid, _ = analyzer._period_grid()
+    columns = list(texas.COLUMN_GRAPH)
+    return lambda: analyzer._trend_multipliers(grid, columns)
+
+
+def bench_generate_texas_insights(region, years, freq):
+    """Calcul et affichage des insights"""
+    analyzer = _analyzer(region, years, freq)
+    frame = _quiet(analyzer.generate_financial_data)()
+    return _quiet(lambda: analyzer._generate_texas_insights(frame))
+
+
+def bench_create_financial_analysis(region, years, freq):
+    """Rendu des 10 graphiques (backend Agg, sans cache)"""
+    analyzer = _analyzer(region, years, freq)
+    frame = _quiet(analyzer.generate_financial_data)()
+    
+    def run():
+        with tempfile.TemporaryDirectory(prefix='texas-bench-') as output_dir:
+            analyzer.create_financial_analysis(frame, show=False, output_dir=output_dir, insights=False)
+    return _quiet(run)
+
+
+def bench_generate_ensemble(region, years, scenarios):
+    """Ensemble de scénarios résumé par centiles"""
+    analyzer = _analyzer(region, years)
+    return _quiet(lambda: analyzer.generate_ensemble(scenarios))
+
+
+# Nom -> (fabrique, paramètres de la grille)
+BENCHMARKS = {
+    'generate_financial_data': (bench_generate_financial_data, ('region', 'years', 'freq')),
+    **{f'simulate_{family}': (_bench_family(family), ('region', 'years', 'freq'))
+       for family in SIMULATE_FAMILIES},
+    'trend_multipliers': (bench_trend_multipliers, ('region', 'years', 'freq')),
+    'generate_texas_insights': (bench_generate_texas_insights, ('region', 'years', 'freq')),
+    'create_financial_analysis': (bench_create_financial_analysis, ('region', 'years', 'freq')),
+    'generate_ensemble': (bench_generate_ensemble, ('region', 'years', 'scenarios')),
+}
+
+# Bancs coûteux restreints au premier élément des paramètres non listés
+NARROW_PARAMS = {
+    'create_financial_analysis': ('freq',),
+    'generate_ensemble': ('scenarios',),
+}
+
+
+def _cases(name, grid):
+    """Combinaisons de paramètres d'un banc : (clé, paramètres)"""
+    _, params = BENCHMARKS[name]
+    narrow = NARROW_PARAMS.get(name)
+    axes = [grid[param] if narrow is None or param in narrow else grid[param][:1] for param in params]
+    for values in itertools.product(*axes):
+        case = dict(zip(params, values))
+        yield f"{name}[{','.join(f'{k}={v}' for k, v in case.items())}]", case
+
+
+def _time(run, repeat):
+    """Temps par appel (s) sur `repeat` échantillons, chaque échantillon durant au moins MIN_SAMPLE_SECONDS"""
+    started = time.perf_counter()
+    run()
+    number = max(1, int(MIN_SAMPLE_SECONDS / max(time.perf_counter() - started, 1e-9)))
+    
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - started) / number)
+    
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'repeat': repeat,
+        'number': number,
+    }
+
+
+def _git_commit():
+    """Commit courant du dépôt (None hors dépôt git)"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(texas.__file__)), check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def load_history(path=HISTORY_FILE):
+    """Charge l'historique des exécutions (liste vide si le fichier n'existe pas)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['runs']
+
+
+def save_history(runs, path=HISTORY_FILE):
+    """Réécrit l'historique de façon atomique"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def run_benchmarks(names=None, grid=GRID, repeat=5, label=None, history=HISTORY_FILE):
+    """Exécute les bancs demandés et ajoute leurs résultats à l'historique"""
+    names = names or list(BENCHMARKS)
+    results = {}
+    
+    for name in names:
+        factory, _ = BENCHMARKS[name]
+        for key, case in _cases(name, grid):
+            run = factory(**case)
+            results[key] = _time(run, repeat)
+            print(f"⏱️  {key}: {results[key]['median'] * 1e3:.2f} ms "
+                  f"(min {results[key]['min'] * 1e3:.2f} ms, x{results[key]['number']})")
+    
+    runs = load_history(history)
+    record = {
+        'id': len(runs),
+        'label': label,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    runs.append(record)
+    save_history(runs, history)
+    print(f"💾 Run {record['id']} saved to {history} ({len(results)} cases)")
+    return record
+
+
+def _find_run(runs, ref):
+    """Exécution désignée par son id, son label ou son commit (indices négatifs acceptés)"""
+    for run in runs:
+        if ref in (str(run['id']), run.get('label'), run.get('commit')):
+            return run
+    try:
+        return runs[int(ref)]
+    except (ValueError, IndexError):
+        raise KeyError(f"Unknown benchmark run: {ref}") from None
+
+
+def compare_runs(base, head, threshold=REGRESSION_THRESHOLD):
+    """Compare deux exécutions cas par cas et renvoie les régressions (clé, rapport)"""
+    print(f"📊 Run {base['id']} ({base.get('commit')}) -> run {head['id']} ({head.get('commit')})")
+    print(f"{'case':<70} {'base ms':>10} {'head ms':>10} {'ratio':>7}")
+    
+    regressions = []
+    for key in sorted(set(base['results']) & set(head['results'])):
+        before = base['results'][key]['median']
+        after = head['results'][key]['median']
+        ratio = after / before if before > 0 else float('inf')
+        flag = ''
+        if ratio > threshold:
+            flag = ' ❌'
+            regressions.append((key, ratio))
+        elif ratio < 1 / threshold:
+            flag = ' ✅'
+        print(f"{key:<70} {before * 1e3:>10.2f} {after * 1e3:>10.2f} {ratio:>7.2f}{flag}")
+    
+    missing = sorted(set(base['results']) ^ set(head['results']))
+    if missing:
+        print(f"⚠️  {len(missing)} cases only in one run")
+    print(f"{len(regressions)} regressions above x{threshold:.2f}")
+    return regressions
+
+
+def main(argv=None):
+    """Interface en ligne de commande du banc de performance"""
+    parser = argparse.ArgumentParser(description="Texas analysis benchmarks")
+    parser.add_argument('--history', default=HISTORY_FILE, help=f"history file (default: {HISTORY_FILE})")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    run = subparsers.add_parser('run', help="run benchmarks and append them to the history")
+    run.add_argument('names', nargs='*', metavar='NAME', help="benchmarks to run (default: all)")
+    run.add_argument('--quick', action='store_true', help="smallest parameter grid")
+    run.add_argument('--repeat', type=int, default=5, help="samples per case (default: 5)")
+    run.add_argument('--label', help="name for this run (e.g. a version number)")
+    
+    compare = subparsers.add_parser('compare', help="compare two runs and fail on regressions")
+    compare.add_argument('base', nargs='?', default='-2', help="base run id, label or commit (default: previous)")
+    compare.add_argument('head', nargs='?', default='-1', help="new run id, label or commit (default: latest)")
+    compare.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                         help=f"median time ratio counted as a regression (default: {REGRESSION_THRESHOLD})")
+    
+    subparsers.add_parser('list', help="list benchmarks and recorded runs")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'run':
+        unknown = [name for name in args.names if name not in BENCHMARKS]
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(unknown)} (see 'list')")
+        run_benchmarks(args.names, QUICK_GRID if args.quick else GRID, args.repeat, args.label, args.history)
+    elif args.command == 'compare':
+        runs = load_history(args.history)
+        if len(runs) < 2 and (args.base, args.head) == ('-2', '-1'):
+            sys.exit("Need at least two recorded runs to compare")
+        regressions = compare_runs(_find_run(runs, args.base), _find_run(runs, args.head), args.threshold)
+        if regressions:
+            sys.exit(1)
+    else:
+        for name, (factory, params) in BENCHMARKS.items():
+            print(f"{name:<28} {', '.join(params):<24} {factory.__doc__}")
+        for run in load_history(args.history):
+            print(f"run {run['id']}: {run['timestamp']} {run.get('commit') or ''} {run.get('label') or ''} "
+                  f"({len(run['results'])} cases)")
+
+
+if __name__ == "__main__":
+    main()
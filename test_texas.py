@@ -0,0 +1,443 @@
+"""Tests des simulations du Texas (petits nombres de scénarios)"""
+import contextlib
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import texas
+
+REGIONS = ["Austin Area", "West Texas", "Houston Metro"]
+COLUMNS = list(texas.COLUMN_GRAPH)
+
+
+def quiet(function, *args, **kwargs):
+    """Appelle function sans ses messages de progression"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+@pytest.mark.parametrize('options', [{}, {'frequency': 'quarterly'}, {'correlation': True}])
+def test_scenario_zero_matches_single_run(options):
+    analyzer = texas.TexasRealEstateAnalyzer("Austin Area", seed=11, **options)
+    data = quiet(analyzer.generate_financial_data)
+    draws = quiet(analyzer.generate_ensemble, 10, keep_draws=True)['draws']
+    for j, column in enumerate(COLUMNS):
+        np.testing.assert_array_equal(draws[0, :, j], data[column].to_numpy())
+
+
+@pytest.mark.parametrize('options', [{}, {'correlation': True}, {'stress': texas.StressScenarios(seed=3)}])
+def test_ensemble_independent_of_chunking(options):
+    analyzer = texas.TexasRealEstateAnalyzer("West Texas", seed=5, **options)
+    whole = quiet(analyzer.generate_ensemble, 300, keep_draws=True)['draws']
+    for chunk_size in (1, 7, 128):
+        blocks = [draws for _, draws in analyzer.iter_ensemble(300, chunk_size=chunk_size)]
+        np.testing.assert_array_equal(np.concatenate(blocks), whole)
+
+
+@pytest.mark.parametrize('options', [{}, {'correlation': True}, {'stress': texas.StressScenarios(seed=3)}])
+def test_threads_match_serial(options):
+    analyzer = texas.TexasRealEstateAnalyzer("Austin Area", seed=3, **options)
+    years, _ = analyzer._period_grid()
+    serial = dict(analyzer.iter_ensemble(800, chunk_size=50))
+    with ThreadPoolExecutor(8) as executor:
+        threaded = executor.map(lambda first: (first, analyzer._simulate_scenarios(years, first, first + 50)),
+                                range(0, 800, 50))
+        for first, block in threaded:
+            np.testing.assert_array_equal(block, serial[first])
+
+
+@pytest.mark.parametrize('options', [{}, {'frequency': 'monthly'}, {'correlation': True}])
+def test_panel_rows_match_single_regions(options):
+    panel = quiet(texas.TexasRegionPanel(REGIONS, seed=9, **options).generate_panel_data)
+    for region in REGIONS:
+        data = quiet(texas.TexasRealEstateAnalyzer(region, seed=9, **options).generate_financial_data)
+        rows = panel[panel['region'] == region]
+        for column in COLUMNS:
+            np.testing.assert_array_equal(rows[column].to_numpy(), data[column].to_numpy())
+
+
+def test_correlated_noise_follows_region_type():
+    analyzer = texas.TexasRealEstateAnalyzer("Austin Area", seed=6, correlation=True)
+    quiet(analyzer.generate_financial_data)
+    analyzer.update_config(type='energy_medical')
+    edited = quiet(analyzer.generate_financial_data)
+    fresh = texas.TexasRealEstateAnalyzer("Austin Area", seed=6, correlation=True)
+    fresh.update_config(type='energy_medical')
+    assert edited.equals(quiet(fresh.generate_financial_data))
+
+
+def test_noise_correlation_rejects_non_positive_definite():
+    columns = COLUMNS[:3]
+    pairs = {(columns[0], columns[1]): 0.99, (columns[1], columns[2]): 0.99, (columns[0], columns[2]): -0.99}
+    with pytest.raises(ValueError):
+        texas._noise_factor(texas.noise_correlation(pairs), 'tech_hub')
+
+
+def test_stress_metrics_independent_of_chunking():
+    analyzer = texas.TexasRealEstateAnalyzer("Houston Metro", seed=8)
+    stress = texas.StressScenarios(window=(2015, 2025), seed=8)
+    whole = quiet(analyzer.stress_test, 400, stress)
+    chunked = quiet(analyzer.stress_test, 400, stress, chunk_size=64)
+    assert whole['scenarios'].equals(chunked['scenarios'])
+    assert whole['metrics'] == chunked['metrics']
+    assert analyzer.stress is None
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_parallel_matches_serial(workers):
+    analyzer = texas.TexasRealEstateAnalyzer("Houston Metro", seed=2, correlation=True)
+    serial = quiet(analyzer.generate_ensemble, 500, keep_draws=True)
+    parallel = quiet(analyzer.generate_ensemble, 500, keep_draws=True, workers=workers)
+    np.testing.assert_array_equal(parallel['draws'], serial['draws'])
+    assert parallel['percentiles'].equals(serial['percentiles'])
+
+
+def test_shard_merge_matches_stream(tmp_path):
+    n_scenarios = texas.SCENARIO_CHUNK + 100
+    for shard_id in range(3):
+        quiet(texas.run_shard, REGIONS[:2], n_scenarios, 3, shard_id, seed=4, output_dir=tmp_path, bins=64)
+    merged = texas.merge_shards(tmp_path)
+    for region in REGIONS[:2]:
+        analyzer = texas.TexasRealEstateAnalyzer(region, seed=4)
+        streamed = quiet(analyzer.stream_ensemble, n_scenarios, bins=64)
+        for field in ('mean', 'std', 'percentiles'):
+            assert merged[region][field].equals(streamed[field])
+
+
+def test_cli_keeps_options_given_before_subcommand(monkeypatch):
+    calls = []
+    monkeypatch.setattr(texas, 'run_batch', lambda regions, **options: calls.append((regions, options)))
+    texas.main(['--seed', '5', '--no-plot', 'batch', '--regions', 'Austin Area'])
+    texas.main(['batch', '--regions', 'Austin Area', '--seed', '6'])
+    assert [(options['seed'], options['plot']) for _, options in calls] == [(5, False), (6, True)]
+    with pytest.raises(SystemExit):
+        texas.main(['--no-plot', 'stress'])
+
+
+def test_shard_cli_requires_seed(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        texas.main(['shard', '--shards', '2', '--shard-id', '0', '--out', str(tmp_path)])
+    assert '--seed is required' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('edit', [lambda analyzer: analyzer.update_config(prix_m2_base=9000),
+                                  lambda analyzer: analyzer.update_shocks(texas.TEXAS_SHOCKS[:2])])
+def test_insights_follow_edits(edit):
+    analyzer = texas.TexasRealEstateAnalyzer("Austin Area", seed=1)
+    quiet(analyzer.texas_insights)
+    edit(analyzer)
+    fresh = texas.TexasRealEstateAnalyzer("Austin Area", seed=1)
+    edit(fresh)
+    insights = quiet(analyzer.texas_insights)
+    assert insights == quiet(fresh.texas_insights)
+    assert insights == analyzer.texas_insights(quiet(analyzer.generate_financial_data))
+
+
+@pytest.mark.parametrize('edit, recomputed', [
+    ({'population_base': 8e6}, ['Population', 'Households', 'Home_Sales_Volume', 'New_Construction_Permits']),
+    ({'prix_m2_base': 3000}, ['Median_Home_Price', 'Price_per_Sqft', 'Average_Rent']),
+])
+def test_incremental_recompute_matches_full_run(edit, recomputed):
+    analyzer = texas.TexasRealEstateAnalyzer("Houston Metro", seed=1)
+    quiet(analyzer.generate_financial_data)
+    quiet(analyzer.generate_financial_data)
+    assert analyzer.recomputed == []
+    
+    analyzer.update_config(**edit)
+    edited = quiet(analyzer.generate_financial_data)
+    assert analyzer.recomputed == recomputed
+    fresh = texas.TexasRealEstateAnalyzer("Houston Metro", seed=1)
+    fresh.update_config(**edit)
+    assert edited.equals(quiet(fresh.generate_financial_data))
+    assert fresh.recomputed == COLUMNS
+
+
+def test_incremental_recompute_after_shock_edit():
+    shocks = [shock for shock in texas.TEXAS_SHOCKS if shock[3] != 'Energy_Revenue']
+    analyzer = texas.TexasRealEstateAnalyzer("Houston Metro", seed=1)
+    quiet(analyzer.generate_financial_data)
+    analyzer.update_shocks(shocks)
+    edited = quiet(analyzer.generate_financial_data)
+    assert analyzer.recomputed == ['Energy_Revenue']
+    assert edited.equals(quiet(texas.TexasRealEstateAnalyzer("Houston Metro", seed=1, shocks=shocks)
+                               .generate_financial_data))
+
+
+@pytest.fixture(scope='module')
+def quarterly_store(tmp_path_factory):
+    path = tmp_path_factory.mktemp('store')
+    store, _ = quiet(texas.build_ensemble_store, path, REGIONS[:2], 300, seed=12, start_year=2020,
+                     end_year=2023, frequency='quarterly', chunk_size=128)
+    draws = {region: quiet(texas.TexasRealEstateAnalyzer(region, seed=12, start_year=2020, end_year=2023,
+                                                         frequency='quarterly').generate_ensemble,
+                           300, keep_draws=True)['draws']
+             for region in REGIONS[:2]}
+    return store, draws
+
+
+@pytest.mark.parametrize('year, period, rows', [
+    (None, None, slice(None)),
+    (2021, None, slice(4, 8)),
+    (2022, 3, [10]),
+    (None, 2, slice(1, None, 4)),
+])
+def test_ensemble_store_queries_match_draws(quarterly_store, year, period, rows):
+    store, draws = quarterly_store
+    j = COLUMNS.index('Median_Home_Price')
+    for region in REGIONS[:2]:
+        cells = draws[region][:, rows, j]
+        np.testing.assert_allclose(store.mean(region, COLUMNS[j], year, period),
+                                   np.squeeze(cells.mean(axis=0, dtype=np.float64)), rtol=1e-12)
+        np.testing.assert_array_equal(store.percentile(region, COLUMNS[j], 90, year, period),
+                                      np.squeeze(np.percentile(cells, 90, axis=0)))
+        threshold = np.median(cells)
+        np.testing.assert_array_equal(store.exceedance(region, COLUMNS[j], threshold, year, period),
+                                      np.squeeze((cells > threshold).mean(axis=0)))
+
+
+def test_ensemble_store_rejects_unknown_cells(quarterly_store):
+    store, _ = quarterly_store
+    for region, column, year in [("Nowhere", 'Population', None), (REGIONS[0], 'Nothing', None),
+                                 (REGIONS[0], 'Population', 1990)]:
+        with pytest.raises(ValueError):
+            store.mean(region, column, year)
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    data = {'values': np.arange(1000.0)}
+    cache = texas.ResultCache(tmp_path)
+    for key in 'abc':
+        cache.put_arrays(key, data)
+    cache.max_bytes = cache.stats()['bytes']
+    for number, key in enumerate('abc'):
+        os.utime(tmp_path / f'{key}.npz', (number, number))
+    assert cache.get_arrays('a') is not None
+    
+    cache.put_arrays('d', data)
+    assert sorted(path.stem for path in tmp_path.iterdir()) == ['a', 'c', 'd']
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_result_cache_counts_hits_and_misses(tmp_path):
+    cache = texas.ResultCache(tmp_path)
+    assert cache.get_arrays('missing') is None
+    cache.put_arrays('present', {'values': np.ones(3)})
+    np.testing.assert_array_equal(cache.get_arrays('present')['values'], np.ones(3))
+    assert not cache.get_file('missing', '.png', tmp_path / 'copy.png')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 1)
+
+
+def test_result_cache_keys_follow_seed_and_config(tmp_path):
+    cache = texas.ResultCache(tmp_path)
+    first = quiet(texas.TexasRealEstateAnalyzer("Austin Area", seed=1, cache=cache).generate_financial_data)
+    analyzer = texas.TexasRealEstateAnalyzer("Austin Area", seed=1, cache=cache)
+    assert quiet(analyzer.generate_financial_data).equals(first)
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    quiet(texas.TexasRealEstateAnalyzer("Austin Area", seed=2, cache=cache).generate_financial_data)
+    analyzer.update_config(prix_m2_base=9000)
+    edited = quiet(analyzer.generate_financial_data)
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert not edited['Median_Home_Price'].equals(first['Median_Home_Price'])
+
+
+CATALOG_DEFAULT = {'population_base': 1000000, 'budget_base': 8000, 'prix_m2_base': 2000, 'type': 'mixed',
+                   'segment_immobilier': 'balanced', 'currency': 'USD', 'specialites': ['agriculture'],
+                   'major_cities': ['Town']}
+CATALOG_TRAVIS = {'population_base': 1300000, 'budget_base': 9500, 'prix_m2_base': 4200, 'type': 'tech_innovation',
+                  'segment_immobilier': 'tech_premium', 'currency': 'USD',
+                  'specialites': ['technologie', 'gouvernement'], 'major_cities': ['Austin', 'Pflugerville']}
+
+
+def write_catalog(path, entries):
+    """Écrit des entrées (nom, config) en catalogue CSV (listes séparées par ';') ou JSON"""
+    if path.suffix == '.csv':
+        fields = list(entries[0][1])
+        lines = [','.join(['region'] + fields)]
+        lines += [','.join([name] + [';'.join(value) if isinstance(value, list) else str(value)
+                                     for value in config.values()]) for name, config in entries]
+        path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    else:
+        path.write_text('{' + ', '.join(f'{json.dumps(name)}: {json.dumps(config)}' for name, config in entries)
+                        + '}', encoding='utf-8')
+    return str(path)
+
+
+def test_catalog_csv_and_json_load_the_same_regions(tmp_path):
+    entries = [('default', CATALOG_DEFAULT), ('Travis County', CATALOG_TRAVIS)]
+    from_csv = texas.load_region_catalog(write_catalog(tmp_path / 'regions.csv', entries))
+    from_json = texas.load_region_catalog(write_catalog(tmp_path / 'regions.json', entries))
+    assert from_csv.regions == from_json.regions == ['Travis County']
+    assert from_csv.config(from_csv.row('Travis County')) == from_json.config(from_json.row('Travis County'))
+    assert from_csv.config(from_csv.row('Travis County'))['specialites'] == ['technologie', 'gouvernement']
+    assert from_csv.row('Unknown County') == from_csv.default
+    
+    analyzer = texas.TexasRealEstateAnalyzer('Travis County', seed=1, catalog=str(tmp_path / 'regions.csv'))
+    assert analyzer.config['prix_m2_base'] == 4200
+
+
+def without(config, field):
+    """Copie de config sans field"""
+    return {name: value for name, value in config.items() if name != field}
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.json'])
+@pytest.mark.parametrize('entries, message', [
+    ([('default', without(CATALOG_DEFAULT, 'major_cities')),
+      ('Travis County', without(CATALOG_TRAVIS, 'major_cities'))], "missing major_cities"),
+    ([('default', CATALOG_DEFAULT), ('Travis County', dict(CATALOG_TRAVIS, population_base='many'))],
+     "must be a number"),
+    ([('default', CATALOG_DEFAULT), ('Travis County', dict(CATALOG_TRAVIS, budget_base=-5))], "must be positive"),
+    ([('default', CATALOG_DEFAULT), ('Travis County', CATALOG_TRAVIS), ('Travis County', CATALOG_TRAVIS)],
+     "Duplicate"),
+    ([('Travis County', CATALOG_TRAVIS)], "'default'"),
+])
+def test_catalog_validation(tmp_path, suffix, entries, message):
+    with pytest.raises(ValueError, match=message):
+        texas.load_region_catalog(write_catalog(tmp_path / f'regions{suffix}', entries))
+
+
+def test_catalog_rejects_text_for_list_fields(tmp_path):
+    entries = [('default', CATALOG_DEFAULT), ('Travis County', dict(CATALOG_TRAVIS, specialites='technologie'))]
+    with pytest.raises(ValueError, match="must be a list"):
+        texas.load_region_catalog(write_catalog(tmp_path / 'regions.json', entries))
+
+
+def iterrows_trends(df, specialties):
+    """Boucle iterrows d'origine des tendances texanes (référence du calendrier des chocs)"""
+    for i, row in df.iterrows():
+        year = row['Year']
+        if (2003 <= year <= 2008) or (2011 <= year <= 2014):
+            if "énergie" in specialties:
+                df.loc[i, 'Energy_Revenue'] *= 1.8
+                df.loc[i, 'Median_Income'] *= 1.10
+                df.loc[i, 'Population'] *= 1.03
+        if 2008 <= year <= 2009:
+            df.loc[i, 'Median_Home_Price'] *= 0.90
+            df.loc[i, 'Home_Sales_Volume'] *= 0.80
+            df.loc[i, 'Energy_Investment'] *= 0.70
+        if 2015 <= year <= 2016:
+            if "énergie" in specialties:
+                df.loc[i, 'Energy_Revenue'] *= 0.40
+                df.loc[i, 'Median_Home_Price'] *= 0.92
+                df.loc[i, 'Population'] *= 0.99
+        if year >= 2015 and "technologie" in specialties:
+            df.loc[i, 'Tech_Investment'] *= 2.2
+            df.loc[i, 'Median_Home_Price'] *= 1.15
+            df.loc[i, 'Population'] *= 1.04
+        if year >= 2010:
+            df.loc[i, 'Housing_Development_Investment'] *= 1.4
+            df.loc[i, 'New_Construction_Permits'] *= 1.3
+        if 2020 <= year <= 2021:
+            if year == 2020:
+                df.loc[i, 'Energy_Revenue'] *= 0.60
+                df.loc[i, 'Home_Sales_Volume'] *= 0.85
+            else:
+                df.loc[i, 'Median_Home_Price'] *= 1.08
+                df.loc[i, 'Population'] *= 1.02
+        if year >= 2022:
+            df.loc[i, 'Tech_Investment'] *= 1.3
+            df.loc[i, 'Manufacturing_Investment'] *= 1.4
+            df.loc[i, 'Infrastructure_Investment'] *= 1.5
+    return df
+
+
+@pytest.mark.parametrize('region', ["Houston Metro", "Austin Area", "Rio Grande Valley"])
+def test_shock_calendar_matches_iterrows_loop(region):
+    import pandas as pd
+    
+    analyzer = texas.TexasRealEstateAnalyzer(region, seed=1, end_year=2030)
+    years, _ = analyzer._period_grid()
+    frame = pd.DataFrame(1.0, index=range(len(years)), columns=COLUMNS)
+    frame.insert(0, 'Year', years)
+    expected = iterrows_trends(frame, analyzer.config['specialites'])[COLUMNS].to_numpy()
+    np.testing.assert_allclose(analyzer._trend_multipliers(years, COLUMNS), expected, rtol=1e-14)
+
+
+SHOCK_FIELDS = ['start', 'end', 'specialty', 'column', 'multiplier']
+
+
+@pytest.mark.parametrize('suffix', ['.json', '.csv'])
+def test_shock_calendar_files_round_trip(tmp_path, suffix):
+    path = tmp_path / f'shocks{suffix}'
+    if suffix == '.json':
+        path.write_text(json.dumps([dict(zip(SHOCK_FIELDS, shock)) for shock in texas.TEXAS_SHOCKS]), encoding='utf-8')
+    else:
+        rows = [','.join('' if value is None else str(value) for value in shock) for shock in texas.TEXAS_SHOCKS]
+        path.write_text('\n'.join([','.join(SHOCK_FIELDS)] + rows) + '\n', encoding='utf-8')
+    assert texas.load_shock_calendar(str(path)) == texas.TEXAS_SHOCKS
+
+
+def test_shock_calendar_rejects_unknown_columns(tmp_path):
+    path = tmp_path / 'shocks.json'
+    path.write_text(json.dumps([dict(zip(SHOCK_FIELDS, (2020, None, None, 'Nothing', 1.1)))]), encoding='utf-8')
+    with pytest.raises(ValueError, match="Unknown column"):
+        texas.load_shock_calendar(str(path))
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather', 'npz', 'csv'])
+@pytest.mark.parametrize('compact', [False, True])
+def test_writers_round_trip(tmp_path, fmt, compact):
+    import pandas as pd
+    
+    if fmt in ('parquet', 'feather'):
+        pytest.importorskip('pyarrow')
+    analyzer = texas.TexasRealEstateAnalyzer("Austin Area", seed=1, frequency='quarterly', compact=compact)
+    data = quiet(analyzer.generate_financial_arrays)
+    path = texas._write_data(data, str(tmp_path / 'austin'), fmt)
+    if fmt == 'npz':
+        with np.load(path) as archive:
+            loaded = {name: archive[name] for name in archive.files}
+    elif fmt == 'csv':
+        loaded = pd.read_csv(path, dtype={column: values.dtype for column, values in data.items()},
+                             float_precision='round_trip')
+    else:
+        loaded = getattr(pd, f'read_{fmt}')(path)
+    assert list(loaded) == list(data)
+    for column, values in data.items():
+        np.testing.assert_array_equal(np.asarray(loaded[column]), values)
+        assert np.asarray(loaded[column]).dtype == values.dtype
+
+
+def test_load_dataset_reads_partitions_and_refuses_mixed_formats(tmp_path):
+    pytest.importorskip('pyarrow')
+    for region in REGIONS[:2]:
+        quiet(texas._run_region, region, 1, str(tmp_path), False, fmt='parquet', partitioned=True)
+    table = texas.load_dataset(str(tmp_path))
+    assert table.num_rows == 2 * 24
+    assert sorted(set(table.column('region').to_pylist())) == ['austin_area', 'west_texas']
+    
+    quiet(texas._run_region, REGIONS[0], 1, str(tmp_path), False, fmt='feather', partitioned=True)
+    with pytest.raises(ValueError, match="mixes Parquet and Feather"):
+        texas.load_dataset(str(tmp_path))
+
+
+@pytest.mark.parametrize('seed', [0, 12345, 2 ** 100 + 7, 2 ** 200 + 3])
+def test_spawn_states_match_seed_sequence(seed):
+    entropy = np.random.SeedSequence(seed).entropy
+    keys = np.random.default_rng(seed).integers(0, 2 ** 32, size=(64, 3), dtype=np.uint64)
+    keys[0] = 0
+    states = texas._spawn_states(entropy, keys)
+    for state, key in zip(states, keys):
+        expected = np.random.SeedSequence(entropy, spawn_key=tuple(int(k) for k in key)).generate_state(4, np.uint64)
+        np.testing.assert_array_equal(state, expected)
+    assert texas._spawn_states_match()
+
+
+def test_panel_streams_without_fast_path(monkeypatch):
+    fast = quiet(texas.TexasRegionPanel(REGIONS, seed=9).generate_panel_data)
+    monkeypatch.setattr(texas, '_spawn_states_match', lambda: False)
+    assert quiet(texas.TexasRegionPanel(REGIONS, seed=9).generate_panel_data).equals(fast)
+
+
+def test_stream_and_exact_ensembles_share_column_layout():
+    analyzer = texas.TexasRealEstateAnalyzer("Austin Area", seed=4, frequency='quarterly')
+    exact = quiet(analyzer.generate_ensemble, 200, percentiles=(10, 50, 90))
+    streamed = quiet(analyzer.stream_ensemble, 200, chunk_size=64, percentiles=(10, 50, 90))
+    assert list(streamed['percentiles'].columns) == list(exact['percentiles'].columns)
+    assert streamed['percentiles'].index.equals(exact['percentiles'].index)
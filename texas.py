@@ -1,865 +1,2308 @@
 # texas_real_estate.py
-import pandas as pd
+# pandas et matplotlib sont importés à la demande : le chemin données seules
+# (génération + écriture CSV) ne charge que NumPy et la bibliothèque standard
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
+import argparse
+import contextlib
+import csv
+import functools
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
 import warnings
+import zlib
 warnings.filterwarnings('ignore')
 
+# Barèmes par périodes : (année_début, année_fin, niveau, pente) -> niveau + pente * (année - année_début)
+# La valeur par défaut (année_ancre, niveau, pente) couvre toutes les autres années.
+INCOME_ERAS = (
+    (2002, 2008, 1.0, 0.040),    # Forte croissance énergie
+    (2009, 2010, 1.0, -0.020),   # Légère baisse crise
+    (2011, 2014, 1.0, 0.045),    # Boom énergie
+    (2015, 2016, 0.985, 0.0),    # Baisse prix pétrole
+    (2017, 2019, 1.0, 0.038),
+    (2020, 2021, 0.990, 0.0),    # Impact COVID modéré
+)
+INCOME_DEFAULT = (2022, 1.0, 0.042)
+
+ENERGY_ERAS = (
+    (2002, 2008, 1.0, 0.15),     # Boom pétrole
+    (2009, 2010, 0.70, 0.0),     # Crise financière
+    (2011, 2014, 1.0, 0.12),     # Reprise
+    (2015, 2016, 0.60, 0.0),     # Effondrement prix pétrole
+    (2017, 2019, 1.0, 0.08),     # Reprise modérée
+    (2020, 2021, 0.75, 0.0),     # COVID + crise pétrole
+)
+ENERGY_DEFAULT = (2022, 1.0, 0.10)  # Reprise forte
+
+HOME_PRICE_ERAS = (
+    (2002, 2007, 1.0, 0.08),     # Boom pré-crise
+    (2008, 2009, 0.90, 0.0),     # Légère baisse (Texas résilient)
+    (2010, 2014, 1.0, 0.10),     # Forte reprise
+    (2015, 2016, 0.95, 0.0),     # Légère baisse énergie
+    (2017, 2019, 1.0, 0.07),     # Croissance forte
+    (2020, 2021, 1.02, 0.0),     # Texas résilient pendant COVID
+)
+HOME_PRICE_DEFAULT = (2022, 1.0, 0.09)  # Boom post-COVID
+
+HOME_SALES_ERAS = (
+    (2002, 2006, 1.0, 0.12),
+    (2007, 2009, 0.80, 0.0),     # Baisse modérée
+    (2010, 2019, 1.0, 0.10),
+    (2020, 2021, 0.90, 0.0),     # Légère baisse COVID
+)
+HOME_SALES_DEFAULT = (2022, 1.0, 0.11)
+
+VACANCY_ERAS = (
+    (2002, 2006, 0.0, -0.8),
+    (2007, 2010, 1.5, 0.0),
+    (2011, 2019, 0.0, -0.4),
+    (2020, 2021, 1.0, 0.0),
+)
+VACANCY_DEFAULT = (2022, 0.0, -0.3)
+
+RENT_ERAS = (
+    (2002, 2007, 1.0, 0.035),
+    (2008, 2010, 1.0, -0.010),
+    (2011, 2019, 1.0, 0.040),
+    (2020, 2021, 1.005, 0.0),    # Légère hausse
+)
+RENT_DEFAULT = (2022, 1.0, 0.045)
+
+# Tables de correspondance par type de région et par segment immobilier
+POPULATION_GROWTH = {
+    "tech_innovation": 0.028,    # Très forte croissance à Austin
+    "corporate_tech": 0.022,     # Forte croissance à DFW
+    "energy_medical": 0.020,     # Croissance forte à Houston
+}
+POPULATION_GROWTH_DEFAULT = 0.015  # Croissance modérée ailleurs
+
+BASE_INCOME = {
+    "tech_innovation": 85000,
+    "corporate_tech": 75000,
+    "energy_medical": 70000,
+}
+BASE_INCOME_DEFAULT = 55000
+
+REVENUE_GROWTH = {
+    "tech_innovation": 0.065,    # Croissance explosive à Austin
+    "corporate_tech": 0.055,     # Croissance forte à DFW
+    "energy_medical": 0.050,     # Croissance variable à Houston
+}
+REVENUE_GROWTH_DEFAULT = 0.042  # Croissance moyenne
+
+HOME_PRICE_GROWTH = {
+    "tech_boom": 0.085,              # Croissance explosive à Austin
+    "corporate_affordable": 0.055,   # Croissance forte à DFW
+    "energy_driven": 0.048,          # Croissance volatile à Houston
+}
+HOME_PRICE_GROWTH_DEFAULT = 0.040  # Croissance modérée
+
+# Multiplicateurs selon les spécialisations : ((spécialisation, multiplicateur), ...), défaut
+# (la première spécialisation présente dans la région l'emporte)
+SPECIALTY_MULTIPLIERS = {
+    'business_tax_multiplier': ((("technologie", 1.4), ("énergie", 1.2)), 1.0),
+    'energy_revenue_multiplier': ((("énergie", 2.5),), 0.3),
+    'energy_investment_multiplier': ((("énergie", 3.0),), 0.4),
+    'tech_investment_multiplier': ((("technologie", 2.5),), 0.8),
+    'manufacturing_investment_multiplier': ((("manufacturing", 1.8),), 0.7),
+    'agricultural_investment_multiplier': ((("agriculture", 2.2),), 0.9),
+}
+
+# Corrélations du bruit entre colonnes (mode corrélé) : paires communes à toutes les régions,
+# complétées par type de région ; les colonnes absentes restent indépendantes
+NOISE_CORRELATIONS_COMMON = {
+    ('Total_Revenue', 'Property_Tax_Revenue'): 0.4,
+    ('Total_Revenue', 'Business_Tax_Revenue'): 0.3,
+    ('Total_Expenses', 'Public_Services_Expenses'): 0.4,
+    ('Median_Home_Price', 'Average_Rent'): 0.5,
+    ('Median_Home_Price', 'Home_Sales_Volume'): 0.4,
+    ('Median_Home_Price', 'Rental_Vacancy_Rate'): -0.2,
+    ('Home_Sales_Volume', 'New_Construction_Permits'): 0.5,
+    ('New_Construction_Permits', 'Housing_Development_Investment'): 0.4,
+}
+NOISE_CORRELATIONS = {
+    "energy_medical": {
+        ('Energy_Revenue', 'Energy_Investment'): 0.7,
+        ('Energy_Revenue', 'Median_Income'): 0.4,
+        ('Energy_Investment', 'Median_Income'): 0.3,
+        ('Energy_Revenue', 'Total_Revenue'): 0.4,
+    },
+    "energy_agricultural": {
+        ('Energy_Revenue', 'Energy_Investment'): 0.7,
+        ('Energy_Revenue', 'Median_Income'): 0.4,
+        ('Energy_Revenue', 'Total_Revenue'): 0.4,
+        ('Energy_Investment', 'Agricultural_Investment'): 0.3,
+    },
+    "tech_innovation": {
+        ('Tech_Investment', 'Median_Income'): 0.5,
+        ('Tech_Investment', 'Median_Home_Price'): 0.4,
+        ('Tech_Investment', 'Business_Tax_Revenue'): 0.4,
+    },
+    "corporate_tech": {
+        ('Tech_Investment', 'Median_Income'): 0.4,
+        ('Tech_Investment', 'Business_Tax_Revenue'): 0.4,
+    },
+    "border_manufacturing": {
+        ('Manufacturing_Investment', 'Median_Income'): 0.4,
+        ('Manufacturing_Investment', 'Business_Tax_Revenue'): 0.4,
+    },
+}
+NOISE_CORRELATIONS_DEFAULT = {}
+
+
+# Fréquences disponibles : nombre de périodes par an
+FREQUENCIES = {'annual': 1, 'quarterly': 4, 'monthly': 12}
+
+# Saisonnalité mensuelle (moyenne 1) des ventes, des permis et des loyers ;
+# les séries de flux restent exprimées en rythme annualisé
+SALES_SEASONALITY = (0.80, 0.85, 1.00, 1.08, 1.15, 1.18, 1.15, 1.10, 0.98, 0.95, 0.88, 0.88)
+PERMITS_SEASONALITY = (0.85, 0.88, 1.02, 1.08, 1.10, 1.10, 1.05, 1.05, 1.00, 1.00, 0.95, 0.92)
+RENT_SEASONALITY = (0.985, 0.990, 0.995, 1.000, 1.005, 1.010, 1.015, 1.010, 1.000, 0.995, 0.990, 1.005)
+
+def _piecewise(years, eras, default):
+    """Évalue un barème par périodes sur un tableau d'années en une seule passe np.select"""
+    # Les années antérieures au barème reprennent le niveau de sa première année
+    years = np.maximum(years, eras[0][0])
+    conditions = [(years >= start) & (years <= end) for start, end, _, _ in eras]
+    choices = [level + slope * (years - start) for start, _, level, slope in eras]
+    anchor, level, slope = default
+    return np.select(conditions, choices, default=level + slope * (years - anchor))
+
+
+def _year_multiplier(years, special_years, multiplier):
+    """Applique un multiplicateur aux années listées, 1.0 sinon"""
+    return np.where(np.isin(years, special_years), multiplier, 1.0)
+
+
+# Graphe des colonnes : nom -> (méthode de simulation, colonnes d'entrée).
+# L'ordre du dictionnaire est l'ordre des colonnes de generate_financial_data().
+COLUMN_GRAPH = {
+    # Données démographiques
+    'Population': ('_simulate_population', ()),
+    'Households': ('_simulate_households', ()),
+    'Median_Income': ('_simulate_median_income', ()),
+    
+    # Recettes régionales (en millions de dollars)
+    'Total_Revenue': ('_simulate_total_revenue', ()),
+    'Property_Tax_Revenue': ('_simulate_property_tax_revenue', ()),
+    'State_Federal_Funding': ('_simulate_government_funding', ()),
+    'Business_Tax_Revenue': ('_simulate_business_tax_revenue', ()),
+    'Energy_Revenue': ('_simulate_energy_revenue', ()),
+    'Other_Revenue': ('_simulate_other_revenue', ()),
+    
+    # Dépenses régionales
+    'Total_Expenses': ('_simulate_total_expenses', ()),
+    'Infrastructure_Expenses': ('_simulate_infrastructure_expenses', ()),
+    'Public_Services_Expenses': ('_simulate_public_services_expenses', ()),
+    'Education_Expenses': ('_simulate_education_expenses', ()),
+    'Healthcare_Expenses': ('_simulate_healthcare_expenses', ()),
+    
+    # Indicateurs financiers
+    'Budget_Surplus_Deficit': ('_simulate_budget_balance', ()),
+    'Regional_Debt': ('_simulate_regional_debt', ()),
+    'Debt_to_Revenue_Ratio': ('_simulate_debt_ratio', ()),
+    
+    # Données immobilières (spécifiques au Texas)
+    'Median_Home_Price': ('_simulate_median_home_price', ()),
+    'Price_per_Sqft': ('_simulate_price_per_sqft', ('Median_Home_Price',)),
+    'Home_Sales_Volume': ('_simulate_home_sales', ()),
+    'New_Construction_Permits': ('_simulate_construction_permits', ()),
+    'Rental_Vacancy_Rate': ('_simulate_vacancy_rate', ()),
+    'Average_Rent': ('_simulate_average_rent', ()),
+    
+    # Investissements spécifiques adaptés au Texas
+    'Energy_Investment': ('_simulate_energy_investment', ()),
+    'Tech_Investment': ('_simulate_tech_investment', ()),
+    'Infrastructure_Investment': ('_simulate_infrastructure_investment', ()),
+    'Housing_Development_Investment': ('_simulate_housing_investment', ()),
+    'Manufacturing_Investment': ('_simulate_manufacturing_investment', ()),
+    'Agricultural_Investment': ('_simulate_agricultural_investment', ()),
+}
+
+# Colonnes lues par d'autres colonnes (gardées en mémoire pendant l'évaluation du graphe)
+COLUMN_INPUTS = frozenset(dep for _, inputs in COLUMN_GRAPH.values() for dep in inputs)
+
+
+# Calendrier des chocs texans : (année_début, année_fin, spécialisation requise, colonne, multiplicateur)
+# année_fin None = jusqu'à aujourd'hui ; spécialisation None = toutes les régions
+TEXAS_SHOCKS = (
+    # Boom pétrolier (2003-2008, 2011-2014)
+    (2003, 2008, "énergie", 'Energy_Revenue', 1.8),
+    (2003, 2008, "énergie", 'Median_Income', 1.10),
+    (2003, 2008, "énergie", 'Population', 1.03),
+    (2011, 2014, "énergie", 'Energy_Revenue', 1.8),
+    (2011, 2014, "énergie", 'Median_Income', 1.10),
+    (2011, 2014, "énergie", 'Population', 1.03),
+    
+    # Crise financière (2008-2009) - impact modéré au Texas
+    (2008, 2009, None, 'Median_Home_Price', 0.90),
+    (2008, 2009, None, 'Home_Sales_Volume', 0.80),
+    (2008, 2009, None, 'Energy_Investment', 0.70),
+    
+    # Effondrement prix pétrole (2015-2016)
+    (2015, 2016, "énergie", 'Energy_Revenue', 0.40),
+    (2015, 2016, "énergie", 'Median_Home_Price', 0.92),
+    (2015, 2016, "énergie", 'Population', 0.99),
+    
+    # Boom tech à Austin (2015-présent)
+    (2015, None, "technologie", 'Tech_Investment', 2.2),
+    (2015, None, "technologie", 'Median_Home_Price', 1.15),
+    (2015, None, "technologie", 'Population', 1.04),
+    
+    # Croissance démographique forte (constant)
+    (2010, None, None, 'Housing_Development_Investment', 1.4),
+    (2010, None, None, 'New_Construction_Permits', 1.3),
+    
+    # Impact COVID-19 (2020), puis reprise forte au Texas (2021)
+    (2020, 2020, None, 'Energy_Revenue', 0.60),
+    (2020, 2020, None, 'Home_Sales_Volume', 0.85),
+    (2021, 2021, None, 'Median_Home_Price', 1.08),
+    (2021, 2021, None, 'Population', 1.02),
+    
+    # Boom post-COVID (2022-présent)
+    (2022, None, None, 'Tech_Investment', 1.3),
+    (2022, None, None, 'Manufacturing_Investment', 1.4),
+    (2022, None, None, 'Infrastructure_Investment', 1.5),
+)
+
+# Modèles de chocs synthétiques des tests de résistance : probabilité de survenue par
+# scénario, durée en années (min, max), spécialisation concernée (None = toutes les régions)
+# et effets {colonne: (multiplicateur modéré, multiplicateur sévère)}
+STRESS_TEMPLATES = {
+    'oil_collapse': {
+        'probability': 0.35, 'duration': (1, 3), 'specialty': "énergie",
+        'effects': {
+            'Energy_Revenue': (0.70, 0.35),
+            'Energy_Investment': (0.80, 0.40),
+            'Median_Income': (0.98, 0.92),
+            'Median_Home_Price': (0.97, 0.88),
+            'Population': (1.00, 0.98),
+        },
+    },
+    'tech_bust': {
+        'probability': 0.25, 'duration': (1, 3), 'specialty': "technologie",
+        'effects': {
+            'Tech_Investment': (0.70, 0.40),
+            'Business_Tax_Revenue': (0.95, 0.80),
+            'Median_Income': (0.99, 0.93),
+            'Median_Home_Price': (0.95, 0.80),
+        },
+    },
+    'rate_shock': {
+        'probability': 0.30, 'duration': (1, 4), 'specialty': None,
+        'effects': {
+            'Median_Home_Price': (0.97, 0.85),
+            'Home_Sales_Volume': (0.85, 0.60),
+            'New_Construction_Permits': (0.85, 0.60),
+            'Housing_Development_Investment': (0.90, 0.70),
+        },
+    },
+}
+
+# Part des pires scénarios retenue pour les métriques de queue (pire décile)
+STRESS_TAIL = 0.10
+
+
+def load_shock_calendar(path):
+    """Charge un calendrier de chocs depuis un fichier JSON ou CSV"""
+    # Champs : start, end, specialty, column, multiplier
+    # (end et specialty vides = choc permanent / toutes les régions)
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8', newline='') as f:
+        if extension == '.json':
+            records = json.load(f)
+        elif extension == '.csv':
+            records = list(csv.DictReader(f))
+        else:
+            raise ValueError(f"Unsupported shock calendar format: {path} (expected .json or .csv)")
+    
+    shocks = []
+    for record in records:
+        end = record.get('end')
+        specialty = record.get('specialty')
+        column = record['column']
+        if column not in COLUMN_GRAPH:
+            raise ValueError(f"Unknown column in shock calendar: {column}")
+        shocks.append((
+            int(record['start']),
+            int(end) if end not in (None, '') else None,
+            specialty if specialty not in (None, '') else None,
+            column,
+            float(record['multiplier']),
+        ))
+    
+    return tuple(shocks)
+
+
+def noise_correlation(pairs):
+    """Matrice de corrélation (colonne × colonne, ordre de COLUMN_GRAPH) à partir de paires"""
+    columns = {column: j for j, column in enumerate(COLUMN_GRAPH)}
+    matrix = np.eye(len(columns))
+    for (a, b), rho in pairs.items():
+        unknown = [column for column in (a, b) if column not in columns]
+        if unknown:
+            raise ValueError(f"Unknown noise column: {', '.join(unknown)}")
+        if a == b or not -1 < rho < 1:
+            raise ValueError(f"Invalid noise correlation {rho!r} between {a} and {b}")
+        matrix[columns[a], columns[b]] = matrix[columns[b], columns[a]] = rho
+    return matrix
+
+
+def _noise_factor(correlation, region_type):
+    """Facteur de Cholesky de la corrélation du bruit (None = colonnes indépendantes)"""
+    # correlation : True (modèle du type de région), paires {(a, b): rho} ou matrice complète
+    if correlation is None or correlation is False:
+        return None
+    if correlation is True:
+        correlation = {**NOISE_CORRELATIONS_COMMON,
+                       **NOISE_CORRELATIONS.get(region_type, NOISE_CORRELATIONS_DEFAULT)}
+    matrix = noise_correlation(correlation) if isinstance(correlation, dict) else np.asarray(correlation, float)
+    
+    size = len(COLUMN_GRAPH)
+    if matrix.shape != (size, size) or not np.allclose(matrix, matrix.T) or not np.allclose(np.diag(matrix), 1):
+        raise ValueError(f"Noise correlation must be a symmetric {size}x{size} matrix with a unit diagonal")
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("Noise correlation matrix is not positive definite")
+
+
+def _correlate(factor, z):
+    """Produit factor @ z sur l'axe des colonnes, terme à terme, en liste de colonnes"""
+    # Chaque valeur ne dépend que de ses propres tirages, quelle que soit la taille du
+    # bloc : contrairement à un produit BLAS, le résultat ne varie pas avec le découpage.
+    # Les colonnes indépendantes (ligne identité) sont renvoyées telles quelles, sans copie
+    nonzero = np.tril(np.any(factor != 0, axis=tuple(range(2, factor.ndim))))
+    unit = np.all(factor[np.diag_indices(len(z))] == 1, axis=tuple(range(1, factor.ndim - 1)))
+    out = []
+    for i in range(len(z)):
+        terms = np.flatnonzero(nonzero[i])
+        if len(terms) == 1 and unit[i]:
+            out.append(z[i])
+            continue
+        column = factor[i, terms[0]] * z[terms[0]]
+        for k in terms[1:]:
+            column += factor[i, k] * z[k]
+        out.append(column)
+    return out
+
+
+# Catalogue des régions : fichier JSON (nom -> configuration) ou CSV (une ligne par région,
+# listes séparées par des ';'), chargé une seule fois par processus
+REGION_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'texas_regions.json')
+REGION_NUMERIC_FIELDS = ('population_base', 'budget_base', 'prix_m2_base')
+REGION_TEXT_FIELDS = ('type', 'segment_immobilier', 'currency')
+REGION_LIST_FIELDS = ('specialites', 'major_cities')
+
+
+class RegionCatalog:
+    """Table des régions en colonnes NumPy (une ligne par région), clé = identifiant de région"""
+    
+    def __init__(self, configs):
+        if 'default' not in configs:
+            raise ValueError("Region catalog needs a 'default' entry")
+        
+        self.names = list(configs)
+        self.ids = {name: row for row, name in enumerate(self.names)}
+        self.default = self.ids['default']
+        
+        for name, config in configs.items():
+            missing = [field for field in REGION_NUMERIC_FIELDS + REGION_TEXT_FIELDS + REGION_LIST_FIELDS
+                       if field not in config]
+            if missing:
+                raise ValueError(f"Region {name!r} is missing {', '.join(missing)}")
+            for field in REGION_NUMERIC_FIELDS:
+                try:
+                    value = float(config[field])
+                except (TypeError, ValueError):
+                    raise ValueError(f"Region {name!r}: {field} must be a number, got {config[field]!r}")
+                if not value > 0:
+                    raise ValueError(f"Region {name!r}: {field} must be positive, got {config[field]!r}")
+            for field in REGION_LIST_FIELDS:
+                if not isinstance(config[field], (list, tuple)):
+                    raise ValueError(f"Region {name!r}: {field} must be a list, got {config[field]!r}")
+        
+        # Colonnes numériques et libellés
+        for field in REGION_NUMERIC_FIELDS:
+            setattr(self, field, np.array([float(configs[name][field]) for name in self.names]))
+        for field in REGION_TEXT_FIELDS:
+            setattr(self, field, [str(configs[name][field]) for name in self.names])
+        for field in REGION_LIST_FIELDS:
+            setattr(self, field, [list(configs[name][field]) for name in self.names])
+        
+        # Types et segments codés en entiers (vocabulaire trié)
+        self.types, self.type_id = np.unique(self.type, return_inverse=True)
+        self.segments, self.segment_id = np.unique(self.segment_immobilier, return_inverse=True)
+        
+        # Spécialisations en matrice booléenne (région × spécialisation)
+        self.specialties = sorted({s for specialties in self.specialites for s in specialties})
+        column = {specialty: k for k, specialty in enumerate(self.specialties)}
+        self.specialty_mask = np.zeros((len(self.names), len(self.specialties)), dtype=bool)
+        for row, specialties in enumerate(self.specialites):
+            self.specialty_mask[row, [column[s] for s in specialties]] = True
+        
+        # Paramètres précalculés par région : tables par type/segment puis multiplicateurs
+        def by_vocabulary(table, default, vocabulary, ids):
+            return np.array([table.get(key, default) for key in vocabulary], dtype=float)[ids]
+        
+        self.params = {
+            'population_base': self.population_base,
+            'budget_base': self.budget_base,
+            'prix_m2_base': self.prix_m2_base,
+            'population_growth': by_vocabulary(POPULATION_GROWTH, POPULATION_GROWTH_DEFAULT,
+                                               self.types, self.type_id),
+            'base_income': by_vocabulary(BASE_INCOME, BASE_INCOME_DEFAULT, self.types, self.type_id),
+            'revenue_growth': by_vocabulary(REVENUE_GROWTH, REVENUE_GROWTH_DEFAULT, self.types, self.type_id),
+            'home_price_growth': by_vocabulary(HOME_PRICE_GROWTH, HOME_PRICE_GROWTH_DEFAULT,
+                                               self.segments, self.segment_id),
+        }
+        for name, (choices, default) in SPECIALTY_MULTIPLIERS.items():
+            conditions = [self.has_specialty(specialty) for specialty, _ in choices]
+            self.params[name] = np.select(conditions, [m for _, m in choices], default)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    @property
+    def regions(self):
+        """Noms des régions du catalogue (hors configuration par défaut)"""
+        return [name for name in self.names if name != 'default']
+    
+    def row(self, name):
+        """Identifiant (ligne) d'une région, configuration par défaut si elle est inconnue"""
+        return self.ids.get(name, self.default)
+    
+    def has_specialty(self, specialty):
+        """Masque des régions ayant une spécialisation donnée"""
+        if specialty not in self.specialties:
+            return np.zeros(len(self.names), dtype=bool)
+        return self.specialty_mask[:, self.specialties.index(specialty)]
+    
+    def config(self, row):
+        """Configuration d'une ligne sous forme de dictionnaire (format historique)"""
+        config = {field: getattr(self, field)[row].item() for field in REGION_NUMERIC_FIELDS}
+        config.update({field: getattr(self, field)[row] for field in REGION_TEXT_FIELDS})
+        config.update({field: list(getattr(self, field)[row]) for field in REGION_LIST_FIELDS})
+        return config
+
+
+def _unique_keys(pairs):
+    """Objet JSON sans clé répétée (json garderait silencieusement la dernière)"""
+    keys = [key for key, _ in pairs]
+    duplicates = sorted({key for key in keys if keys.count(key) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate key in catalog: {', '.join(duplicates)}")
+    return dict(pairs)
+
+
+@functools.lru_cache(maxsize=None)
+def load_region_catalog(path=REGION_CATALOG):
+    """Charge et valide un catalogue de régions JSON ou CSV (une seule fois par chemin)"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8', newline='') as f:
+        if extension == '.json':
+            configs = json.load(f, object_pairs_hook=_unique_keys)
+        elif extension == '.csv':
+            configs = {}
+            for record in csv.DictReader(f):
+                name = record.pop('region')
+                if name in configs:
+                    raise ValueError(f"Duplicate region in catalog: {name}")
+                for field in REGION_LIST_FIELDS:
+                    if field in record:
+                        value = record[field] or ''
+                        record[field] = [item.strip() for item in value.split(';') if item.strip()]
+                configs[name] = record
+        else:
+            raise ValueError(f"Unsupported region catalog format: {path} (expected .json or .csv)")
+    
+    return RegionCatalog(configs)
+
+
+# Taille fixe des blocs de scénarios : chaque bloc possède son propre flux aléatoire,
+# les tirages ne dépendent donc pas du découpage du travail entre processus
+SCENARIO_CHUNK = 4096
+
+# Indice de flux du bruit corrélé de toutes les colonnes (après le dernier indice de colonne)
+JOINT_NOISE_KEY = len(COLUMN_GRAPH)
+
+# Indice de flux des chocs synthétiques, communs à toutes les régions (clé sans région)
+STRESS_KEY = JOINT_NOISE_KEY + 1
+
+
+# Constantes de hachage de np.random.SeedSequence (pool de 4 mots de 32 bits), reproduites
+# par _spawn_states pour les versions de NumPy [min, max) où elles ont été vérifiées ; hors
+# de cet intervalle, ou si le contrôle de _spawn_states_match échoue, SeedSequence est utilisé
+_SPAWN_STATES_NUMPY = ((1, 17), (3, 0))
+_SEED_POOL = 4
+_SEED_INIT_A, _SEED_MULT_A = 0x43b0d7e5, 0x931e8875
+_SEED_INIT_B, _SEED_MULT_B = 0x8b51f9dd, 0x58f38ded
+_SEED_MIX_L, _SEED_MIX_R, _SEED_XSHIFT = 0xca01f9dd, 0x4973f715, 16
+
+
+def _seed_words(value):
+    """Découpe un entier positif en mots de 32 bits (poids faible en premier)"""
+    words = []
+    while True:
+        words.append(value & 0xFFFFFFFF)
+        value >>= 32
+        if not value:
+            return words
+
+
+def _spawn_states(entropy, spawn_keys):
+    """État PCG64 (4 mots de 64 bits) de SeedSequence(entropy, spawn_key=clé) pour chaque ligne de clés"""
+    # Même hachage que SeedSequence, vectorisé sur toutes les clés à la fois
+    # (chaque élément de clé doit tenir sur 32 bits)
+    run = _seed_words(int(entropy))
+    run += [0] * (_SEED_POOL - len(run))
+    spawn_keys = np.asarray(spawn_keys, dtype=np.uint64)
+    n = len(spawn_keys)
+    entropy_words = ([np.full(n, word, dtype=np.uint32) for word in run]
+                     + [spawn_keys[:, j].astype(np.uint32) for j in range(spawn_keys.shape[1])])
+    
+    u32 = np.uint32
+    hash_const = [u32(_SEED_INIT_A)]
+    
+    def hashmix(value):
+        value = value ^ hash_const[0]
+        hash_const[0] = u32(hash_const[0] * u32(_SEED_MULT_A))
+        value = value * hash_const[0]
+        return value ^ (value >> u32(_SEED_XSHIFT))
+    
+    def mix(x, y):
+        result = u32(_SEED_MIX_L) * x - u32(_SEED_MIX_R) * y
+        return result ^ (result >> u32(_SEED_XSHIFT))
+    
+    with np.errstate(over='ignore'):
+        pool = [hashmix(entropy_words[i]) for i in range(_SEED_POOL)]
+        for src in range(_SEED_POOL):
+            for dst in range(_SEED_POOL):
+                if src != dst:
+                    pool[dst] = mix(pool[dst], hashmix(pool[src]))
+        for src in range(_SEED_POOL, len(entropy_words)):
+            for dst in range(_SEED_POOL):
+                pool[dst] = mix(pool[dst], hashmix(entropy_words[src]))
+        
+        state = []
+        hash_b = u32(_SEED_INIT_B)
+        for i in range(2 * _SEED_POOL):
+            value = pool[i % _SEED_POOL] ^ hash_b
+            hash_b = u32(hash_b * u32(_SEED_MULT_B))
+            value = value * hash_b
+            state.append(value ^ (value >> u32(_SEED_XSHIFT)))
+    
+    return np.stack(state, axis=1).astype('<u4').view('<u8')
+
+
+class _PresetSeed(np.random.bit_generator.ISeedSequence):
+    """Graine dont l'état est déjà calculé (voir _spawn_states)"""
+    
+    def __init__(self, state):
+        self.state = state
+    
+    def generate_state(self, n_words, dtype=np.uint32):
+        return self.state
+
+
+@functools.lru_cache(maxsize=None)
+def _spawn_states_match():
+    """Vérifie une fois que _spawn_states reproduit SeedSequence (sinon repli sur SeedSequence)"""
+    low, high = _SPAWN_STATES_NUMPY
+    if not low <= tuple(int(part) for part in np.__version__.split('.')[:2]) < high:
+        return False
+    entropy = np.random.SeedSequence(2 ** 100 + 12345).entropy
+    keys = [(zlib.crc32(b'Austin Area'), 5, 0), (0, 0, 0), (0xFFFFFFFF, 28, 3)]
+    states = _spawn_states(entropy, keys)
+    return all(np.array_equal(state, np.random.SeedSequence(entropy, spawn_key=key).generate_state(4, np.uint64))
+               for state, key in zip(states, keys))
+
+
+def _spawn_generators(entropy, spawn_keys):
+    """Générateurs de SeedSequence(entropy, spawn_key=clé) pour chaque ligne de clés"""
+    # États calculés d'un coup quand le hachage vectorisé est vérifié, un SeedSequence par clé sinon
+    if _spawn_states_match():
+        return [np.random.Generator(np.random.PCG64(_PresetSeed(state)))
+                for state in _spawn_states(entropy, spawn_keys)]
+    return [np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=tuple(int(k) for k in key)))
+            for key in spawn_keys]
+
+
+# Types compacts (option compact=True) : float32 pour les séries monétaires et les taux,
+# petits entiers pour le calendrier, catégories pour les libellés de région
+COMPACT_FLOAT = np.float32
+COMPACT_INTS = {'Year': np.int16, 'Period': np.int8}
+LABEL_COLUMNS = ('region', 'type', 'segment_immobilier')
+
+
+# Régions principales du Texas
+TEXAS_REGIONS = ["Dallas-Fort Worth", "Houston Metro", "Austin Area", "San Antonio",
+                 "El Paso Area", "Rio Grande Valley", "West Texas", "Central Texas"]
+
+
+def _region_slug(region):
+    """Nom de fichier d'une région ("Austin Area" -> "austin_area")"""
+    return region.replace(" ", "_").lower()
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version():
+    """Empreinte du code source : toute modification du modèle invalide le cache"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+# Nombre de fonctions conservées par profil cProfile dans le rapport de temps
+PROFILE_TOP = 15
+
+
+class StageTimer:
+    """Chronométrage des étapes d'une analyse (profil cProfile et mémoire tracemalloc en option)"""
+    
+    def __init__(self, enabled=True, profile=False, memory=False):
+        self.enabled = enabled
+        self.profile = profile
+        self.memory = memory
+        self.stages = {}
+        self.profiles = {}
+        self._stack = []
+        self._started = time.perf_counter()
+    
+    def stage(self, name):
+        """Contexte chronométrant une étape (imbriquée sous l'étape en cours)"""
+        if not self.enabled:
+            return _NO_STAGE
+        return self._stage(name)
+    
+    @contextlib.contextmanager
+    def _stage(self, name):
+        path = '/'.join([frame['name'] for frame in self._stack] + [name])
+        frame = {'name': name}
+        
+        # cProfile : une seule capture active à la fois, donc sur les étapes de premier niveau
+        profiler = None
+        if self.profile and not self._stack:
+            import cProfile
+            profiler = cProfile.Profile()
+        
+        if self.memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame.update(base=current, peak=current)
+        
+        self._stack.append(frame)
+        if profiler is not None:
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+            self._stack.pop()
+            
+            stats = self.stages.setdefault(path, {'count': 0, 'total': 0.0, 'min': elapsed, 'max': elapsed})
+            stats['count'] += 1
+            stats['total'] += elapsed
+            stats['min'] = min(stats['min'], elapsed)
+            stats['max'] = max(stats['max'], elapsed)
+            
+            if self.memory:
+                # Pic de l'étape (enfants compris), remonté à l'étape parente
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(frame['peak'], peak)
+                stats['peak_bytes'] = max(stats.get('peak_bytes', 0), peak - frame['base'])
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            
+            if profiler is not None:
+                self.profiles.setdefault(path, []).append(profiler)
+    
+    def report(self, **context):
+        """Rapport de temps structuré (étapes, profils), prêt pour JSON"""
+        report = dict(context)
+        report['wall'] = time.perf_counter() - self._started
+        report['stages'] = {path: dict(stats) for path, stats in self.stages.items()}
+        if self.profiles:
+            report['profiles'] = {path: self._top_functions(profilers)
+                                  for path, profilers in self.profiles.items()}
+        return report
+    
+    def write(self, path, **context):
+        """Écrit le rapport de temps en JSON et renvoie son chemin"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**context), f, indent=2)
+        return path
+    
+    def _top_functions(self, profilers):
+        """Fonctions les plus coûteuses (temps cumulé) des captures cProfile d'une étape"""
+        import pstats
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+        return [{'function': f'{filename}:{line}({function})', 'calls': calls,
+                 'total': total, 'cumulative': cumulative}
+                for (filename, line, function), (_, calls, total, cumulative, _) in rows]
+
+
+# Étape neutre des chronomètres désactivés (aucun coût au-delà d'un test)
+_NO_STAGE = contextlib.nullcontext()
+
+
+def timed(name):
+    """Décorateur de méthode chronométrant l'appel avec le chronomètre de l'analyseur"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.timer.enabled:
+                return method(self, *args, **kwargs)
+            with self.timer.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class ResultCache:
+    """Cache disque adressé par contenu, borné en taille avec éviction LRU"""
+    
+    def __init__(self, directory, max_bytes=256 * 1024 ** 2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+    
+    @staticmethod
+    def key(*parts):
+        """Clé SHA-256 des éléments (JSON canonique) et de la version du code"""
+        payload = json.dumps([_code_version(), *parts], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get_arrays(self, key):
+        """Renvoie les tableaux {nom: tableau} mémorisés sous key, ou None"""
+        path = os.path.join(self.directory, f'{key}.npz')
+        try:
+            with np.load(path) as archive:
+                data = {name: archive[name] for name in archive.files}
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self._touch(path)
+        self.hits += 1
+        return data
+    
+    def put_arrays(self, key, data):
+        """Mémorise des tableaux dans une archive .npz non compressée"""
+        self._store(f'{key}.npz', lambda f: np.savez(f, **data))
+    
+    def get_file(self, key, suffix, destination):
+        """Copie le fichier mémorisé sous key vers destination ; False si absent"""
+        path = os.path.join(self.directory, f'{key}{suffix}')
+        try:
+            shutil.copyfile(path, destination)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self._touch(path)
+        self.hits += 1
+        return True
+    
+    def put_file(self, key, suffix, source):
+        """Mémorise une copie d'un fichier produit (figure, export...)"""
+        def write(f):
+            with open(source, 'rb') as src:
+                shutil.copyfileobj(src, f)
+        self._store(f'{key}{suffix}', write)
+    
+    def stats(self):
+        """Compteurs de succès/échecs et occupation disque"""
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+    
+    def _touch(self, path):
+        """Marque une entrée comme récemment utilisée (date de modification)"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+    
+    def _store(self, name, write):
+        """Écrit une entrée de façon atomique puis applique la borne de taille"""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp, os.path.join(self.directory, name))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self._evict()
+    
+    def _entries(self):
+        """Entrées (date d'accès, taille, chemin), des plus anciennes aux plus récentes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.tmp'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+    
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class RunningMoments:
+    """Moyenne et variance cumulées par cellule (période × colonne), fusionnables"""
+    
+    def __init__(self, shape):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+    
+    def update(self, block):
+        """Ajoute un bloc (scénario × période × colonne)"""
+        other = RunningMoments(self.mean.shape)
+        other.count = len(block)
+        other.mean = block.mean(axis=0, dtype=np.float64)
+        other.m2 = ((block - other.mean) ** 2).sum(axis=0)
+        self.merge(other)
+    
+    def merge(self, other):
+        """Combine deux accumulateurs (formule parallèle de Chan)"""
+        total = self.count + other.count
+        if total == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / total)
+        self.count = total
+        return self
+    
+    @property
+    def variance(self):
+        """Variance d'échantillon (ddof=1)"""
+        return self.m2 / max(self.count - 1, 1)
+
+
+class QuantileSketch:
+    """Histogramme à bornes fixes par cellule : quantiles approchés, fusionnables"""
+    
+    def __init__(self, lo, hi, bins=256):
+        self.lo = np.asarray(lo, dtype=float)
+        self.hi = np.asarray(hi, dtype=float)
+        self.bins = bins
+        self.counts = np.zeros(self.lo.shape + (bins,), dtype=np.int64)
+        self.min = np.full(self.lo.shape, np.inf)
+        self.max = np.full(self.lo.shape, -np.inf)
+    
+    @classmethod
+    def from_block(cls, block, bins=256, margin=0.5):
+        """Bornes déduites d'un premier bloc, élargies de margin × l'étendue de chaque côté"""
+        lo, hi = block.min(axis=0), block.max(axis=0)
+        span = np.where(hi > lo, hi - lo, np.maximum(np.abs(hi) * 0.01, 1e-9))
+        return cls(lo - margin * span, hi + margin * span, bins)
+    
+    def update(self, block):
+        """Ajoute un bloc (scénario × période × colonne) en un seul np.bincount"""
+        width = (self.hi - self.lo) / self.bins
+        index = np.clip(((block - self.lo) / width).astype(np.int64), 0, self.bins - 1)
+        cells = np.arange(self.lo.size).reshape(self.lo.shape) * self.bins
+        flat = (index + cells).ravel()
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+        self.min = np.minimum(self.min, block.min(axis=0))
+        self.max = np.maximum(self.max, block.max(axis=0))
+    
+    def merge(self, other):
+        """Combine deux esquisses construites sur les mêmes bornes"""
+        if not (np.array_equal(self.lo, other.lo) and np.array_equal(self.hi, other.hi)
+                and self.bins == other.bins):
+            raise ValueError("Cannot merge quantile sketches with different bin edges")
+        self.counts += other.counts
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+    
+    def quantile(self, q):
+        """Quantile q (0-1) par cellule, interpolé linéairement dans le bon intervalle"""
+        cdf = np.cumsum(self.counts, axis=-1)
+        total = cdf[..., -1]
+        target = q * total
+        index = np.argmax(cdf >= target[..., None], axis=-1)
+        before = np.where(index > 0, np.take_along_axis(cdf, np.maximum(index - 1, 0)[..., None], -1)[..., 0], 0)
+        inside = np.take_along_axis(self.counts, index[..., None], -1)[..., 0]
+        fraction = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0.0)
+        width = (self.hi - self.lo) / self.bins
+        return np.clip(self.lo + (index + fraction) * width, self.min, self.max)
+
+
+def _period_grid(start_year, end_year, periods_per_year):
+    """Renvoie l'année civile et le rang (1..n) de chaque période de l'horizon"""
+    n_years = end_year - start_year + 1
+    years = np.repeat(np.arange(start_year, end_year + 1), periods_per_year)
+    periods = np.tile(np.arange(1, periods_per_year + 1), n_years)
+    return years, periods
+
+
+def _period_frame(columns, years, periods):
+    """DataFrame indexé par Year (ou Year × Period en infra-annuel)"""
+    import pandas as pd
+    
+    if periods.max() > 1:
+        index = pd.MultiIndex.from_arrays([years, periods], names=['Year', 'Period'])
+    else:
+        index = pd.Index(years, name='Year')
+    return pd.DataFrame(columns, index=index)
+
+
+def _stream_summary(seed, moments, sketch, percentiles, years, periods):
+    """Résumé (moyenne, écart-type, centiles approchés) d'accumulateurs de flux"""
+    columns = list(COLUMN_GRAPH)
+    bands = {f'P{q:g}': sketch.quantile(q / 100) for q in percentiles}
+    
+    # Même ordre que generate_ensemble : centiles regroupés par colonne
+    summary = {(column, label): band[:, j] for j, column in enumerate(columns) for label, band in bands.items()}
+    
+    std = np.sqrt(moments.variance)
+    return {
+        'seed': seed,
+        'n_scenarios': moments.count,
+        'columns': columns,
+        'mean': _period_frame(dict(zip(columns, moments.mean.T)), years, periods),
+        'std': _period_frame(dict(zip(columns, std.T)), years, periods),
+        'percentiles': _period_frame(summary, years, periods),
+        'moments': moments,
+        'sketch': sketch,
+    }
+
+
+class ParquetSink:
+    """Écrit les blocs de scénarios au fil de l'eau dans un fichier Parquet (format long)"""
+    
+    def __init__(self, path, columns, years, periods=None, compression='zstd'):
+        import pyarrow.parquet as pq
+        
+        self.path = path
+        self.columns = list(columns)
+        self.years = years
+        self.periods = periods
+        self._pq = pq
+        self._writer = None
+        self._compression = compression
+    
+    def write(self, first, draws):
+        """Ajoute un groupe de lignes (un bloc de scénarios) au fichier"""
+        n_scenarios, n_periods, _ = draws.shape
+        data = {
+            'Scenario': np.repeat(np.arange(first, first + n_scenarios), n_periods),
+            'Year': np.tile(self.years, n_scenarios),
+        }
+        if self.periods is not None:
+            data['Period'] = np.tile(self.periods, n_scenarios)
+        flat = draws.reshape(n_scenarios * n_periods, -1)
+        for j, column in enumerate(self.columns):
+            data[column] = flat[:, j]
+        
+        table = _arrow_table(data)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema, compression=self._compression)
+        self._writer.write_table(table)
+    
+    def close(self):
+        """Termine le fichier Parquet"""
+        if self._writer is not None:
+            self._writer.close()
+
+
+# Fichier d'index (métadonnées) d'un entrepôt d'ensembles, écrit en dernier
+ENSEMBLE_INDEX = 'index.json'
+ENSEMBLE_STORE_FORMAT = 1
+
+
+class EnsembleStore:
+    """Ensemble persisté (région × colonne × période × scénario), un fichier .npy projeté en mémoire par région"""
+    # Chaque (région, colonne, période) est une suite contiguë de scénarios : une requête ne lit
+    # que les cellules demandées, jamais le reste du fichier
+    
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(os.path.join(self.path, ENSEMBLE_INDEX), encoding='utf-8') as f:
+            self.index = json.load(f)
+        if self.index['format'] != ENSEMBLE_STORE_FORMAT:
+            raise ValueError(f"Unsupported ensemble store format: {self.index['format']}")
+        self.regions = list(self.index['files'])
+        self.columns = self.index['columns']
+        self.years = np.array(self.index['years'])
+        self.periods = np.array(self.index['periods']) if self.index['periods'] is not None else None
+        self.n_scenarios = self.index['n_scenarios']
+        self._column_index = {column: j for j, column in enumerate(self.columns)}
+        self._arrays = {}
+    
+    def percentile(self, region, column, q, year=None, period=None):
+        """Centile(s) q (en %) d'une colonne, pour une année (et une période) ou tout l'horizon"""
+        return self._squeeze(np.percentile(self._cells(region, column, year, period), q, axis=-1))
+    
+    def mean(self, region, column, year=None, period=None):
+        """Moyenne des scénarios d'une colonne, pour une année (et une période) ou tout l'horizon"""
+        return self._squeeze(self._cells(region, column, year, period).mean(axis=-1, dtype=np.float64))
+    
+    def exceedance(self, region, column, threshold, year=None, period=None):
+        """Probabilité que la colonne dépasse threshold, pour une année (et une période) ou tout l'horizon"""
+        return self._squeeze((self._cells(region, column, year, period) > threshold).mean(axis=-1))
+    
+    def _array(self, region):
+        """Tableau (colonne × période × scénario) de la région, projeté en mémoire à la première requête"""
+        if region not in self._arrays:
+            if region not in self.index['files']:
+                raise ValueError(f"Region not in ensemble store: {region}")
+            self._arrays[region] = np.load(os.path.join(self.path, self.index['files'][region]), mmap_mode='r')
+        return self._arrays[region]
+    
+    def _cells(self, region, column, year=None, period=None):
+        """Vue (période × scénario) des cellules demandées, sans lecture des autres tranches"""
+        if column not in self._column_index:
+            raise ValueError(f"Column not in ensemble store: {column}")
+        rows = np.ones(len(self.years), dtype=bool)
+        if year is not None:
+            rows &= self.years == year
+        if period is not None:
+            if self.periods is None:
+                raise ValueError("This ensemble store is annual: periods are not available")
+            rows &= self.periods == period
+        if not rows.any():
+            raise ValueError(f"No period of the ensemble store matches year={year}, period={period}")
+        # Périodes sélectionnées régulièrement espacées (consécutives pour une année, une par
+        # an pour une période seule) : une tranche simple, sans copie
+        t = np.flatnonzero(rows)
+        step = int(t[1] - t[0]) if len(t) > 1 else 1
+        return self._array(region)[self._column_index[column], t[0]:t[-1] + 1:step]
+    
+    @staticmethod
+    def _squeeze(values):
+        """Valeur scalaire pour une seule période, tableau (… × période) sinon"""
+        values = np.asarray(values)
+        if values.shape[-1] == 1:
+            values = values[..., 0]
+        return float(values) if values.ndim == 0 else values
+
+
+# Insights : colonnes lues, classes d'accessibilité (ratio prix / revenu au-dessus du seuil,
+# de la plus sévère à la plus favorable), événements et recommandations
+INSIGHT_COLUMNS = ('Median_Home_Price', 'Median_Income', 'Average_Rent', 'Population', 'Rental_Vacancy_Rate')
+AFFORDABILITY_CLASSES = ((5, 'Critical'), (4, 'Severe'), (3, 'Moderate'))
+AFFORDABILITY_DEFAULT = 'Good'
+AFFORDABILITY_ORDER = tuple(label for _, label in AFFORDABILITY_CLASSES) + (AFFORDABILITY_DEFAULT,)
+
+TEXAS_EVENTS = (
+    "2002-2008: Oil and gas boom driving growth",
+    "2008-2009: Mild impact from financial crisis",
+    "2010-2014: Shale revolution and energy boom",
+    "2015-2016: Oil price collapse affecting energy regions",
+    "2015-present: Major tech migration to Texas",
+    "2020-2021: COVID-19 pandemic with Texas resilience",
+    "2021-present: Massive population growth and development",
+    "Ongoing: Business-friendly policies attracting companies",
+)
+
+SPECIALTY_RECOMMENDATIONS = (
+    ("énergie", ("Diversify beyond oil and gas dependence", "Invest in renewable energy transition")),
+    ("technologie", ("Continue attracting tech companies and talent", "Develop innovation districts and tech hubs")),
+    ("manufacturing", ("Support advanced manufacturing development", "Invest in workforce training programs")),
+)
+GENERAL_RECOMMENDATIONS = (
+    "Manage rapid growth with infrastructure investment",
+    "Maintain housing affordability through supply",
+    "Invest in transportation and water infrastructure",
+    "Support small business and entrepreneurship",
+    "Focus on sustainable development practices",
+)
+
+
+def affordability_class(ratio):
+    """Classe d'accessibilité du logement pour un ou plusieurs ratios prix / revenu"""
+    ratio = np.asarray(ratio)
+    return np.select([ratio > threshold for threshold, _ in AFFORDABILITY_CLASSES],
+                     [label for _, label in AFFORDABILITY_CLASSES], AFFORDABILITY_DEFAULT)
+
+
+def _insight_metrics(stats):
+    """Indicateurs à partir des résumés de colonnes {colonne: (moyenne, première, dernière valeur)}"""
+    # Scalaires ou tableaux (un élément par groupe) indifféremment
+    price, income, rent, population, vacancy = (stats[column] for column in INSIGHT_COLUMNS)
+    ratio = price[2] / income[2]
+    return {
+        'avg_home_price': price[0],
+        'avg_income': income[0],
+        'avg_rent': rent[0],
+        'price_to_income_ratio': price[0] / income[0],
+        'home_price_growth_pct': (price[2] / price[1] - 1) * 100,
+        'population_growth_pct': (population[2] / population[1] - 1) * 100,
+        'current_home_price': price[2],
+        'current_income': income[2],
+        'current_price_to_income': ratio,
+        'affordability': affordability_class(ratio),
+        'current_vacancy_rate': vacancy[2],
+        'rent_growth_pct': (rent[2] / rent[1] - 1) * 100,
+    }
+
+
+def insight_table(df, by='region'):
+    """Indicateurs d'insights de chaque groupe (région, scénario…) d'un DataFrame long, en une passe groupby"""
+    import pandas as pd
+    
+    # Lignes supposées dans l'ordre chronologique à l'intérieur de chaque groupe
+    columns = list(INSIGHT_COLUMNS)
+    if by is None:
+        grouped = df[columns].groupby(np.zeros(len(df), dtype=int))
+    else:
+        grouped = df.groupby(by, sort=False, observed=True)[columns]
+    mean, first, last = grouped.mean(), grouped.first(), grouped.last()
+    
+    stats = {column: (mean[column].to_numpy(), first[column].to_numpy(), last[column].to_numpy())
+             for column in columns}
+    table = pd.DataFrame(_insight_metrics(stats), index=mean.index if by is not None else None)
+    table['affordability'] = pd.Categorical(table['affordability'], categories=AFFORDABILITY_ORDER)
+    return table
+
+
+def affordability_distribution(table, by='region', normalize=True):
+    """Répartition des classes d'accessibilité par groupe (part ou nombre de scénarios)"""
+    import pandas as pd
+    
+    keys = table.index.get_level_values(by) if by in (table.index.names or ()) else table[by]
+    counts = pd.crosstab(keys, table['affordability'], normalize='index' if normalize else False,
+                         rownames=[by], colnames=['affordability'])
+    return counts.reindex(columns=list(AFFORDABILITY_ORDER), fill_value=0.0 if normalize else 0)
+
+
+def render_insights(insights):
+    """Rendu texte d'insights structurés (ceux de TexasRealEstateAnalyzer.texas_insights)"""
+    years = f"{insights['start_year']}-{insights['end_year']}"
+    lines = [
+        f"🤠 TEXAS REAL ESTATE INSIGHTS - {insights['region']}",
+        "=" * 65,
+        "\n1. 📈 KEY STATISTICS:",
+        f"Average median home price: ${insights['avg_home_price']:,.0f}",
+        f"Average median income: ${insights['avg_income']:,.0f}",
+        f"Average rent: ${insights['avg_rent']:.0f}",
+        f"Price-to-income ratio: {insights['price_to_income_ratio']:.1f}",
+        "\n2. 📊 REAL ESTATE GROWTH:",
+        f"Home price growth ({years}): {insights['home_price_growth_pct']:.1f}%",
+        f"Population growth ({years}): {insights['population_growth_pct']:.1f}%",
+        "\n3. 🏠 HOUSING AFFORDABILITY:",
+        f"Current price-to-income ratio: {insights['current_price_to_income']:.1f} ({insights['affordability']})",
+        "\n4. 🏢 RENTAL MARKET:",
+        f"Current vacancy rate: {insights['current_vacancy_rate']:.1f}%",
+        f"Rent growth ({years}): {insights['rent_growth_pct']:.1f}%",
+        f"\n5. 🌟 {insights['region'].upper()} SPECIFICS:",
+        f"Region type: {insights['type']}",
+        f"Specializations: {', '.join(insights['specialites'])}",
+        f"Major cities: {', '.join(insights['major_cities'])}",
+        f"Real estate segment: {insights['segment_immobilier']}",
+        "\n6. 📅 KEY TEXAS REAL ESTATE EVENTS:",
+    ]
+    lines += [f"• {event}" for event in insights['events']]
+    lines.append("\n7. 💡 STRATEGIC RECOMMENDATIONS:")
+    lines += [f"• {recommendation}" for recommendation in insights['recommendations']]
+    return "\n".join(lines)
+
+
+class StressScenarios:
+    """Chocs synthétiques tirés par scénario (survenue, date, durée, sévérité), communs aux régions"""
+    
+    def __init__(self, templates=None, window=None, seed=None):
+        self.templates = dict(STRESS_TEMPLATES if templates is None else templates)
+        for name, template in self.templates.items():
+            unknown = [column for column in template['effects'] if column not in COLUMN_GRAPH]
+            if unknown:
+                raise ValueError(f"Stress template {name!r}: unknown column {', '.join(unknown)}")
+            low, high = template['duration']
+            if not 1 <= low <= high:
+                raise ValueError(f"Stress template {name!r}: invalid duration {template['duration']!r}")
+        # Fenêtre (première, dernière année) des débuts de chocs (None = horizon simulé)
+        self.window = window
+        self.seed = np.random.SeedSequence(seed).entropy
+    
+    def sample(self, start, stop, years):
+        """Tire les chocs des scénarios [start, stop) : {modèle: (survient, début, fin, sévérité)}"""
+        first_year, last_year = self.window or (int(years[0]), int(years[-1]))
+        
+        # Un flux par bloc de scénarios, tirages (scénario × modèle × 4) : les scénarios
+        # en tête, chaque scénario tire les mêmes chocs quel que soit le découpage
+        blocks = []
+        for chunk in range(start // SCENARIO_CHUNK, (stop - 1) // SCENARIO_CHUNK + 1):
+            first = chunk * SCENARIO_CHUNK
+            lo = max(start, first) - first
+            hi = min(stop, first + SCENARIO_CHUNK) - first
+            stream = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(STRESS_KEY, chunk)))
+            blocks.append(stream.random((hi, len(self.templates), 4))[lo:])
+        u = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+        
+        shocks = {}
+        for k, (name, template) in enumerate(self.templates.items()):
+            low, high = template['duration']
+            begin = first_year + np.floor(u[:, k, 1] * (last_year - first_year + 1)).astype(int)
+            duration = low + np.floor(u[:, k, 2] * (high - low + 1)).astype(int)
+            shocks[name] = (u[:, k, 0] < template['probability'], begin, begin + duration - 1, u[:, k, 3])
+        return shocks
+    
+    def multipliers(self, start, stop, years, columns, specialties):
+        """Compile les chocs des scénarios [start, stop) en un tenseur (scénario × période × colonne)"""
+        years = np.asarray(years)
+        index = {column: j for j, column in enumerate(columns)}
+        tensor = np.ones((stop - start, len(years), len(columns)))
+        
+        for name, (occurs, begin, end, severity) in self.sample(start, stop, years).items():
+            template = self.templates[name]
+            if template['specialty'] is not None and template['specialty'] not in specialties:
+                continue
+            active = occurs[:, None] & (years >= begin[:, None]) & (years <= end[:, None])
+            for column, (mild, severe) in template['effects'].items():
+                if column in index:
+                    factor = mild + severity * (severe - mild)
+                    tensor[:, :, index[column]] *= np.where(active, factor[:, None], 1.0)
+        return tensor
+
+
+# Analyseur du processus de travail des ensembles parallèles (transmis une fois par processus)
+_WORKER_ANALYZER = None
+
+
+def _init_ensemble_worker(analyzer):
+    """Initialise un processus de travail avec sa copie de l'analyseur"""
+    global _WORKER_ANALYZER
+    _WORKER_ANALYZER = analyzer
+
+
+def _ensemble_worker(name, shape, dtype, first, last):
+    """Simule les scénarios [first, last) et les écrit dans la mémoire partagée name"""
+    from multiprocessing import shared_memory
+    
+    analyzer = _WORKER_ANALYZER
+    years, _ = analyzer._period_grid()
+    draws = analyzer._simulate_scenarios(years, first, last)
+    
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+        block[:, :, first:last] = draws.transpose(2, 1, 0)
+        del block
+    finally:
+        memory.close()
+    return last - first
+
+
+def stress_metrics(scenarios, tail=STRESS_TAIL):
+    """Métriques de queue d'un tableau de scénarios de stress (une ligne par scénario)"""
+    drawdown = np.sort(scenarios['home_price_drawdown'].to_numpy())[::-1]
+    balance = np.sort(scenarios['worst_budget_balance'].to_numpy())
+    n_tail = max(1, int(np.ceil(tail * len(scenarios))))
+    
+    metrics = {
+        'home_price_drawdown_mean': drawdown.mean(),
+        'home_price_drawdown_p90': np.quantile(drawdown, 1 - tail),
+        'home_price_drawdown_worst_decile': drawdown[:n_tail].mean(),
+        'final_home_price_p10': np.quantile(scenarios['final_home_price'], tail),
+        'final_home_price_median': np.median(scenarios['final_home_price']),
+        'worst_budget_balance_worst_decile': balance[:n_tail].mean(),
+        'critical_affordability_share': np.mean(affordability_class(scenarios['price_to_income']) ==
+                                                AFFORDABILITY_CLASSES[0][1]),
+    }
+    for column in scenarios.columns:
+        if column.startswith('shock_'):
+            metrics[f'{column}_share'] = scenarios[column].mean()
+    return {name: float(value) for name, value in metrics.items()}
+
+
 class TexasRealEstateAnalyzer:
-    def __init__(self, region_name):
+    def __init__(self, region_name, shocks=None, seed=None, start_year=2002, end_year=2025, cache=None,
+                 frequency='annual', compact=False, timer=None, catalog=None, correlation=None,
+                 stress=None):
         self.region = region_name
         self.colors = ['#BF0A30', '#002868', '#666666', '#008751', '#FFA300', 
                       '#8B4513', '#228B22', '#FFD700', '#8A2BE2', '#DC143C']
         
-        self.start_year = 2002
-        self.end_year = 2025
-        
-        # Configuration spécifique à chaque région du Texas
+        self.start_year = start_year
+        self.end_year = end_year
+        
+        # Fréquence des séries (annuelle, trimestrielle ou mensuelle)
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency: {frequency} (expected one of {', '.join(FREQUENCIES)})")
+        self.frequency = frequency
+        self.periods_per_year = FREQUENCIES[frequency]
+        
+        # Configuration spécifique à chaque région du Texas (catalogue par défaut ou fichier)
+        if catalog is None:
+            catalog = load_region_catalog()
+        elif isinstance(catalog, (str, os.PathLike)):
+            catalog = load_region_catalog(os.fspath(catalog))
+        self.catalog = catalog
+        self._row = catalog.row(region_name)
         self.config = self._get_region_config()
         
-    def _get_region_config(self):
-        """Retourne la configuration spécifique pour chaque région du Texas"""
-        configs = {
-            "Dallas-Fort Worth": {
-                "population_base": 7600000,
-                "budget_base": 9800,
-                "type": "corporate_tech",
-                "specialites": ["technologie", "finance", "corporate", "logistique", "defense"],
-                "prix_m2_base": 3200,
-                "segment_immobilier": "corporate_affordable",
-                "currency": "USD",
-                "major_cities": ["Dallas", "Fort Worth", "Arlington", "Plano"]
-            },
-            "Houston Metro": {
-                "population_base": 7300000,
-                "budget_base": 9200,
-                "type": "energy_medical",
-                "specialites": ["énergie", "pétrole", "médecine", "port", "aérospatial"],
-                "prix_m2_base": 2800,
-                "segment_immobilier": "energy_driven",
-                "currency": "USD",
-                "major_cities": ["Houston", "The Woodlands", "Sugar Land", "Pearland"]
-            },
-            "Austin Area": {
-                "population_base": 2300000,
-                "budget_base": 4800,
-                "type": "tech_innovation",
-                "specialites": ["technologie", "innovation", "musique", "éducation", "startups"],
-                "prix_m2_base": 4500,
-                "segment_immobilier": "tech_boom",
-                "currency": "USD",
-                "major_cities": ["Austin", "Round Rock", "Cedar Park", "San Marcos"]
-            },
-            "San Antonio": {
-                "population_base": 2600000,
-                "budget_base": 3800,
-                "type": "military_tourism",
-                "specialites": ["militaire", "tourisme", "santé", "éducation", "culture"],
-                "prix_m2_base": 2200,
-                "segment_immobilier": "affordable_growth",
-                "currency": "USD",
-                "major_cities": ["San Antonio", "New Braunfels", "Schertz", "Converse"]
-            },
-            "El Paso Area": {
-                "population_base": 850000,
-                "budget_base": 1800,
-                "type": "border_manufacturing",
-                "specialites": ["manufacturing", "commerce_frontalier", "defense", "logistique", "services"],
-                "prix_m2_base": 1500,
-                "segment_immobilier": "border_affordable",
-                "currency": "USD",
-                "major_cities": ["El Paso", "Socorro", "Horizon City"]
-            },
-            "Rio Grande Valley": {
-                "population_base": 1400000,
-                "budget_base": 2200,
-                "type": "agricultural_border",
-                "specialites": ["agriculture", "commerce_frontalier", "tourisme", "santé", "éducation"],
-                "prix_m2_base": 1200,
-                "segment_immobilier": "rural_affordable",
-                "currency": "USD",
-                "major_cities": ["McAllen", "Brownsville", "Edinburg", "Harlingen"]
-            },
-            "West Texas": {
-                "population_base": 600000,
-                "budget_base": 1500,
-                "type": "energy_agricultural",
-                "specialites": ["énergie", "pétrole", "agriculture", "élevage", "éolien"],
-                "prix_m2_base": 1800,
-                "segment_immobilier": "rural_energy",
-                "currency": "USD",
-                "major_cities": ["Midland", "Odessa", "Lubbock", "Amarillo"]
-            },
-            "Central Texas": {
-                "population_base": 1200000,
-                "budget_base": 2500,
-                "type": "mixed_agricultural",
-                "specialites": ["agriculture", "manufacturing", "éducation", "services", "tourisme_rural"],
-                "prix_m2_base": 2000,
-                "segment_immobilier": "rural_mixed",
-                "currency": "USD",
-                "major_cities": ["Waco", "Temple", "Killeen", "College Station"]
-            },
-            # Configuration par défaut
-            "default": {
-                "population_base": 1000000,
-                "budget_base": 2000,
-                "type": "mixed_development",
-                "specialites": ["residentiel", "commerce_local", "services"],
-                "prix_m2_base": 2500,
-                "segment_immobilier": "mixed",
-                "currency": "USD",
-                "major_cities": ["Multiple cities"]
-            }
-        }
+        # Calendrier des chocs (table par défaut, tuple de chocs ou fichier JSON/CSV)
+        self.shocks = self._load_shocks(shocks)
+        
+        # Graine racine de l'arbre de flux aléatoires (entropie fraîche si absente,
+        # conservée pour pouvoir reproduire le tirage)
+        self.seed = np.random.SeedSequence(seed).entropy
+        self._seeded = seed is not None
+        self._region_key = zlib.crc32(self.region.encode('utf-8'))
+        self._column_keys = {column: j for j, column in enumerate(COLUMN_GRAPH)}
+        
+        # Plage de scénarios tirés simultanément (None = une seule réalisation, le scénario 0)
+        self._scenarios = None
+        
+        # Bruit corrélé entre colonnes (None = un flux indépendant par colonne) : un seul
+        # tirage (scénario × période × colonne) par bloc, mis en corrélation par Cholesky
+        self.correlation = correlation
+        self._noise_factor = _noise_factor(correlation, self.config['type'])
+        self._joint = None
+        
+        # Chocs synthétiques (StressScenarios) superposés aux ensembles de scénarios
+        # (None = calendrier des chocs seul)
+        self.stress = stress
+        
+        # Cache disque des résultats (seulement pour les analyses à graine explicite)
+        self.cache = cache
+        
+        # Types de stockage des séries (calculs toujours en float64, arrondi à l'écriture)
+        self.compact = compact
+        self.dtype = COMPACT_FLOAT if compact else np.float64
+        
+        # Chronométrage des étapes (désactivé par défaut)
+        self.timer = timer if timer is not None else StageTimer(enabled=False)
+        
+        # Recalcul incrémental : paramètres modifiés par update_config, nombre de modifications
+        # (update_*), dernier calcul (valeurs, paramètres lus par colonne, tendances) et
+        # colonnes recalculées
+        self._overrides = {}
+        self._edits = 0
+        self._previous = None
+        self._reads = None
+        self.recomputed = []
+        self._insight_cache = None
         
-        return configs.get(self.region, configs["default"])
+    def _get_region_config(self):
+        """Retourne la configuration spécifique de la région (ligne du catalogue)"""
+        return self.catalog.config(self._row)
+    
+    def _param(self, name):
+        """Paramètre de la région lu par un simulateur (mémorisé pour le recalcul incrémental)"""
+        value = self._param_value(name)
+        if self._reads is not None:
+            self._reads[name] = value
+        return value
+    
+    def _param_value(self, name):
+        """Paramètre précalculé de la région (voir RegionCatalog.params), modifications comprises"""
+        if name in self._overrides:
+            return self._overrides[name]
+        return self.catalog.params[name][self._row]
+    
+    def _load_shocks(self, shocks):
+        """Normalise un calendrier de chocs (None = table par défaut, chemin JSON/CSV ou tuples)"""
+        if shocks is None:
+            return TEXAS_SHOCKS
+        if isinstance(shocks, (str, os.PathLike)):
+            return load_shock_calendar(shocks)
+        return tuple(shocks)
+    
+    def update_config(self, **fields):
+        """Modifie des champs de configuration ; seules les colonnes concernées seront recalculées"""
+        config = dict(self.config, **fields)
+        params = RegionCatalog({'default': config}).params
+        retyped = config['type'] != self.config['type']
+        self.config = config
+        self._overrides = {name: values[0] for name, values in params.items()}
+        self._edits += 1
+        
+        # Nouveau type de région : modèle de corrélation du bruit de ce type
+        if retyped and self.correlation is not None:
+            self.update_correlation(self.correlation)
+    
+    def update_shocks(self, shocks):
+        """Remplace le calendrier des chocs ; seules les colonnes concernées seront recalculées"""
+        self.shocks = self._load_shocks(shocks)
+        self._edits += 1
     
-    def generate_financial_data(self):
+    def update_correlation(self, correlation):
+        """Remplace le modèle de corrélation du bruit ; toutes les colonnes seront recalculées"""
+        self._noise_factor = _noise_factor(correlation, self.config['type'])
+        self.correlation = correlation
+        self._previous = None
+        self._edits += 1
+    
+    def generate_financial_data(self, labels=False):
         """Génère des données financières et immobilières pour la région du Texas"""
+        import pandas as pd
+        
+        df = pd.DataFrame(self.generate_financial_arrays(), copy=False)
+        if labels:
+            # Libellés de la région (catégoriels en mode compact)
+            values = {'region': self.region, 'type': self.config['type'],
+                      'segment_immobilier': self.config['segment_immobilier']}
+            for position, column in enumerate(LABEL_COLUMNS):
+                label = np.full(len(df), values[column], dtype=object)
+                df.insert(position, column, pd.Categorical(label) if self.compact else label)
+        return df
+    
+    @timed('generate')
+    def generate_financial_arrays(self):
+        """Génère les mêmes colonnes que generate_financial_data sous forme de tableaux NumPy"""
         print(f"🤠 Génération des données financières et immobilières pour {self.region}, Texas...")
         
-        # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
-        
-        data = {'Year': [date.year for date in dates]}
-        
-        # Données démographiques
-        data['Population'] = self._simulate_population(dates)
-        data['Households'] = self._simulate_households(dates)
-        data['Median_Income'] = self._simulate_median_income(dates)
-        
-        # Recettes régionales (en millions de dollars)
-        data['Total_Revenue'] = self._simulate_total_revenue(dates)
-        data['Property_Tax_Revenue'] = self._simulate_property_tax_revenue(dates)
-        data['State_Federal_Funding'] = self._simulate_government_funding(dates)
-        data['Business_Tax_Revenue'] = self._simulate_business_tax_revenue(dates)
-        data['Energy_Revenue'] = self._simulate_energy_revenue(dates)
-        data['Other_Revenue'] = self._simulate_other_revenue(dates)
-        
-        # Dépenses régionales
-        data['Total_Expenses'] = self._simulate_total_expenses(dates)
-        data['Infrastructure_Expenses'] = self._simulate_infrastructure_expenses(dates)
-        data['Public_Services_Expenses'] = self._simulate_public_services_expenses(dates)
-        data['Education_Expenses'] = self._simulate_education_expenses(dates)
-        data['Healthcare_Expenses'] = self._simulate_healthcare_expenses(dates)
-        
-        # Indicateurs financiers
-        data['Budget_Surplus_Deficit'] = self._simulate_budget_balance(dates)
-        data['Regional_Debt'] = self._simulate_regional_debt(dates)
-        data['Debt_to_Revenue_Ratio'] = self._simulate_debt_ratio(dates)
-        
-        # Données immobilières (spécifiques au Texas)
-        data['Median_Home_Price'] = self._simulate_median_home_price(dates)
-        data['Price_per_Sqft'] = self._simulate_price_per_sqft(dates)
-        data['Home_Sales_Volume'] = self._simulate_home_sales(dates)
-        data['New_Construction_Permits'] = self._simulate_construction_permits(dates)
-        data['Rental_Vacancy_Rate'] = self._simulate_vacancy_rate(dates)
-        data['Average_Rent'] = self._simulate_average_rent(dates)
-        
-        # Investissements spécifiques adaptés au Texas
-        data['Energy_Investment'] = self._simulate_energy_investment(dates)
-        data['Tech_Investment'] = self._simulate_tech_investment(dates)
-        data['Infrastructure_Investment'] = self._simulate_infrastructure_investment(dates)
-        data['Housing_Development_Investment'] = self._simulate_housing_investment(dates)
-        data['Manufacturing_Investment'] = self._simulate_manufacturing_investment(dates)
-        data['Agricultural_Investment'] = self._simulate_agricultural_investment(dates)
-        
-        df = pd.DataFrame(data)
-        
-        # Ajouter des tendances spécifiques au marché texan
-        self._add_texas_trends(df)
+        key = self._cache_key('data', np.dtype(self.dtype).name)
+        if key is not None:
+            data = self.cache.get_arrays(key)
+            if data is not None:
+                # Résultat lu sans calcul : aucun état incrémental réutilisable, toutes les
+                # colonnes sont nouvelles et les résumés des insights sont à refaire
+                self._previous = None
+                self.recomputed = list(COLUMN_GRAPH)
+                self._insight_cache = None
+                return data
+        
+        # Grille des périodes (année civile de chaque période, rang dans l'année)
+        years, periods = self._period_grid()
+        
+        # Séries calculées sur le graphe des colonnes, tendances texanes incluses,
+        # écrites en place dans un bloc préalloué (une colonne contiguë par série)
+        block = np.empty((len(COLUMN_GRAPH), len(years)), dtype=self.dtype).T
+        self._simulate_columns(years, block)
+        
+        data = {'Year': self._calendar(years, 'Year')}
+        if self.periods_per_year > 1:
+            data['Period'] = self._calendar(periods, 'Period')
+        data.update((column, block[:, j]) for j, column in enumerate(COLUMN_GRAPH))
+        
+        if key is not None:
+            self.cache.put_arrays(key, data)
+        
+        return data
+    
+    def compact_report(self, n_scenarios=0):
+        """Compare le mode compact au float64 : mémoire économisée et erreur numérique"""
+        import pandas as pd
+        
+        # Mêmes tirages (même graine) dans les deux types de stockage
+        wide, narrow = (TexasRealEstateAnalyzer(self.region, shocks=self.shocks, seed=self.seed,
+                                                start_year=self.start_year, end_year=self.end_year,
+                                                frequency=self.frequency, compact=compact,
+                                                correlation=self.correlation)
+                        for compact in (False, True))
+        reference = wide.generate_financial_data(labels=True)
+        compact = narrow.generate_financial_data(labels=True)
+        
+        errors = {}
+        for column in COLUMN_GRAPH:
+            exact = reference[column].to_numpy()
+            error = np.abs(compact[column].to_numpy(dtype=np.float64) - exact)
+            scale = np.where(exact != 0, np.abs(exact), 1.0)
+            errors[column] = {'max_abs_error': error.max(), 'max_rel_error': (error / scale).max()}
+        
+        report = {
+            'bytes_float64': int(reference.memory_usage(deep=True).sum()),
+            'bytes_compact': int(compact.memory_usage(deep=True).sum()),
+            'errors': pd.DataFrame(errors).T,
+        }
         
-        return df
+        # Ensemble : le bloc (scénario × période × colonne) domine la mémoire
+        if n_scenarios:
+            years, _ = self._period_grid()
+            draws = narrow._simulate_scenarios(years, 0, n_scenarios)
+            report['ensemble_bytes_float64'] = draws.size * np.dtype(np.float64).itemsize
+            report['ensemble_bytes_compact'] = draws.nbytes
+        
+        saved = 1 - report['bytes_compact'] / report['bytes_float64']
+        print(f"📦 Compact mode: {report['bytes_float64']:,} -> {report['bytes_compact']:,} bytes "
+              f"({saved:.0%} saved), max relative error {report['errors']['max_rel_error'].max():.2e}")
+        if n_scenarios:
+            print(f"📦 Ensemble of {n_scenarios:,}: {report['ensemble_bytes_float64'] / 1024 ** 2:.1f} MB "
+                  f"-> {report['ensemble_bytes_compact'] / 1024 ** 2:.1f} MB")
+        return report
+    
+    def _cache_key(self, kind, *extra):
+        """Clé de cache de l'analyse (config, graine, horizon, chocs), None sans cache"""
+        if self.cache is None or not self._seeded:
+            return None
+        return self.cache.key(kind, self.region, self.config, self.seed, self.start_year,
+                              self.end_year, self.frequency, self.shocks,
+                              None if self._noise_factor is None else self._noise_factor.tolist(), *extra)
+    
+    def _calendar(self, values, column):
+        """Colonne calendaire dans son type de stockage (petits entiers en mode compact)"""
+        return values.astype(COMPACT_INTS[column]) if self.compact else values
     
-    def _simulate_population(self, dates):
+    def _period_grid(self):
+        """Renvoie l'année civile et le rang (1..n) de chaque période de l'horizon"""
+        return _period_grid(self.start_year, self.end_year, self.periods_per_year)
+    
+    def _elapsed_years(self, n):
+        """Temps écoulé (en années) depuis le début de l'horizon pour chacune des n périodes"""
+        return np.arange(n) / self.periods_per_year
+    
+    def _seasonality(self, monthly_factors, n):
+        """Facteurs saisonniers des n périodes (moyennes trimestrielles, 1.0 en annuel)"""
+        if self.periods_per_year == 1:
+            return 1.0
+        factors = np.asarray(monthly_factors).reshape(self.periods_per_year, -1).mean(axis=1)
+        return np.resize(factors, n)
+    
+    def __getstate__(self):
+        """État transmis aux processus de travail (sans chronométrage, cache ni dernier calcul)"""
+        state = dict(self.__dict__)
+        state.update(timer=StageTimer(enabled=False), cache=None, _previous=None, _joint=None,
+                     _insight_cache=None)
+        return state
+    
+    @timed('ensemble')
+    def generate_ensemble(self, n_scenarios=10_000, percentiles=(5, 50, 95), keep_draws=False, workers=1):
+        """Simule n_scenarios réalisations en une passe et les résume par centiles"""
+        print(f"🤠 Simulation de {n_scenarios:,} scénarios pour {self.region}, Texas...")
+        
+        years, periods = self._period_grid()
+        columns = list(COLUMN_GRAPH)
+        if workers is None or workers > 1:
+            return self._parallel_ensemble(n_scenarios, percentiles, keep_draws, workers, years, periods)
+        draws = self._simulate_scenarios(years, 0, n_scenarios)
+        
+        # Centiles calculés colonne par colonne (copie contiguë année × scénario)
+        # pour limiter la mémoire temporaire
+        labels = [f'P{q:g}' for q in percentiles]
+        summary = {}
+        for j, column in enumerate(columns):
+            block = np.ascontiguousarray(draws[:, :, j].T)
+            bands = np.percentile(block, percentiles, axis=1)
+            for label, band in zip(labels, bands):
+                summary[(column, label)] = band
+        
+        summary = _period_frame(summary, years, periods)
+        
+        return {
+            'seed': self.seed,
+            'years': years,
+            'columns': columns,
+            'percentiles': summary,
+            'draws': draws if keep_draws else None,
+        }
+    
+    def _parallel_ensemble(self, n_scenarios, percentiles, keep_draws, workers, years, periods):
+        """Ensemble réparti par blocs entre processus, écrit en mémoire partagée (colonne × période × scénario)"""
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        
+        # Blocs alignés sur SCENARIO_CHUNK : chaque tâche tire des blocs entiers de ses propres flux,
+        # le résultat ne dépend ni du nombre de processus ni de l'ordre d'exécution
+        shape = (len(COLUMN_GRAPH), len(years), n_scenarios)
+        dtype = np.dtype(self.dtype)
+        tasks = [(first, min(first + SCENARIO_CHUNK, n_scenarios)) for first in range(0, n_scenarios, SCENARIO_CHUNK)]
+        
+        # Moins de blocs que de processus : blocs découpés en sous-plages (mêmes tirages, chaque
+        # sous-plage retire le début de son bloc, le gain est donc moindre qu'avec des blocs entiers)
+        workers = workers or os.cpu_count() or 1
+        if len(tasks) < workers:
+            pieces = -(-workers // len(tasks))
+            tasks = [(first + k * (last - first) // pieces, first + (k + 1) * (last - first) // pieces)
+                     for first, last in tasks for k in range(pieces)]
+            tasks = [(first, last) for first, last in tasks if last > first]
+        
+        memory = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_ensemble_worker,
+                                     initargs=(self,)) as executor:
+                for future in [executor.submit(_ensemble_worker, memory.name, shape, dtype.str, first, last)
+                               for first, last in tasks]:
+                    future.result()
+            
+            # Centiles calculés directement sur le tampon partagé (partition en place sauf si
+            # les tirages sont conservés)
+            block = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+            bands = np.percentile(block, percentiles, axis=2, overwrite_input=not keep_draws)
+            draws = block.transpose(2, 1, 0).copy() if keep_draws else None
+            del block
+        finally:
+            memory.close()
+            memory.unlink()
+        
+        labels = [f'P{q:g}' for q in percentiles]
+        summary = {(column, label): bands[k, j]
+                   for j, column in enumerate(COLUMN_GRAPH) for k, label in enumerate(labels)}
+        
+        return {
+            'seed': self.seed,
+            'years': years,
+            'columns': list(COLUMN_GRAPH),
+            'percentiles': _period_frame(summary, years, periods),
+            'draws': draws,
+        }
+    
+    def iter_ensemble(self, n_scenarios, chunk_size=SCENARIO_CHUNK, as_frame=False, start=0):
+        """Génère les scénarios par blocs de taille fixe : (premier scénario, bloc)"""
+        years, periods = self._period_grid()
+        columns = list(COLUMN_GRAPH)
+        
+        for first in range(start, start + n_scenarios, chunk_size):
+            last = min(first + chunk_size, start + n_scenarios)
+            draws = self._simulate_scenarios(years, first, last)
+            
+            if not as_frame:
+                yield first, draws
+                continue
+            
+            # Format long : une ligne par (scénario, période)
+            import pandas as pd
+            n_periods = len(years)
+            frame = {
+                'Scenario': np.repeat(np.arange(first, last), n_periods),
+                'Year': np.tile(years, last - first),
+            }
+            if self.periods_per_year > 1:
+                frame['Period'] = np.tile(periods, last - first)
+            flat = draws.reshape(-1, len(columns))
+            for j, column in enumerate(columns):
+                frame[column] = flat[:, j]
+            yield first, pd.DataFrame(frame)
+    
+    def stream_ensemble(self, n_scenarios, chunk_size=SCENARIO_CHUNK, sink=None,
+                        percentiles=(5, 50, 95), bins=256):
+        """Simule un grand ensemble bloc par bloc à mémoire bornée et résume au fil de l'eau"""
+        print(f"🤠 Streaming {n_scenarios:,} scénarios pour {self.region}, Texas "
+              f"(blocs de {chunk_size:,})...")
+        
+        years, periods = self._period_grid()
+        columns = list(COLUMN_GRAPH)
+        moments = RunningMoments((len(years), len(columns)))
+        sketch = None
+        if isinstance(sink, (str, os.PathLike)):
+            sink = ParquetSink(sink, columns, years, periods if self.periods_per_year > 1 else None)
+        
+        for first, draws in self.iter_ensemble(n_scenarios, chunk_size):
+            if sketch is None:
+                sketch = QuantileSketch.from_block(draws, bins)
+            sketch.update(draws)
+            moments.update(draws)
+            if sink is not None:
+                sink.write(first, draws)
+        
+        if sink is not None:
+            sink.close()
+        
+        return _stream_summary(self.seed, moments, sketch, percentiles, years, periods)
+    
+    def _shard_accumulators(self, chunks, n_scenarios, bins=256):
+        """Moments de chaque bloc de scénarios listé et esquisse commune, pour un fragment de calcul"""
+        # Bornes de l'esquisse tirées du bloc 0, comme stream_ensemble(chunk_size=SCENARIO_CHUNK) :
+        # tous les fragments d'une région partagent exactement les mêmes bornes
+        years, _ = self._period_grid()
+        head = self._simulate_scenarios(years, 0, min(SCENARIO_CHUNK, n_scenarios))
+        sketch = QuantileSketch.from_block(head, bins)
+        moments = []
+        for chunk in chunks:
+            first = chunk * SCENARIO_CHUNK
+            draws = head if chunk == 0 else self._simulate_scenarios(years, first,
+                                                                     min(first + SCENARIO_CHUNK, n_scenarios))
+            sketch.update(draws)
+            block = RunningMoments(draws.shape[1:])
+            block.update(draws)
+            moments.append(block)
+        return moments, sketch
+    
+    def _simulate_scenarios(self, years, start, stop):
+        """Simule les scénarios [start, stop) en un tableau (scénario × année × colonne)"""
+        # Chaque colonne est tirée d'un bloc (scénario × année), tendances incluses
+        draws = np.empty((stop - start, len(years), len(COLUMN_GRAPH)), dtype=self.dtype)
+        self._scenario_run(start, stop)._simulate_columns(years, draws)
+        return draws
+    
+    def _scenario_run(self, start, stop):
+        """Copie légère pour les scénarios [start, stop) : configuration partagée, état de calcul
+        propre (plage, bruit corrélé, colonnes recalculées), l'analyseur n'est jamais modifié"""
+        run = object.__new__(type(self))
+        run.__dict__.update(self.__dict__)
+        run.__dict__.update(_scenarios=(start, stop), _joint=None, _reads=None, _previous=None, recomputed=[])
+        return run
+    
+    def _simulate_columns(self, years, out):
+        """Évalue le graphe des colonnes (tendances incluses) dans out[..., colonne]"""
+        # Multiplicateurs de tendance appliqués à chaque nœud avant ses dépendants
+        with self.timer.stage('trends'):
+            trends = self._trend_multipliers(years, list(COLUMN_GRAPH))
+        
+        # Dernier calcul réutilisable s'il porte sur la même grille, la même graine et le même type
+        # (les tirages aléatoires ne dépendent que de la graine, de la région et de la colonne)
+        state = (self.seed, self.periods_per_year, np.dtype(out.dtype).name, out.shape)
+        previous = None
+        if self._scenarios is None and self._previous is not None:
+            if self._previous['state'] == state and np.array_equal(self._previous['years'], years):
+                previous = self._previous
+        
+        memo, reads = {}, {}
+        self.recomputed = []
+        try:
+            for column in COLUMN_GRAPH:
+                self._compute_column(column, years, trends, memo, (), out, previous, reads)
+        finally:
+            self._joint = None
+        
+        if self._scenarios is None:
+            self._previous = {
+                'run': self._previous['run'] + 1 if self._previous is not None else 0,
+                'edits': self._edits,
+                'state': state,
+                'years': years,
+                'trends': trends,
+                'values': {column: out[..., j].copy() for column, j in self._column_keys.items()},
+                'inputs': {column: memo[column] for column in COLUMN_INPUTS},
+                'reads': reads,
+            }
+        
+        return out
+    
+    def _compute_column(self, column, years, trends, memo, path, out, previous=None, reads=None):
+        """Calcule une colonne une seule fois, après ses entrées, et l'écrit dans out"""
+        if column in memo:
+            return memo[column]
+        if column in path:
+            raise ValueError(f"Cyclic column dependency: {' -> '.join(path + (column,))}")
+        
+        method, inputs = COLUMN_GRAPH[column]
+        args = [self._compute_column(dep, years, trends, memo, path + (column,), out, previous, reads)
+                for dep in inputs]
+        
+        j = self._column_keys[column]
+        if previous is not None and self._is_current(column, inputs, trends, previous):
+            # Colonne inchangée depuis le dernier calcul : valeurs réutilisées
+            out[..., j] = previous['values'][column]
+            memo[column] = previous['inputs'].get(column)
+            reads[column] = previous['reads'][column]
+            return memo[column]
+        
+        # Paramètres de région lus par le simulateur, mémorisés pour le prochain calcul
+        self._reads = {} if reads is not None else None
+        try:
+            with self.timer.stage(method):
+                values = getattr(self, method)(years, *args) * trends[..., j]
+        finally:
+            if reads is not None:
+                reads[column] = self._reads
+            self._reads = None
+        self.recomputed.append(column)
+        
+        # Seules les entrées d'autres colonnes restent en mémoire (en float64)
+        out[..., j] = values
+        memo[column] = values if column in COLUMN_INPUTS else None
+        return memo[column]
+    
+    def _is_current(self, column, inputs, trends, previous):
+        """Vrai si ni les entrées, ni les paramètres lus, ni les chocs de la colonne n'ont changé"""
+        if any(dep in self.recomputed for dep in inputs):
+            return False
+        j = self._column_keys[column]
+        if not np.array_equal(previous['trends'][..., j], trends[..., j]):
+            return False
+        return all(np.array_equal(self._param_value(name), value)
+                   for name, value in previous['reads'][column].items())
+    
+    def _stream(self, column, chunk):
+        """Renvoie le générateur indépendant du triplet (région, colonne, bloc de scénarios)"""
+        # Même clé que SeedSequence(seed).spawn(...) aux indices (région, colonne, bloc),
+        # construite directement pour ne dépendre ni de l'ordre d'appel ni du processus ;
+        # column=None désigne le flux du bruit corrélé (indice après la dernière colonne)
+        column_key = self._column_keys[column] if column is not None else JOINT_NOISE_KEY
+        seed_sequence = np.random.SeedSequence(self.seed, spawn_key=(self._region_key, column_key, chunk))
+        return np.random.default_rng(seed_sequence)
+    
+    def _noise(self, column, n, sigma, loc=1.0):
+        """Tire le bruit d'une colonne entière (et de tous les scénarios) bloc par bloc"""
+        if self._noise_factor is not None:
+            return loc + sigma * self._joint_noise(n)[self._column_keys[column]]
+        
+        start, stop = self._scenarios or (0, 1)
+        
+        blocks = []
+        for chunk in range(start // SCENARIO_CHUNK, (stop - 1) // SCENARIO_CHUNK + 1):
+            first = chunk * SCENARIO_CHUNK
+            lo = max(start, first) - first
+            hi = min(stop, first + SCENARIO_CHUNK) - first
+            blocks.append(self._stream(column, chunk).standard_normal((hi, n))[lo:])
+        
+        noise = loc + sigma * (np.concatenate(blocks) if len(blocks) > 1 else blocks[0])
+        return noise if self._scenarios is not None else noise[0]
+    
+    def _joint_noise(self, n):
+        """Bruit normal corrélé de chaque colonne ((scénario ×) période), tiré une fois par calcul"""
+        key = (self._scenarios, n)
+        if self._joint is None or self._joint[0] != key:
+            start, stop = self._scenarios or (0, 1)
+            
+            # Un seul tirage (scénario × colonne × période) par bloc de scénarios : les
+            # scénarios en tête, chaque scénario tire les mêmes valeurs quel que soit le bloc
+            blocks = []
+            for chunk in range(start // SCENARIO_CHUNK, (stop - 1) // SCENARIO_CHUNK + 1):
+                first = chunk * SCENARIO_CHUNK
+                lo = max(start, first) - first
+                hi = min(stop, first + SCENARIO_CHUNK) - first
+                blocks.append(self._stream(None, chunk).standard_normal((hi, len(COLUMN_GRAPH), n))[lo:])
+            z = (np.concatenate(blocks) if len(blocks) > 1 else blocks[0]).transpose(1, 0, 2)
+            if self._scenarios is None:
+                z = z[:, 0]
+            
+            # Corrélation entre colonnes : L @ z, une entrée par colonne
+            self._joint = (key, _correlate(self._noise_factor, z))
+        return self._joint[1]
+    
+    def _simulate_population(self, years):
         """Simule la population de la région"""
-        base_population = self.config["population_base"]
-        
-        population = []
-        for i, date in enumerate(dates):
-            # Croissance démographique texane (très forte croissance)
-            if self.config["type"] == "tech_innovation":
-                growth_rate = 0.028  # Très forte croissance à Austin
-            elif self.config["type"] == "corporate_tech":
-                growth_rate = 0.022  # Forte croissance à DFW
-            elif self.config["type"] == "energy_medical":
-                growth_rate = 0.020  # Croissance forte à Houston
-            else:
-                growth_rate = 0.015  # Croissance modérée ailleurs
-                
-            growth = 1 + growth_rate * i
-            population.append(base_population * growth)
+        base_population = self._param('population_base')
         
-        return population
+        # Croissance démographique texane (très forte croissance)
+        growth_rate = self._param('population_growth')
+        
+        i = self._elapsed_years(len(years))
+        return base_population * (1 + growth_rate * i)
     
-    def _simulate_households(self, dates):
+    def _simulate_households(self, years):
         """Simule le nombre de ménages"""
-        base_households = self.config["population_base"] / 2.7  # Taille moyenne des ménages au Texas
-        
-        households = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.016 * i
-            households.append(base_households * growth)
+        base_households = self._param('population_base') / 2.7  # Taille moyenne des ménages au Texas
         
-        return households
+        i = self._elapsed_years(len(years))
+        return base_households * (1 + 0.016 * i)
     
-    def _simulate_median_income(self, dates):
+    def _simulate_median_income(self, years):
         """Simule le revenu médian"""
         # Revenu médian de base selon la région
-        if self.config["type"] == "tech_innovation":
-            base_income = 85000
-        elif self.config["type"] == "corporate_tech":
-            base_income = 75000
-        elif self.config["type"] == "energy_medical":
-            base_income = 70000
-        else:
-            base_income = 55000
-        
-        incomes = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Croissance du revenu avec des variations
-            if 2002 <= year <= 2008:
-                growth = 1 + 0.040 * (year - 2002)  # Forte croissance énergie
-            elif 2009 <= year <= 2010:
-                growth = 1 - 0.020 * (year - 2009)  # Légère baisse crise
-            elif 2011 <= year <= 2014:
-                growth = 1 + 0.045 * (year - 2011)  # Boom énergie
-            elif 2015 <= year <= 2016:
-                growth = 1 - 0.015  # Baisse prix pétrole
-            elif 2017 <= year <= 2019:
-                growth = 1 + 0.038 * (year - 2017)
-            elif 2020 <= year <= 2021:
-                growth = 1 - 0.010  # Impact COVID modéré
-            else:
-                growth = 1 + 0.042 * (year - 2022)
-            
-            noise = np.random.normal(1, 0.05)
-            incomes.append(base_income * growth * noise)
+        base_income = self._param('base_income')
+        
+        # Croissance du revenu avec des variations
+        growth = _piecewise(years, INCOME_ERAS, INCOME_DEFAULT)
         
-        return incomes
+        noise = self._noise('Median_Income', len(years), 0.05)
+        return base_income * growth * noise
     
-    def _simulate_total_revenue(self, dates):
+    def _simulate_total_revenue(self, years):
         """Simule les recettes totales de la région"""
-        base_revenue = self.config["budget_base"]
-        
-        revenue = []
-        for i, date in enumerate(dates):
-            # Croissance économique texane
-            if self.config["type"] == "tech_innovation":
-                growth_rate = 0.065  # Croissance explosive à Austin
-            elif self.config["type"] == "corporate_tech":
-                growth_rate = 0.055  # Croissance forte à DFW
-            elif self.config["type"] == "energy_medical":
-                growth_rate = 0.050  # Croissance variable à Houston
-            else:
-                growth_rate = 0.042  # Croissance moyenne
-                
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.12)  # Plus volatile dû à l'énergie
-            revenue.append(base_revenue * growth * noise)
+        base_revenue = self._param('budget_base')
+        
+        # Croissance économique texane
+        growth_rate = self._param('revenue_growth')
         
-        return revenue
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Total_Revenue', len(years), 0.12)  # Plus volatile dû à l'énergie
+        return base_revenue * (1 + growth_rate * i) * noise
     
-    def _simulate_property_tax_revenue(self, dates):
+    def _simulate_property_tax_revenue(self, years):
         """Simule les recettes de taxe foncière (pas de taxe sur le revenu au Texas)"""
-        base_tax = self.config["budget_base"] * 0.45  # Très important au Texas
+        base_tax = self._param('budget_base') * 0.45  # Très important au Texas
         
-        tax_revenue = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.035 * i
-            noise = np.random.normal(1, 0.08)
-            tax_revenue.append(base_tax * growth * noise)
-        
-        return tax_revenue
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Property_Tax_Revenue', len(years), 0.08)
+        return base_tax * (1 + 0.035 * i) * noise
     
-    def _simulate_government_funding(self, dates):
+    def _simulate_government_funding(self, years):
         """Simule le financement étatique et fédéral"""
-        base_funding = self.config["budget_base"] * 0.20
+        base_funding = self._param('budget_base') * 0.20
         
-        funding = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2010:
-                increase = 1 + 0.012 * (year - 2010)
-            else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.08)
-            funding.append(base_funding * increase * noise)
+        increase = np.where(years >= 2010, 1 + 0.012 * (years - 2010), 1.0)
         
-        return funding
+        noise = self._noise('State_Federal_Funding', len(years), 0.08)
+        return base_funding * increase * noise
     
-    def _simulate_business_tax_revenue(self, dates):
+    def _simulate_business_tax_revenue(self, years):
         """Simule les recettes fiscales des entreprises"""
-        base_business_tax = self.config["budget_base"] * 0.18
+        base_business_tax = self._param('budget_base') * 0.18
         
-        business_tax = []
-        for i, date in enumerate(dates):
-            multiplier = 1.4 if "technologie" in self.config["specialites"] else 1.2 if "énergie" in self.config["specialites"] else 1.0
-            
-            growth = 1 + 0.048 * i
-            noise = np.random.normal(1, 0.15)
-            business_tax.append(base_business_tax * growth * multiplier * noise)
+        multiplier = self._param('business_tax_multiplier')
         
-        return business_tax
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Business_Tax_Revenue', len(years), 0.15)
+        return base_business_tax * (1 + 0.048 * i) * multiplier * noise
     
-    def _simulate_energy_revenue(self, dates):
+    def _simulate_energy_revenue(self, years):
         """Simule les recettes énergétiques (spécifique au Texas)"""
-        base_energy = self.config["budget_base"] * 0.12
+        base_energy = self._param('budget_base') * 0.12
         
-        multiplier = 2.5 if "énergie" in self.config["specialites"] else 0.3
+        multiplier = self._param('energy_revenue_multiplier')
         
-        energy_revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Volatilité selon les prix de l'énergie
-            if 2002 <= year <= 2008:
-                energy_multiplier = 1 + 0.15 * (year - 2002)  # Boom pétrole
-            elif 2009 <= year <= 2010:
-                energy_multiplier = 0.70  # Crise financière
-            elif 2011 <= year <= 2014:
-                energy_multiplier = 1 + 0.12 * (year - 2011)  # Reprise
-            elif 2015 <= year <= 2016:
-                energy_multiplier = 0.60  # Effondrement prix pétrole
-            elif 2017 <= year <= 2019:
-                energy_multiplier = 1 + 0.08 * (year - 2017)  # Reprise modérée
-            elif 2020 <= year <= 2021:
-                energy_multiplier = 0.75  # COVID + crise pétrole
-            else:
-                energy_multiplier = 1 + 0.10 * (year - 2022)  # Reprise forte
-            
-            growth = 1 + 0.030 * i
-            noise = np.random.normal(1, 0.25)  # Très volatile
-            energy_revenue.append(base_energy * growth * energy_multiplier * multiplier * noise)
+        # Volatilité selon les prix de l'énergie
+        energy_multiplier = _piecewise(years, ENERGY_ERAS, ENERGY_DEFAULT)
         
-        return energy_revenue
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Energy_Revenue', len(years), 0.25)  # Très volatile
+        return base_energy * (1 + 0.030 * i) * energy_multiplier * multiplier * noise
     
-    def _simulate_other_revenue(self, dates):
+    def _simulate_other_revenue(self, years):
         """Simule les autres recettes"""
-        base_other = self.config["budget_base"] * 0.05
-        
-        other_revenue = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.028 * i
-            noise = np.random.normal(1, 0.10)
-            other_revenue.append(base_other * growth * noise)
+        base_other = self._param('budget_base') * 0.05
         
-        return other_revenue
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Other_Revenue', len(years), 0.10)
+        return base_other * (1 + 0.028 * i) * noise
     
-    def _simulate_total_expenses(self, dates):
+    def _simulate_total_expenses(self, years):
         """Simule les dépenses totales"""
-        base_expenses = self.config["budget_base"] * 0.88  # Texas a des dépenses plus faibles
+        base_expenses = self._param('budget_base') * 0.88  # Texas a des dépenses plus faibles
         
-        expenses = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.038 * i
-            noise = np.random.normal(1, 0.06)
-            expenses.append(base_expenses * growth * noise)
-        
-        return expenses
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Total_Expenses', len(years), 0.06)
+        return base_expenses * (1 + 0.038 * i) * noise
     
-    def _simulate_infrastructure_expenses(self, dates):
+    def _simulate_infrastructure_expenses(self, years):
         """Simule les dépenses d'infrastructure"""
-        base_infra = self.config["budget_base"] * 0.20
+        base_infra = self._param('budget_base') * 0.20
         
-        infra_expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2005, 2013, 2018, 2023]:
-                multiplier = 1.8  # Années de grands projets
-            else:
-                multiplier = 1.0
-            
-            growth = 1 + 0.040 * i
-            noise = np.random.normal(1, 0.18)
-            infra_expenses.append(base_infra * growth * multiplier * noise)
+        multiplier = _year_multiplier(years, [2005, 2013, 2018, 2023], 1.8)  # Années de grands projets
         
-        return infra_expenses
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Infrastructure_Expenses', len(years), 0.18)
+        return base_infra * (1 + 0.040 * i) * multiplier * noise
     
-    def _simulate_public_services_expenses(self, dates):
+    def _simulate_public_services_expenses(self, years):
         """Simule les dépenses de services publics"""
-        base_services = self.config["budget_base"] * 0.25
-        
-        services = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.032 * i
-            noise = np.random.normal(1, 0.04)
-            services.append(base_services * growth * noise)
+        base_services = self._param('budget_base') * 0.25
         
-        return services
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Public_Services_Expenses', len(years), 0.04)
+        return base_services * (1 + 0.032 * i) * noise
     
-    def _simulate_education_expenses(self, dates):
+    def _simulate_education_expenses(self, years):
         """Simule les dépenses éducatives"""
-        base_education = self.config["budget_base"] * 0.28  # Important au Texas
+        base_education = self._param('budget_base') * 0.28  # Important au Texas
         
-        education = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.036 * i
-            noise = np.random.normal(1, 0.05)
-            education.append(base_education * growth * noise)
-        
-        return education
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Education_Expenses', len(years), 0.05)
+        return base_education * (1 + 0.036 * i) * noise
     
-    def _simulate_healthcare_expenses(self, dates):
+    def _simulate_healthcare_expenses(self, years):
         """Simule les dépenses de santé"""
-        base_healthcare = self.config["budget_base"] * 0.15
-        
-        healthcare = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.040 * i
-            noise = np.random.normal(1, 0.06)
-            healthcare.append(base_healthcare * growth * noise)
+        base_healthcare = self._param('budget_base') * 0.15
         
-        return healthcare
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Healthcare_Expenses', len(years), 0.06)
+        return base_healthcare * (1 + 0.040 * i) * noise
     
-    def _simulate_budget_balance(self, dates):
+    def _simulate_budget_balance(self, years):
         """Simule le surplus/déficit budgétaire"""
-        balance = []
-        for i, date in enumerate(dates):
-            base_balance = self.config["budget_base"] * 0.12  # Texas a généralement des surplus
-            
-            year = date.year
-            if year >= 2010:
-                improvement = 1 + 0.015 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.15)
-            balance.append(base_balance * improvement * noise)
+        base_balance = self._param('budget_base') * 0.12  # Texas a généralement des surplus
+        
+        improvement = np.where(years >= 2010, 1 + 0.015 * (years - 2010), 1.0)
         
-        return balance
+        noise = self._noise('Budget_Surplus_Deficit', len(years), 0.15)
+        return base_balance * improvement * noise
     
-    def _simulate_regional_debt(self, dates):
+    def _simulate_regional_debt(self, years):
         """Simule la dette régionale"""
-        base_debt = self.config["budget_base"] * 0.45  # Dette faible au Texas
+        base_debt = self._param('budget_base') * 0.45  # Dette faible au Texas
         
-        debt = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2012:
-                reduction = 1 - 0.020 * (year - 2012)
-            else:
-                reduction = 1.0
-            
-            noise = np.random.normal(1, 0.07)
-            debt.append(base_debt * reduction * noise)
+        # Réduction plafonnée pour rester positive sur les horizons longs
+        reduction = np.where(years >= 2012, np.maximum(1 - 0.020 * (years - 2012), 0.25), 1.0)
         
-        return debt
+        noise = self._noise('Regional_Debt', len(years), 0.07)
+        return base_debt * reduction * noise
     
-    def _simulate_debt_ratio(self, dates):
+    def _simulate_debt_ratio(self, years):
         """Simule le ratio d'endettement"""
-        ratios = []
-        for i, date in enumerate(dates):
-            base_ratio = 0.40  # Ratio faible
-            
-            year = date.year
-            if year >= 2012:
-                improvement = 1 - 0.022 * (year - 2012)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.06)
-            ratios.append(base_ratio * improvement * noise)
+        base_ratio = 0.40  # Ratio faible
+        
+        # Amélioration plafonnée pour rester positive sur les horizons longs
+        improvement = np.where(years >= 2012, np.maximum(1 - 0.022 * (years - 2012), 0.25), 1.0)
         
-        return ratios
+        noise = self._noise('Debt_to_Revenue_Ratio', len(years), 0.06)
+        return base_ratio * improvement * noise
     
-    def _simulate_median_home_price(self, dates):
+    def _simulate_median_home_price(self, years):
         """Simule le prix médian des maisons (spécifique au Texas)"""
-        base_price = self.config["prix_m2_base"] * 200  # Maisons plus grandes au Texas
-        
-        prices = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance du marché immobilier texan
-            if self.config["segment_immobilier"] == "tech_boom":
-                growth_rate = 0.085  # Croissance explosive à Austin
-            elif self.config["segment_immobilier"] == "corporate_affordable":
-                growth_rate = 0.055  # Croissance forte à DFW
-            elif self.config["segment_immobilier"] == "energy_driven":
-                growth_rate = 0.048  # Croissance volatile à Houston
-            else:
-                growth_rate = 0.040  # Croissance modérée
-            
-            # Ajustements annuels basés sur des événements réels
-            if 2002 <= year <= 2007:
-                multiplier = 1 + 0.08 * (year - 2002)  # Boom pré-crise
-            elif 2008 <= year <= 2009:
-                multiplier = 0.90  # Légère baisse (Texas résilient)
-            elif 2010 <= year <= 2014:
-                multiplier = 1 + 0.10 * (year - 2010)  # Forte reprise
-            elif 2015 <= year <= 2016:
-                multiplier = 0.95  # Légère baisse énergie
-            elif 2017 <= year <= 2019:
-                multiplier = 1 + 0.07 * (year - 2017)  # Croissance forte
-            elif 2020 <= year <= 2021:
-                multiplier = 1.02  # Texas résilient pendant COVID
-            else:
-                multiplier = 1 + 0.09 * (year - 2022)  # Boom post-COVID
-            
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.10)
-            prices.append(base_price * growth * multiplier * noise)
+        base_price = self._param('prix_m2_base') * 200  # Maisons plus grandes au Texas
         
-        return prices
-    
-    def _simulate_price_per_sqft(self, dates):
-        """Simule le prix au pied carré"""
-        base_price_sqft = self.config["prix_m2_base"] / 10.764
+        # Croissance du marché immobilier texan
+        growth_rate = self._param('home_price_growth')
         
-        prices = []
-        for i, date in enumerate(dates):
-            median_price = self._simulate_median_home_price([date])[0]
-            avg_home_size = 200 * 10.764  # 200m² en pieds carrés
-            prices.append(median_price / avg_home_size)
+        # Ajustements annuels basés sur des événements réels
+        multiplier = _piecewise(years, HOME_PRICE_ERAS, HOME_PRICE_DEFAULT)
         
-        return prices
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Median_Home_Price', len(years), 0.10)
+        return base_price * (1 + growth_rate * i) * multiplier * noise
+    
+    def _simulate_price_per_sqft(self, years, median_home_price):
+        """Simule le prix au pied carré à partir du prix médian déjà calculé"""
+        avg_home_size = 200 * 10.764  # 200m² en pieds carrés
+        return median_home_price / avg_home_size
     
-    def _simulate_home_sales(self, dates):
+    def _simulate_home_sales(self, years):
         """Simule le volume des ventes immobilières"""
-        base_sales = self.config["population_base"] / 100  # Marché actif au Texas
+        base_sales = self._param('population_base') / 100  # Marché actif au Texas
         
-        sales = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if 2002 <= year <= 2006:
-                multiplier = 1 + 0.12 * (year - 2002)
-            elif 2007 <= year <= 2009:
-                multiplier = 0.80  # Baisse modérée
-            elif 2010 <= year <= 2019:
-                multiplier = 1 + 0.10 * (year - 2010)
-            elif 2020 <= year <= 2021:
-                multiplier = 0.90  # Légère baisse COVID
-            else:
-                multiplier = 1 + 0.11 * (year - 2022)
-            
-            growth = 1 + 0.018 * i
-            noise = np.random.normal(1, 0.14)
-            sales.append(base_sales * growth * multiplier * noise)
+        multiplier = _piecewise(years, HOME_SALES_ERAS, HOME_SALES_DEFAULT)
         
-        return sales
+        i = self._elapsed_years(len(years))
+        season = self._seasonality(SALES_SEASONALITY, len(years))
+        noise = self._noise('Home_Sales_Volume', len(years), 0.14)
+        return base_sales * (1 + 0.018 * i) * multiplier * season * noise
     
-    def _simulate_construction_permits(self, dates):
+    def _simulate_construction_permits(self, years):
         """Simule les permis de construction"""
-        base_permits = self.config["population_base"] / 400  # Forte construction au Texas
+        base_permits = self._param('population_base') / 400  # Forte construction au Texas
         
-        permits = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in [2005, 2013, 2018, 2022, 2024]:
-                multiplier = 2.0  # Années de forte construction
-            elif year in [2008, 2015, 2020]:
-                multiplier = 0.7  # Années de ralentissement
-            else:
-                multiplier = 1.0
-            
-            growth = 1 + 0.025 * i
-            noise = np.random.normal(1, 0.20)
-            permits.append(base_permits * growth * multiplier * noise)
+        multiplier = np.select(
+            [np.isin(years, [2005, 2013, 2018, 2022, 2024]),  # Années de forte construction
+             np.isin(years, [2008, 2015, 2020])],             # Années de ralentissement
+            [2.0, 0.7], default=1.0)
         
-        return permits
+        i = self._elapsed_years(len(years))
+        season = self._seasonality(PERMITS_SEASONALITY, len(years))
+        noise = self._noise('New_Construction_Permits', len(years), 0.20)
+        return base_permits * (1 + 0.025 * i) * multiplier * season * noise
     
-    def _simulate_vacancy_rate(self, dates):
+    def _simulate_vacancy_rate(self, years):
         """Simule le taux d'inoccupation locative"""
         base_vacancy = 6.0  # Plus élevé au Texas dû à plus de construction
         
-        vacancies = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if 2002 <= year <= 2006:
-                rate = base_vacancy - 0.8 * (year - 2002)
-            elif 2007 <= year <= 2010:
-                rate = base_vacancy + 1.5
-            elif 2011 <= year <= 2019:
-                rate = base_vacancy - 0.4 * (year - 2011)
-            elif 2020 <= year <= 2021:
-                rate = base_vacancy + 1.0
-            else:
-                rate = base_vacancy - 0.3 * (year - 2022)
-            
-            noise = np.random.normal(0, 0.4)
-            vacancies.append(max(2.0, rate + noise))  # Minimum 2%
+        rate = base_vacancy + _piecewise(years, VACANCY_ERAS, VACANCY_DEFAULT)
         
-        return vacancies
+        noise = self._noise('Rental_Vacancy_Rate', len(years), 0.4, loc=0.0)
+        return np.maximum(2.0, rate + noise)  # Minimum 2%
     
-    def _simulate_average_rent(self, dates):
+    def _simulate_average_rent(self, years):
         """Simule le loyer moyen"""
-        base_rent = self.config["prix_m2_base"] / 40  # Loyer plus abordable au Texas
+        base_rent = self._param('prix_m2_base') / 40  # Loyer plus abordable au Texas
         
-        rents = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if 2002 <= year <= 2007:
-                growth = 1 + 0.035 * (year - 2002)
-            elif 2008 <= year <= 2010:
-                growth = 1 - 0.010 * (year - 2008)
-            elif 2011 <= year <= 2019:
-                growth = 1 + 0.040 * (year - 2011)
-            elif 2020 <= year <= 2021:
-                growth = 1 + 0.005  # Légère hausse
-            else:
-                growth = 1 + 0.045 * (year - 2022)
-            
-            noise = np.random.normal(1, 0.06)
-            rents.append(base_rent * growth * noise)
+        growth = _piecewise(years, RENT_ERAS, RENT_DEFAULT)
         
-        return rents
+        season = self._seasonality(RENT_SEASONALITY, len(years))
+        noise = self._noise('Average_Rent', len(years), 0.06)
+        return base_rent * growth * season * noise
     
-    def _simulate_energy_investment(self, dates):
+    def _simulate_energy_investment(self, years):
         """Simule l'investissement énergétique (spécifique au Texas)"""
-        base_investment = self.config["budget_base"] * 0.15
+        base_investment = self._param('budget_base') * 0.15
         
-        multiplier = 3.0 if "énergie" in self.config["specialites"] else 0.4
+        multiplier = self._param('energy_investment_multiplier')
+        year_multiplier = _year_multiplier(years, [2003, 2008, 2012, 2017, 2021], 2.2)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2003, 2008, 2012, 2017, 2021]:
-                year_multiplier = 2.2
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.055 * i
-            noise = np.random.normal(1, 0.30)  # Très volatile
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Energy_Investment', len(years), 0.30)  # Très volatile
+        return base_investment * (1 + 0.055 * i) * year_multiplier * multiplier * noise
     
-    def _simulate_tech_investment(self, dates):
+    def _simulate_tech_investment(self, years):
         """Simule l'investissement technologique"""
-        base_investment = self.config["budget_base"] * 0.12
-        
-        multiplier = 2.5 if "technologie" in self.config["specialites"] else 0.8
+        base_investment = self._param('budget_base') * 0.12
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2005, 2010, 2015, 2020, 2023]:
-                year_multiplier = 1.9
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.070 * i
-            noise = np.random.normal(1, 0.18)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
+        multiplier = self._param('tech_investment_multiplier')
+        year_multiplier = _year_multiplier(years, [2005, 2010, 2015, 2020, 2023], 1.9)
         
-        return investment
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Tech_Investment', len(years), 0.18)
+        return base_investment * (1 + 0.070 * i) * year_multiplier * multiplier * noise
     
-    def _simulate_infrastructure_investment(self, dates):
+    def _simulate_infrastructure_investment(self, years):
         """Simule l'investissement en infrastructure"""
-        base_investment = self.config["budget_base"] * 0.20
+        base_investment = self._param('budget_base') * 0.20
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2004, 2011, 2016, 2022]:
-                year_multiplier = 1.8
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.045 * i
-            noise = np.random.normal(1, 0.15)
-            investment.append(base_investment * growth * year_multiplier * noise)
+        year_multiplier = _year_multiplier(years, [2004, 2011, 2016, 2022], 1.8)
         
-        return investment
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Infrastructure_Investment', len(years), 0.15)
+        return base_investment * (1 + 0.045 * i) * year_multiplier * noise
     
-    def _simulate_housing_investment(self, dates):
+    def _simulate_housing_investment(self, years):
         """Simule l'investissement dans le logement"""
-        base_investment = self.config["budget_base"] * 0.18  # Important au Texas
+        base_investment = self._param('budget_base') * 0.18  # Important au Texas
         
         multiplier = 1.5  # Texas a une forte construction
+        year_multiplier = _year_multiplier(years, [2006, 2013, 2019, 2024], 1.8)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2006, 2013, 2019, 2024]:
-                year_multiplier = 1.8
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.050 * i
-            noise = np.random.normal(1, 0.20)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Housing_Development_Investment', len(years), 0.20)
+        return base_investment * (1 + 0.050 * i) * year_multiplier * multiplier * noise
     
-    def _simulate_manufacturing_investment(self, dates):
+    def _simulate_manufacturing_investment(self, years):
         """Simule l'investissement manufacturier"""
-        base_investment = self.config["budget_base"] * 0.10
-        
-        multiplier = 1.8 if "manufacturing" in self.config["specialites"] else 0.7
+        base_investment = self._param('budget_base') * 0.10
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2007, 2014, 2018, 2023]:
-                year_multiplier = 1.7
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.038 * i
-            noise = np.random.normal(1, 0.16)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
+        multiplier = self._param('manufacturing_investment_multiplier')
+        year_multiplier = _year_multiplier(years, [2007, 2014, 2018, 2023], 1.7)
         
-        return investment
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Manufacturing_Investment', len(years), 0.16)
+        return base_investment * (1 + 0.038 * i) * year_multiplier * multiplier * noise
     
-    def _simulate_agricultural_investment(self, dates):
+    def _simulate_agricultural_investment(self, years):
         """Simule l'investissement agricole"""
-        base_investment = self.config["budget_base"] * 0.08
+        base_investment = self._param('budget_base') * 0.08
         
-        multiplier = 2.2 if "agriculture" in self.config["specialites"] else 0.9
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2009, 2012, 2017, 2021]:
-                year_multiplier = 1.6
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.032 * i
-            noise = np.random.normal(1, 0.19)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
+        multiplier = self._param('agricultural_investment_multiplier')
+        year_multiplier = _year_multiplier(years, [2009, 2012, 2017, 2021], 1.6)
         
-        return investment
+        i = self._elapsed_years(len(years))
+        noise = self._noise('Agricultural_Investment', len(years), 0.19)
+        return base_investment * (1 + 0.032 * i) * year_multiplier * multiplier * noise
+    
+    def _trend_multipliers(self, years, columns):
+        """Compile le calendrier des chocs en une matrice (année × colonne) de multiplicateurs"""
+        years = np.asarray(years)
+        index = {column: j for j, column in enumerate(columns)}
+        multipliers = np.ones((len(years), len(columns)))
+        
+        for start, end, specialty, column, multiplier in self.shocks:
+            if column not in index:
+                continue
+            if specialty is not None and specialty not in self.config["specialites"]:
+                continue
+            active = years >= start
+            if end is not None:
+                active &= years <= end
+            multipliers[active, index[column]] *= multiplier
+        
+        # Ensembles sous tests de résistance : chocs synthétiques propres à chaque scénario
+        if self.stress is not None and self._scenarios is not None:
+            multipliers = multipliers * self.stress.multipliers(*self._scenarios, years, columns,
+                                                                self.config["specialites"])
+        
+        return multipliers
     
-    def _add_texas_trends(self, df):
-        """Ajoute des tendances réalistes adaptées au marché texan"""
-        for i, row in df.iterrows():
-            year = row['Year']
+    @timed('render')
+    def create_financial_analysis(self, df, show=True, output_dir='.', insights=True):
+        """Crée une analyse complète des finances et de l'immobilier texan"""
+        figure_file = os.path.join(output_dir, f'{_region_slug(self.region)}_texas_analysis.png')
+        
+        # Figure déjà rendue pour exactement ces données : copie depuis le cache
+        key = None
+        if not show and self.cache is not None:
+            digest = hashlib.sha256(df.to_numpy().tobytes()).hexdigest()
+            key = self.cache.key('figure', self.region, self.start_year, self.end_year, list(df.columns), digest)
+            if self.cache.get_file(key, '.png', figure_file):
+                if insights:
+                    self._generate_texas_insights(df)
+                return figure_file
+        
+        # matplotlib n'est importé que pour le rendu (jamais sur le chemin données seules)
+        import matplotlib.pyplot as plt
+        if not show:
+            plt.switch_backend('Agg')
+        
+        plt.style.use('seaborn-v0_8')
+        with self.timer.stage('plots'):
+            fig = plt.figure(figsize=(20, 28))
             
-            # Boom pétrolier (2003-2008, 2011-2014)
-            if (2003 <= year <= 2008) or (2011 <= year <= 2014):
-                if "énergie" in self.config["specialites"]:
-                    df.loc[i, 'Energy_Revenue'] *= 1.8
-                    df.loc[i, 'Median_Income'] *= 1.10
-                    df.loc[i, 'Population'] *= 1.03
+            # 1. Évolution des prix immobiliers
+            ax1 = plt.subplot(5, 2, 1)
+            self._plot_real_estate_prices(df, ax1)
             
-            # Crise financière (2008-2009) - impact modéré au Texas
-            if 2008 <= year <= 2009:
-                df.loc[i, 'Median_Home_Price'] *= 0.90
-                df.loc[i, 'Home_Sales_Volume'] *= 0.80
-                df.loc[i, 'Energy_Investment'] *= 0.70
+            # 2. Activité immobilière
+            ax2 = plt.subplot(5, 2, 2)
+            self._plot_real_estate_activity(df, ax2)
             
-            # Effondrement prix pétrole (2015-2016)
-            if 2015 <= year <= 2016:
-                if "énergie" in self.config["specialites"]:
-                    df.loc[i, 'Energy_Revenue'] *= 0.40
-                    df.loc[i, 'Median_Home_Price'] *= 0.92
-                    df.loc[i, 'Population'] *= 0.99
+            # 3. Évolution des recettes et dépenses
+            ax3 = plt.subplot(5, 2, 3)
+            self._plot_revenue_expenses(df, ax3)
             
-            # Boom tech à Austin (2015-présent)
-            if year >= 2015 and "technologie" in self.config["specialites"]:
-                df.loc[i, 'Tech_Investment'] *= 2.2
-                df.loc[i, 'Median_Home_Price'] *= 1.15
-                df.loc[i, 'Population'] *= 1.04
+            # 4. Structure des recettes (avec énergie)
+            ax4 = plt.subplot(5, 2, 4)
+            self._plot_revenue_structure(df, ax4)
             
-            # Croissance démographique forte (constant)
-            if year >= 2010:
-                df.loc[i, 'Housing_Development_Investment'] *= 1.4
-                df.loc[i, 'New_Construction_Permits'] *= 1.3
+            # 5. Marché locatif
+            ax5 = plt.subplot(5, 2, 5)
+            self._plot_rental_market(df, ax5)
             
-            # Impact COVID-19 (2020-2021)
-            if 2020 <= year <= 2021:
-                if year == 2020:
-                    df.loc[i, 'Energy_Revenue'] *= 0.60
-                    df.loc[i, 'Home_Sales_Volume'] *= 0.85
-                else:
-                    # Reprise forte au Texas
-                    df.loc[i, 'Median_Home_Price'] *= 1.08
-                    df.loc[i, 'Population'] *= 1.02
+            # 6. Investissements régionaux
+            ax6 = plt.subplot(5, 2, 6)
+            self._plot_regional_investments(df, ax6)
             
-            # Boom post-COVID (2022-présent)
-            if year >= 2022:
-                df.loc[i, 'Tech_Investment'] *= 1.3
-                df.loc[i, 'Manufacturing_Investment'] *= 1.4
-                df.loc[i, 'Infrastructure_Investment'] *= 1.5
-    
-    def create_financial_analysis(self, df):
-        """Crée une analyse complète des finances et de l'immobilier texan"""
-        plt.style.use('seaborn-v0_8')
-        fig = plt.figure(figsize=(20, 28))
-        
-        # 1. Évolution des prix immobiliers
-        ax1 = plt.subplot(5, 2, 1)
-        self._plot_real_estate_prices(df, ax1)
-        
-        # 2. Activité immobilière
-        ax2 = plt.subplot(5, 2, 2)
-        self._plot_real_estate_activity(df, ax2)
-        
-        # 3. Évolution des recettes et dépenses
-        ax3 = plt.subplot(5, 2, 3)
-        self._plot_revenue_expenses(df, ax3)
-        
-        # 4. Structure des recettes (avec énergie)
-        ax4 = plt.subplot(5, 2, 4)
-        self._plot_revenue_structure(df, ax4)
-        
-        # 5. Marché locatif
-        ax5 = plt.subplot(5, 2, 5)
-        self._plot_rental_market(df, ax5)
-        
-        # 6. Investissements régionaux
-        ax6 = plt.subplot(5, 2, 6)
-        self._plot_regional_investments(df, ax6)
-        
-        # 7. Démographie et revenus
-        ax7 = plt.subplot(5, 2, 7)
-        self._plot_demography_income(df, ax7)
-        
-        # 8. Dette et équilibre budgétaire
-        ax8 = plt.subplot(5, 2, 8)
-        self._plot_debt_budget(df, ax8)
-        
-        # 9. Construction et développement
-        ax9 = plt.subplot(5, 2, 9)
-        self._plot_construction_development(df, ax9)
-        
-        # 10. Investissements sectoriels
-        ax10 = plt.subplot(5, 2, 10)
-        self._plot_sectorial_investments(df, ax10)
-        
-        plt.suptitle(f'Financial and Real Estate Analysis of {self.region}, Texas ({self.start_year}-{self.end_year})', 
-                    fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(f'{self.region.replace(" ", "_").lower()}_texas_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+            # 7. Démographie et revenus
+            ax7 = plt.subplot(5, 2, 7)
+            self._plot_demography_income(df, ax7)
+            
+            # 8. Dette et équilibre budgétaire
+            ax8 = plt.subplot(5, 2, 8)
+            self._plot_debt_budget(df, ax8)
+            
+            # 9. Construction et développement
+            ax9 = plt.subplot(5, 2, 9)
+            self._plot_construction_development(df, ax9)
+            
+            # 10. Investissements sectoriels
+            ax10 = plt.subplot(5, 2, 10)
+            self._plot_sectorial_investments(df, ax10)
+            
+            plt.suptitle(f'Financial and Real Estate Analysis of {self.region}, Texas ({self.start_year}-{self.end_year})', 
+                        fontsize=16, fontweight='bold')
+            plt.tight_layout()
+        with self.timer.stage('savefig'):
+            plt.savefig(figure_file, dpi=300, bbox_inches='tight')
+        if show:
+            plt.show()
+        plt.close(fig)
+        
+        if key is not None:
+            self.cache.put_file(key, '.png', figure_file)
         
         # Générer les insights
-        self._generate_texas_insights(df)
+        if insights:
+            self._generate_texas_insights(df)
+        
+        return figure_file
+    
+    def _time_axis(self, df):
+        """Abscisse en années décimales et largeur des barres selon la fréquence"""
+        if 'Period' not in df:
+            return df['Year'], 0.8
+        return df['Year'] + (df['Period'] - 1) / self.periods_per_year, 0.8 / self.periods_per_year
     
     def _plot_real_estate_prices(self, df, ax):
         """Plot de l'évolution des prix immobiliers"""
-        ax.plot(df['Year'], df['Median_Home_Price']/1000, label='Median Home Price', 
+        x, _ = self._time_axis(df)
+        ax.plot(x, df['Median_Home_Price']/1000, label='Median Home Price', 
                linewidth=3, color='#BF0A30', alpha=0.8)
         
         ax.set_title('Median Home Price Evolution (Thousand $)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Price (Thousand $)')
         ax.grid(True, alpha=0.3)
         
-        # Ajouter des annotations pour les événements marquants
-        ax.annotate('Oil Boom', xy=(2006, df.loc[df['Year'] == 2006, 'Median_Home_Price'].values[0]/1000), 
-                   xytext=(2006, df.loc[df['Year'] == 2006, 'Median_Home_Price'].values[0]/1000 * 0.8),
-                   arrowprops=dict(arrowstyle='->', color='red'))
-        
-        ax.annotate('Tech Boom', xy=(2018, df.loc[df['Year'] == 2018, 'Median_Home_Price'].values[0]/1000), 
-                   xytext=(2018, df.loc[df['Year'] == 2018, 'Median_Home_Price'].values[0]/1000 * 1.4),
-                   arrowprops=dict(arrowstyle='->', color='green'))
+        # Ajouter des annotations pour les événements marquants (si l'année est dans l'horizon)
+        for label, year, offset, color in (('Oil Boom', 2006, 0.8, 'red'), ('Tech Boom', 2018, 1.4, 'green')):
+            price = df.loc[df['Year'] == year, 'Median_Home_Price'].values
+            if len(price) == 0:
+                continue
+            ax.annotate(label, xy=(year, price[0]/1000), xytext=(year, price[0]/1000 * offset),
+                       arrowprops=dict(arrowstyle='->', color=color))
     
     def _plot_real_estate_activity(self, df, ax):
         """Plot de l'activité immobilière"""
-        ax.bar(df['Year'], df['Home_Sales_Volume'], label='Home Sales', 
+        x, width = self._time_axis(df)
+        ax.bar(x, df['Home_Sales_Volume'], width=width, label='Home Sales', 
               color='#002868', alpha=0.7)
         
         ax.set_title('Real Estate Market Activity', fontsize=12, fontweight='bold')
@@ -868,7 +2311,7 @@ class TexasRealEstateAnalyzer:
         ax.grid(True, alpha=0.3, axis='y')
         
         ax2 = ax.twinx()
-        ax2.plot(df['Year'], df['Price_per_Sqft'], label='Price per Sqft', 
+        ax2.plot(x, df['Price_per_Sqft'], label='Price per Sqft', 
                 linewidth=2, color='#BF0A30')
         ax2.set_ylabel('Price per Sqft ($)', color='#BF0A30')
         ax2.tick_params(axis='y', labelcolor='#BF0A30')
@@ -879,9 +2322,10 @@ class TexasRealEstateAnalyzer:
     
     def _plot_revenue_expenses(self, df, ax):
         """Plot de l'évolution des recettes et dépenses"""
-        ax.plot(df['Year'], df['Total_Revenue'], label='Total Revenue', 
+        x, _ = self._time_axis(df)
+        ax.plot(x, df['Total_Revenue'], label='Total Revenue', 
                linewidth=2, color='#002868', alpha=0.8)
-        ax.plot(df['Year'], df['Total_Expenses'], label='Total Expenses', 
+        ax.plot(x, df['Total_Expenses'], label='Total Expenses', 
                linewidth=2, color='#BF0A30', alpha=0.8)
         
         ax.set_title('Revenue and Expenses Evolution (M$)', 
@@ -892,16 +2336,15 @@ class TexasRealEstateAnalyzer:
     
     def _plot_revenue_structure(self, df, ax):
         """Plot de la structure des recettes (avec énergie)"""
-        years = df['Year']
-        width = 0.8
+        x, width = self._time_axis(df)
         
-        bottom = np.zeros(len(years))
+        bottom = np.zeros(len(x))
         categories = ['Property_Tax_Revenue', 'State_Federal_Funding', 'Business_Tax_Revenue', 'Energy_Revenue', 'Other_Revenue']
         colors = ['#002868', '#BF0A30', '#666666', '#008751', '#FFA300']
         labels = ['Property Tax', 'Govt Funding', 'Business Tax', 'Energy Revenue', 'Other Revenue']
         
         for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
+            ax.bar(x, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
             bottom += df[category]
         
         ax.set_title('Revenue Structure (M$)', fontsize=12, fontweight='bold')
@@ -911,7 +2354,8 @@ class TexasRealEstateAnalyzer:
     
     def _plot_rental_market(self, df, ax):
         """Plot du marché locatif"""
-        ax.plot(df['Year'], df['Average_Rent'], label='Average Rent', 
+        x, _ = self._time_axis(df)
+        ax.plot(x, df['Average_Rent'], label='Average Rent', 
                linewidth=2, color='#008751', alpha=0.8)
         
         ax.set_title('Rental Market Analysis', fontsize=12, fontweight='bold')
@@ -920,7 +2364,7 @@ class TexasRealEstateAnalyzer:
         ax.grid(True, alpha=0.3)
         
         ax2 = ax.twinx()
-        ax2.plot(df['Year'], df['Rental_Vacancy_Rate'], label='Vacancy Rate', 
+        ax2.plot(x, df['Rental_Vacancy_Rate'], label='Vacancy Rate', 
                 linewidth=2, color='#BF0A30', alpha=0.8)
         ax2.set_ylabel('Vacancy Rate (%)', color='#BF0A30')
         ax2.tick_params(axis='y', labelcolor='#BF0A30')
@@ -931,13 +2375,14 @@ class TexasRealEstateAnalyzer:
     
     def _plot_regional_investments(self, df, ax):
         """Plot des investissements régionaux"""
-        ax.plot(df['Year'], df['Tech_Investment'], label='Technology', 
+        x, _ = self._time_axis(df)
+        ax.plot(x, df['Tech_Investment'], label='Technology', 
                linewidth=2, color='#002868', alpha=0.8)
-        ax.plot(df['Year'], df['Energy_Investment'], label='Energy', 
+        ax.plot(x, df['Energy_Investment'], label='Energy', 
                linewidth=2, color='#BF0A30', alpha=0.8)
-        ax.plot(df['Year'], df['Infrastructure_Investment'], label='Infrastructure', 
+        ax.plot(x, df['Infrastructure_Investment'], label='Infrastructure', 
                linewidth=2, color='#008751', alpha=0.8)
-        ax.plot(df['Year'], df['Housing_Development_Investment'], label='Housing', 
+        ax.plot(x, df['Housing_Development_Investment'], label='Housing', 
                linewidth=2, color='#FFA300', alpha=0.8)
         
         ax.set_title('Regional Investments Distribution (M$)', fontsize=12, fontweight='bold')
@@ -947,7 +2392,8 @@ class TexasRealEstateAnalyzer:
     
     def _plot_demography_income(self, df, ax):
         """Plot de la démographie et des revenus"""
-        ax.plot(df['Year'], df['Population']/1000, label='Population', 
+        x, _ = self._time_axis(df)
+        ax.plot(x, df['Population']/1000, label='Population', 
                linewidth=2, color='#002868', alpha=0.8)
         
         ax.set_title('Demography and Income Trends', fontsize=12, fontweight='bold')
@@ -956,7 +2402,7 @@ class TexasRealEstateAnalyzer:
         ax.grid(True, alpha=0.3)
         
         ax2 = ax.twinx()
-        ax2.plot(df['Year'], df['Median_Income']/1000, label='Median Income', 
+        ax2.plot(x, df['Median_Income']/1000, label='Median Income', 
                 linewidth=2, color='#BF0A30', alpha=0.8)
         ax2.set_ylabel('Median Income (Thousand $)', color='#BF0A30')
         ax2.tick_params(axis='y', labelcolor='#BF0A30')
@@ -967,7 +2413,8 @@ class TexasRealEstateAnalyzer:
     
     def _plot_debt_budget(self, df, ax):
         """Plot de la dette et de l'équilibre budgétaire"""
-        ax.bar(df['Year'], df['Regional_Debt'], label='Regional Debt (M$)', 
+        x, width = self._time_axis(df)
+        ax.bar(x, df['Regional_Debt'], width=width, label='Regional Debt (M$)', 
               color='#002868', alpha=0.7)
         
         ax.set_title('Regional Debt and Budget Balance', fontsize=12, fontweight='bold')
@@ -976,7 +2423,7 @@ class TexasRealEstateAnalyzer:
         ax.grid(True, alpha=0.3, axis='y')
         
         ax2 = ax.twinx()
-        ax2.plot(df['Year'], df['Budget_Surplus_Deficit'], label='Budget Balance', 
+        ax2.plot(x, df['Budget_Surplus_Deficit'], label='Budget Balance', 
                 linewidth=3, color='#008751')
         ax2.set_ylabel('Budget Balance (M$)', color='#008751')
         ax2.tick_params(axis='y', labelcolor='#008751')
@@ -987,7 +2434,8 @@ class TexasRealEstateAnalyzer:
     
     def _plot_construction_development(self, df, ax):
         """Plot de la construction et du développement"""
-        ax.bar(df['Year'], df['New_Construction_Permits'], label='Construction Permits', 
+        x, width = self._time_axis(df)
+        ax.bar(x, df['New_Construction_Permits'], width=width, label='Construction Permits', 
               color='#FFA300', alpha=0.7)
         
         ax.set_title('Construction and Development Activity', fontsize=12, fontweight='bold')
@@ -996,7 +2444,7 @@ class TexasRealEstateAnalyzer:
         ax.grid(True, alpha=0.3, axis='y')
         
         ax2 = ax.twinx()
-        ax2.plot(df['Year'], df['Housing_Development_Investment'], label='Housing Investment', 
+        ax2.plot(x, df['Housing_Development_Investment'], label='Housing Investment', 
                 linewidth=2, color='#BF0A30')
         ax2.set_ylabel('Housing Investment (M$)', color='#BF0A30')
         ax2.tick_params(axis='y', labelcolor='#BF0A30')
@@ -1007,10 +2455,9 @@ class TexasRealEstateAnalyzer:
     
     def _plot_sectorial_investments(self, df, ax):
         """Plot des investissements sectoriels"""
-        years = df['Year']
-        width = 0.8
+        x, width = self._time_axis(df)
         
-        bottom = np.zeros(len(years))
+        bottom = np.zeros(len(x))
         categories = ['Tech_Investment', 'Energy_Investment', 'Infrastructure_Investment', 
                      'Housing_Development_Investment', 'Manufacturing_Investment', 'Agricultural_Investment']
         
@@ -1018,7 +2465,7 @@ class TexasRealEstateAnalyzer:
         labels = ['Technology', 'Energy', 'Infrastructure', 'Housing', 'Manufacturing', 'Agriculture']
         
         for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
+            ax.bar(x, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
             bottom += df[category]
         
         ax.set_title('Sectorial Investments Distribution (M$)', fontsize=12, fontweight='bold')
@@ -1026,91 +2473,454 @@ class TexasRealEstateAnalyzer:
         ax.legend()
         ax.grid(True, alpha=0.3, axis='y')
     
+    @timed('insights')
     def _generate_texas_insights(self, df):
         """Génère des insights analytiques adaptés au marché texan"""
-        print(f"🤠 TEXAS REAL ESTATE INSIGHTS - {self.region}")
-        print("=" * 65)
-        
-        # 1. Statistiques de base
-        print("\n1. 📈 KEY STATISTICS:")
-        avg_home_price = df['Median_Home_Price'].mean()
-        avg_income = df['Median_Income'].mean()
-        avg_rent = df['Average_Rent'].mean()
-        price_to_income_ratio = avg_home_price / avg_income
-        
-        print(f"Average median home price: ${avg_home_price:,.0f}")
-        print(f"Average median income: ${avg_income:,.0f}")
-        print(f"Average rent: ${avg_rent:.0f}")
-        print(f"Price-to-income ratio: {price_to_income_ratio:.1f}")
-        
-        # 2. Croissance immobilière
-        print("\n2. 📊 REAL ESTATE GROWTH:")
-        price_growth = ((df['Median_Home_Price'].iloc[-1] / 
-                        df['Median_Home_Price'].iloc[0]) - 1) * 100
-        population_growth = ((df['Population'].iloc[-1] / 
-                             df['Population'].iloc[0]) - 1) * 100
-        
-        print(f"Home price growth ({self.start_year}-{self.end_year}): {price_growth:.1f}%")
-        print(f"Population growth ({self.start_year}-{self.end_year}): {population_growth:.1f}%")
-        
-        # 3. Accessibilité du logement
-        print("\n3. 🏠 HOUSING AFFORDABILITY:")
-        current_price = df['Median_Home_Price'].iloc[-1]
-        current_income = df['Median_Income'].iloc[-1]
-        current_ratio = current_price / current_income
-        
-        affordability_status = "Critical" if current_ratio > 5 else "Severe" if current_ratio > 4 else "Moderate" if current_ratio > 3 else "Good"
-        print(f"Current price-to-income ratio: {current_ratio:.1f} ({affordability_status})")
-        
-        # 4. Marché locatif
-        print("\n4. 🏢 RENTAL MARKET:")
-        current_vacancy = df['Rental_Vacancy_Rate'].iloc[-1]
-        rent_growth = ((df['Average_Rent'].iloc[-1] / df['Average_Rent'].iloc[0]) - 1) * 100
-        
-        print(f"Current vacancy rate: {current_vacancy:.1f}%")
-        print(f"Rent growth ({self.start_year}-{self.end_year}): {rent_growth:.1f}%")
-        
-        # 5. Spécificités régionales
-        print(f"\n5. 🌟 {self.region.upper()} SPECIFICS:")
-        print(f"Region type: {self.config['type']}")
-        print(f"Specializations: {', '.join(self.config['specialites'])}")
-        print(f"Major cities: {', '.join(self.config['major_cities'])}")
-        print(f"Real estate segment: {self.config['segment_immobilier']}")
-        
-        # 6. Événements marquants du marché texan
-        print("\n6. 📅 KEY TEXAS REAL ESTATE EVENTS:")
-        print("• 2002-2008: Oil and gas boom driving growth")
-        print("• 2008-2009: Mild impact from financial crisis")
-        print("• 2010-2014: Shale revolution and energy boom")
-        print("• 2015-2016: Oil price collapse affecting energy regions")
-        print("• 2015-present: Major tech migration to Texas")
-        print("• 2020-2021: COVID-19 pandemic with Texas resilience")
-        print("• 2021-present: Massive population growth and development")
-        print("• Ongoing: Business-friendly policies attracting companies")
-        
-        # 7. Recommandations stratégiques
-        print("\n7. 💡 STRATEGIC RECOMMENDATIONS:")
-        if "énergie" in self.config["specialites"]:
-            print("• Diversify beyond oil and gas dependence")
-            print("• Invest in renewable energy transition")
-        if "technologie" in self.config["specialites"]:
-            print("• Continue attracting tech companies and talent")
-            print("• Develop innovation districts and tech hubs")
-        if "manufacturing" in self.config["specialites"]:
-            print("• Support advanced manufacturing development")
-            print("• Invest in workforce training programs")
-        
-        print("• Manage rapid growth with infrastructure investment")
-        print("• Maintain housing affordability through supply")
-        print("• Invest in transportation and water infrastructure")
-        print("• Support small business and entrepreneurship")
-        print("• Focus on sustainable development practices")
-
-def main():
-    """Fonction principale pour le Texas"""
-    # Liste des régions du Texas
-    regions = ["Dallas-Fort Worth", "Houston Metro", "Austin Area", "San Antonio", 
-               "El Paso Area", "Rio Grande Valley", "West Texas", "Central Texas"]
+        insights = self.texas_insights(df)
+        print(render_insights(insights))
+        return insights
+    
+    def texas_insights(self, df=None):
+        """Insights structurés (indicateurs, profil de la région, recommandations) sous forme de dict"""
+        if df is None:
+            stats = self._insight_stats()
+        else:
+            stats = {column: (df[column].mean(), df[column].iloc[0], df[column].iloc[-1])
+                     for column in INSIGHT_COLUMNS}
+        
+        insights = {'region': self.region, 'start_year': self.start_year, 'end_year': self.end_year}
+        insights.update((name, value.item() if isinstance(value, (np.generic, np.ndarray)) else value)
+                        for name, value in _insight_metrics(stats).items())
+        insights.update(
+            type=self.config['type'],
+            specialites=list(self.config['specialites']),
+            major_cities=list(self.config['major_cities']),
+            segment_immobilier=self.config['segment_immobilier'],
+            events=list(TEXAS_EVENTS),
+            recommendations=[recommendation
+                             for specialty, recommendations in SPECIALTY_RECOMMENDATIONS
+                             if specialty in self.config['specialites']
+                             for recommendation in recommendations] + list(GENERAL_RECOMMENDATIONS),
+        )
+        return insights
+    
+    def _insight_stats(self):
+        """Résumés des colonnes des insights sur le dernier calcul, réutilisés pour les colonnes inchangées"""
+        # Aucun calcul ou configuration modifiée depuis : (re)calcul incrémental d'abord
+        if self._previous is None or self._previous['edits'] != self._edits:
+            data = self.generate_financial_arrays()
+            if self._previous is None:
+                # Données lues dans le cache : résumés calculés sur ces données
+                return {column: (data[column].mean(dtype=np.float64), data[column][0], data[column][-1])
+                        for column in INSIGHT_COLUMNS}
+        
+        # Résumés du calcul précédent encore valables pour les colonnes non recalculées depuis
+        run = self._previous['run']
+        cached, source = self._insight_cache or ({}, None)
+        stats = {}
+        for column in INSIGHT_COLUMNS:
+            if source == run or (source == run - 1 and column not in self.recomputed):
+                stats[column] = cached[column]
+            else:
+                values = self._previous['values'][column]
+                stats[column] = (values.mean(dtype=np.float64), values[0], values[-1])
+        
+        self._insight_cache = (stats, run)
+        return stats
+    
+    def ensemble_insights(self, n_scenarios, chunk_size=SCENARIO_CHUNK):
+        """Indicateurs d'insights de chaque scénario (index région × scénario), calculés sur les tableaux"""
+        import pandas as pd
+        
+        tables = []
+        for first, draws in self.iter_ensemble(n_scenarios, chunk_size):
+            stats = {}
+            for column in INSIGHT_COLUMNS:
+                values = draws[:, :, self._column_keys[column]]
+                stats[column] = (values.mean(axis=1, dtype=np.float64), values[:, 0], values[:, -1])
+            index = pd.MultiIndex.from_arrays([np.full(len(draws), self.region, dtype=object),
+                                               np.arange(first, first + len(draws))],
+                                              names=['region', 'Scenario'])
+            tables.append(pd.DataFrame(_insight_metrics(stats), index=index))
+        
+        table = pd.concat(tables)
+        table['affordability'] = pd.Categorical(table['affordability'], categories=AFFORDABILITY_ORDER)
+        return table
+    
+    def stress_test(self, n_scenarios=10_000, stress=None, chunk_size=SCENARIO_CHUNK):
+        """Simule n_scenarios futurs sous chocs synthétiques et renvoie les métriques de queue"""
+        import pandas as pd
+        
+        print(f"🤠 Stress test de {n_scenarios:,} scénarios pour {self.region}, Texas...")
+        
+        previous = self.stress
+        self.stress = stress if stress is not None else previous or StressScenarios(seed=self.seed)
+        years, _ = self._period_grid()
+        price, income, budget = (self._column_keys[c] for c in ('Median_Home_Price', 'Median_Income',
+                                                                'Budget_Surplus_Deficit'))
+        # Métriques mesurées sur la fenêtre des chocs (l'historique simulé en est exclu)
+        window = years >= (self.stress.window[0] if self.stress.window else years[0])
+        if not window.any():
+            raise ValueError(f"Stress window {self.stress.window} starts after the simulated horizon")
+        try:
+            # Indicateurs par scénario, bloc par bloc (les tirages ne sont pas conservés)
+            tables = []
+            for first, draws in self.iter_ensemble(n_scenarios, chunk_size):
+                prices = draws[:, window, price].astype(np.float64)
+                peak = np.maximum.accumulate(prices, axis=1)
+                table = {
+                    'home_price_drawdown': (1 - prices / peak).max(axis=1),
+                    'final_home_price': prices[:, -1],
+                    'price_to_income': prices[:, -1] / draws[:, -1, income],
+                    'worst_budget_balance': draws[:, window, budget].min(axis=1),
+                }
+                for name, (occurs, begin, end, _) in self.stress.sample(first, first + len(draws), years).items():
+                    specialty = self.stress.templates[name]['specialty']
+                    hit = occurs & (begin <= years[-1]) & (end >= years[0])
+                    table[f'shock_{name}'] = hit if specialty is None or specialty in self.config['specialites'] \
+                        else np.zeros(len(draws), dtype=bool)
+                tables.append(pd.DataFrame(table, index=pd.RangeIndex(first, first + len(draws), name='Scenario')))
+        finally:
+            stress, self.stress = self.stress, previous
+        
+        scenarios = pd.concat(tables)
+        return {
+            'seed': self.seed,
+            'n_scenarios': n_scenarios,
+            'metrics': stress_metrics(scenarios),
+            'scenarios': scenarios,
+        }
+
+class TexasRegionPanel(TexasRealEstateAnalyzer):
+    """Simule un ensemble de régions en une seule passe sur une grille (région × période)"""
+    
+    def __init__(self, regions=None, catalog=None, shocks=None, seed=None, start_year=2002, end_year=2025,
+                 frequency='annual', compact=False, timer=None, correlation=None):
+        if catalog is None:
+            catalog = load_region_catalog()
+        elif isinstance(catalog, (str, os.PathLike)):
+            catalog = load_region_catalog(os.fspath(catalog))
+        regions = list(catalog.regions if regions is None else regions)
+        if not regions:
+            raise ValueError("A region panel needs at least one region")
+        
+        super().__init__(f"{len(regions)} regions", shocks=shocks, seed=seed, start_year=start_year,
+                         end_year=end_year, frequency=frequency, compact=compact, timer=timer,
+                         catalog=catalog, correlation=correlation)
+        
+        # Lignes du catalogue et clés de flux aléatoires de chaque région : chaque région
+        # tire exactement les mêmes valeurs que TexasRealEstateAnalyzer(région, seed=...)
+        self.regions = regions
+        self._rows = np.array([catalog.row(region) for region in regions])
+        self._region_keys = [zlib.crc32(region.encode('utf-8')) for region in regions]
+        self._noise_factor = self._region_noise_factors(correlation)
+    
+    def generate_panel_arrays(self, labels=False):
+        """Séries de toutes les régions en format long : une ligne par (région, période)"""
+        print(f"🤠 Génération des données de {len(self.regions):,} régions du Texas...")
+        
+        years, periods = self._period_grid()
+        n_regions, n_periods = len(self.regions), len(years)
+        
+        # Bloc (colonne × région × période) vu en (région × période × colonne) :
+        # chaque colonne reste contiguë et s'aplatit sans copie
+        block = np.empty((len(COLUMN_GRAPH), n_regions, n_periods), dtype=self.dtype).transpose(1, 2, 0)
+        with self.timer.stage('generate'):
+            self._simulate_columns(years, block)
+        
+        data = {'region': np.repeat(np.array(self.regions), n_periods)}
+        if labels:
+            for field in ('type', 'segment_immobilier'):
+                values = np.array(getattr(self.catalog, field))[self._rows]
+                data[field] = np.repeat(values, n_periods)
+        data['Year'] = np.tile(self._calendar(years, 'Year'), n_regions)
+        if self.periods_per_year > 1:
+            data['Period'] = np.tile(self._calendar(periods, 'Period'), n_regions)
+        data.update((column, block[..., j].reshape(-1)) for j, column in enumerate(COLUMN_GRAPH))
+        
+        return data
+    
+    def generate_panel_data(self, labels=False):
+        """DataFrame long de toutes les régions (colonne region, catégorielle en mode compact)"""
+        import pandas as pd
+        
+        df = pd.DataFrame(self.generate_panel_arrays(labels), copy=False)
+        if self.compact:
+            for column in ('region',) + (('type', 'segment_immobilier') if labels else ()):
+                df[column] = pd.Categorical(df[column])
+        return df
+    
+    def _param_value(self, name):
+        """Paramètre de chaque région en colonne (région × 1), diffusé sur les périodes"""
+        return self.catalog.params[name][self._rows][:, None]
+    
+    def update_config(self, **fields):
+        raise ValueError("Region panels read their configs from the catalog; edit the catalog instead")
+    
+    def update_correlation(self, correlation):
+        """Remplace le modèle de corrélation du bruit de toutes les régions"""
+        self._noise_factor = self._region_noise_factors(correlation)
+        self.correlation = correlation
+        self._previous = None
+        self._edits += 1
+    
+    def _region_noise_factors(self, correlation):
+        """Facteurs de Cholesky de chaque région (colonne × colonne × région × 1), un par type de région"""
+        if correlation is None or correlation is False:
+            return None
+        factors = np.stack([_noise_factor(correlation, region_type) for region_type in self.catalog.types])
+        return np.moveaxis(factors[self.catalog.type_id[self._rows]], 0, -1)[..., None]
+    
+    def _region_streams(self, column):
+        """Générateurs (région, colonne, bloc 0) de chaque région (column=None : bruit corrélé)"""
+        if self._scenarios is not None:
+            raise ValueError("Scenario ensembles are simulated one region at a time")
+        column_key = self._column_keys[column] if column is not None else JOINT_NOISE_KEY
+        keys = np.column_stack([self._region_keys, np.full(len(self._region_keys), column_key),
+                                np.zeros(len(self._region_keys), dtype=np.int64)])
+        return _spawn_generators(self.seed, keys)
+    
+    def _noise(self, column, n, sigma, loc=1.0):
+        """Bruit (région × période), chaque région tirant depuis son propre flux"""
+        if self._noise_factor is not None:
+            return loc + sigma * self._joint_noise(n)[self._column_keys[column]]
+        z = np.stack([stream.standard_normal((1, n))[0] for stream in self._region_streams(column)])
+        return loc + sigma * z
+    
+    def _joint_noise(self, n):
+        """Bruit corrélé de chaque colonne (région × période), chaque région avec le facteur de son type"""
+        if self._joint is None or self._joint[0] != n:
+            z = np.stack([stream.standard_normal((1, len(COLUMN_GRAPH), n))[0]
+                          for stream in self._region_streams(None)])
+            self._joint = (n, _correlate(self._noise_factor, z.transpose(1, 0, 2)))
+        return self._joint[1]
+    
+    def _trend_multipliers(self, years, columns):
+        """Multiplicateurs de chocs (région × période × colonne), chocs sectoriels par région"""
+        years = np.asarray(years)
+        index = {column: j for j, column in enumerate(columns)}
+        multipliers = np.ones((len(self.regions), len(years), len(columns)))
+        
+        for start, end, specialty, column, multiplier in self.shocks:
+            if column not in index:
+                continue
+            active = years >= start
+            if end is not None:
+                active &= years <= end
+            regions = (np.ones(len(self.regions), dtype=bool) if specialty is None
+                       else self.catalog.has_specialty(specialty)[self._rows])
+            multipliers[np.ix_(regions, active, [index[column]])] *= multiplier
+        
+        return multipliers
+    
+    def _simulate_scenarios(self, years, start, stop):
+        raise ValueError("Scenario ensembles are simulated one region at a time")
+    
+    def _cache_key(self, kind, *extra):
+        return None
+
+
+# Sorties suivies par l'analyse de sensibilité : prix final, solde budgétaire moyen,
+# ratio prix / revenu final (accessibilité)
+SWEEP_OUTPUTS = ('Median_Home_Price', 'Budget_Surplus_Deficit', 'price_to_income')
+
+# Paramètres de région balayés par défaut (± spread autour de la valeur de la région)
+SWEEP_REGION_PARAMS = ('population_growth', 'base_income', 'revenue_growth', 'home_price_growth',
+                       'prix_m2_base', 'budget_base')
+
+
+class ParameterSweep(TexasRealEstateAnalyzer):
+    """Évalue le modèle d'une région pour des lots de jeux de paramètres (axe de tête = jeu)"""
+    # Paramètres : noms de RegionCatalog.params (valeur remplacée), 'noise_scale' et
+    # 'sigma:<colonne>' (multiplicateurs des écarts-types du bruit), 'shock:<i>'
+    # (multiplicateur du i-ème choc). Tous les jeux partagent les mêmes tirages aléatoires
+    # (nombres aléatoires communs) : les écarts entre jeux ne viennent que des paramètres.
+    
+    def __init__(self, region_name, space=None, spread=0.5, **kwargs):
+        super().__init__(region_name, **kwargs)
+        self.space = dict(space) if space is not None else self.default_space(spread)
+        self._batch = {}
+        self._draws = {}
+    
+    def default_space(self, spread=0.5):
+        """Espace par défaut : paramètres de la région, échelle du bruit et chocs actifs, ± spread"""
+        space = {}
+        for name in SWEEP_REGION_PARAMS:
+            value = float(super()._param_value(name))
+            space[name] = (value * (1 - spread), value * (1 + spread))
+        space['noise_scale'] = (max(1 - spread, 0.0), 1 + spread)
+        for i, (_, _, specialty, column, multiplier) in enumerate(self.shocks):
+            if specialty is None or specialty in self.config['specialites']:
+                deviation = multiplier - 1
+                space[f'shock:{i}'] = tuple(sorted((1 + deviation * (1 - spread), 1 + deviation * (1 + spread))))
+        return space
+    
+    def shock_label(self, name):
+        """Libellé lisible d'un paramètre de choc ('shock:<i>')"""
+        start, end, specialty, column, _ = self.shocks[int(name.split(':', 1)[1])]
+        period = f"{start}+" if end is None else str(start) if end == start else f"{start}-{end}"
+        return f"{column} {period}" + (f" ({specialty})" if specialty else "")
+    
+    def _distributions(self):
+        """Lois des paramètres (intervalle = loi uniforme, sinon loi scipy.stats figée)"""
+        from scipy import stats
+        return {name: stats.uniform(spec[0], spec[1] - spec[0]) if isinstance(spec, tuple) else spec
+                for name, spec in self.space.items()}
+    
+    def sample(self, n, method='lhs', seed=None):
+        """Tire n jeux de paramètres (hypercube latin ou Sobol brouillé) dans l'espace balayé"""
+        import pandas as pd
+        from scipy.stats import qmc
+        
+        names = list(self.space)
+        if method == 'lhs':
+            sampler = qmc.LatinHypercube(d=len(names), seed=seed)
+        elif method == 'sobol':
+            sampler = qmc.Sobol(d=len(names), scramble=True, seed=seed)
+        else:
+            raise ValueError(f"Unknown sampling method: {method} (expected 'lhs' or 'sobol')")
+        unit = sampler.random(n)
+        
+        distributions = self._distributions()
+        return pd.DataFrame({name: distributions[name].ppf(unit[:, k]) for k, name in enumerate(names)})
+    
+    def evaluate(self, samples, chunk_size=SCENARIO_CHUNK):
+        """Sorties (SWEEP_OUTPUTS et classe d'accessibilité) de chaque jeu de paramètres"""
+        import pandas as pd
+        
+        samples = pd.DataFrame(samples)
+        unknown = [name for name in samples.columns if not self._is_parameter(name)]
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {', '.join(unknown)}")
+        
+        outputs = self._evaluate_arrays({name: samples[name].to_numpy(dtype=float) for name in samples.columns},
+                                        len(samples), chunk_size)
+        table = pd.DataFrame(outputs, index=samples.index)
+        table['affordability'] = pd.Categorical(affordability_class(table['price_to_income']),
+                                                categories=AFFORDABILITY_ORDER)
+        return table
+    
+    def sensitivity(self, n=4096, method='spearman', seed=None):
+        """Indices de sensibilité de chaque paramètre sur chaque sortie (paramètres les plus influents en tête)"""
+        import pandas as pd
+        
+        names = list(self.space)
+        if method == 'spearman':
+            # Corrélations de rang sur un hypercube latin
+            from scipy.stats import rankdata
+            samples = self.sample(n, 'lhs', seed)
+            outputs = self._evaluate_arrays({name: samples[name].to_numpy() for name in names}, n)
+            ranks = rankdata(np.column_stack([samples.to_numpy()] + [outputs[o] for o in SWEEP_OUTPUTS]), axis=0)
+            corr = np.corrcoef(ranks, rowvar=False)[:len(names), len(names):]
+            table = pd.DataFrame(corr, index=names, columns=list(SWEEP_OUTPUTS))
+            order = table.abs().max(axis=1)
+        elif method == 'sobol':
+            # Indices de Sobol du premier ordre et totaux (estimateur de Saltelli de scipy)
+            from scipy.stats import sobol_indices
+            distributions = self._distributions()
+            
+            def model(x):
+                outputs = self._evaluate_arrays(dict(zip(names, x)), x.shape[1])
+                return np.vstack([outputs[o] for o in SWEEP_OUTPUTS])
+            
+            result = sobol_indices(func=model, n=n, dists=[distributions[name] for name in names],
+                                   rng=np.random.default_rng(seed))
+            columns = pd.MultiIndex.from_product([SWEEP_OUTPUTS, ['S1', 'ST']], names=['output', 'index'])
+            table = pd.DataFrame(np.column_stack([v for o in range(len(SWEEP_OUTPUTS))
+                                                  for v in (result.first_order[o], result.total_order[o])]),
+                                 index=names, columns=columns)
+            order = table.xs('ST', axis=1, level='index').max(axis=1)
+        else:
+            raise ValueError(f"Unknown sensitivity method: {method} (expected 'spearman' or 'sobol')")
+        
+        table.index.name = 'parameter'
+        return table.loc[order.sort_values(ascending=False).index]
+    
+    def _is_parameter(self, name):
+        """Vrai si le nom désigne un paramètre balayable"""
+        if name == 'noise_scale' or name in self.catalog.params:
+            return True
+        kind, _, value = name.partition(':')
+        if kind == 'sigma':
+            return value in COLUMN_GRAPH
+        return kind == 'shock' and value.isdigit() and int(value) < len(self.shocks)
+    
+    def _evaluate_arrays(self, values, n, chunk_size=SCENARIO_CHUNK):
+        """Évalue n jeux de paramètres par blocs et renvoie les sorties {sortie: tableau (n,)}"""
+        years, _ = self._period_grid()
+        price, budget, income = (self._column_keys[c] for c in ('Median_Home_Price', 'Budget_Surplus_Deficit',
+                                                                'Median_Income'))
+        outputs = {name: np.empty(n) for name in SWEEP_OUTPUTS}
+        
+        for first in range(0, n, chunk_size):
+            last = min(first + chunk_size, n)
+            self._batch = {name: np.asarray(array[first:last], dtype=float) for name, array in values.items()}
+            self._previous = None
+            block = np.empty((last - first, len(years), len(COLUMN_GRAPH)))
+            try:
+                self._simulate_columns(years, block)
+            finally:
+                self._batch = {}
+                self._previous = None
+            
+            outputs['Median_Home_Price'][first:last] = block[:, -1, price]
+            outputs['Budget_Surplus_Deficit'][first:last] = block[:, :, budget].mean(axis=1)
+            outputs['price_to_income'][first:last] = block[:, -1, price] / block[:, -1, income]
+        
+        return outputs
+    
+    def _param_value(self, name):
+        """Valeur balayée (jeu × 1) si le paramètre fait partie du lot, sinon valeur de la région"""
+        if name in self._batch:
+            return self._batch[name][:, None]
+        return super()._param_value(name)
+    
+    def _noise(self, column, n, sigma, loc=1.0):
+        """Bruit commun à tous les jeux (scénario 0), écart-type éventuellement mis à l'échelle"""
+        if (column, n) not in self._draws:
+            if self._noise_factor is not None:
+                self._draws[column, n] = self._joint_noise(n)[self._column_keys[column]]
+            else:
+                self._draws[column, n] = self._stream(column, 0).standard_normal((1, n))[0]
+        scale = self._batch.get('noise_scale', 1.0) * self._batch.get(f'sigma:{column}', 1.0)
+        if np.ndim(scale):
+            scale = scale[:, None]
+        return loc + sigma * scale * self._draws[column, n]
+    
+    def _trend_multipliers(self, years, columns):
+        """Multiplicateurs de chocs, par jeu (jeu × période × colonne) si des chocs sont balayés"""
+        multipliers = super()._trend_multipliers(years, columns)
+        swept = [name for name in self._batch if name.startswith('shock:')]
+        if not swept:
+            return multipliers
+        
+        years = np.asarray(years)
+        size = len(self._batch[swept[0]])
+        multipliers = np.repeat(multipliers[None], size, axis=0)
+        for name in swept:
+            start, end, specialty, column, multiplier = self.shocks[int(name.split(':', 1)[1])]
+            if column not in columns or (specialty is not None and specialty not in self.config['specialites']):
+                continue
+            active = years >= start
+            if end is not None:
+                active &= years <= end
+            multipliers[:, active, columns.index(column)] *= (self._batch[name] / multiplier)[:, None]
+        return multipliers
+    
+    def update_correlation(self, correlation):
+        super().update_correlation(correlation)
+        self._draws = {}
+    
+    def _simulate_scenarios(self, years, start, stop):
+        raise ValueError("Parameter sweeps use common random numbers; run ensembles on a TexasRealEstateAnalyzer")
+    
+    def _cache_key(self, kind, *extra):
+        return None
+
+
+def interactive_main():
+    """Analyse interactive d'une région choisie au clavier"""
+    regions = TEXAS_REGIONS
     
     print("🤠 TEXAS REAL ESTATE ANALYSIS - MAJOR REGIONS (2002-2025)")
     print("=" * 70)
@@ -1136,7 +2946,7 @@ def main():
     real_estate_data = analyzer.generate_financial_data()
     
     # Sauvegarder les données
-    output_file = f'{selected_region.replace(" ", "_").lower()}_texas_data_2002_2025.csv'
+    output_file = f'{_region_slug(selected_region)}_texas_data_{analyzer.start_year}_{analyzer.end_year}.csv'
     real_estate_data.to_csv(output_file, index=False)
     print(f"💾 Data saved: {output_file}")
     
@@ -1152,5 +2962,747 @@ def main():
     print(f"📊 Period: {analyzer.start_year}-{analyzer.end_year}")
     print("🏠 Data: Demographics, real estate market, investments, regional economics")
 
+def _write_csv(data, output_file, compression=None):
+    """Écrit les colonnes en CSV (sans pandas, octet pour octet comme DataFrame.to_csv)"""
+    columns = list(data)
+    rows = zip(*(_csv_values(data[column]) for column in columns))
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def _csv_values(values):
+    """Valeurs d'une colonne pour le CSV (float32 écrits comme pandas, via astype(str))"""
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return values.astype(str).tolist()
+    return values.tolist()
+
+
+def _write_json(data, output_file, compression=None):
+    """Écrit les colonnes en JSON (une entrée par ligne de données)"""
+    columns = list(data)
+    rows = zip(*(np.asarray(data[column]).tolist() for column in columns))
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump([dict(zip(columns, row)) for row in rows], f)
+
+
+def _arrow_table(data):
+    """Table Arrow construite sans copie à partir des tableaux NumPy"""
+    import pyarrow as pa
+    return pa.table({column: np.asarray(values) for column, values in data.items()})
+
+
+def _write_parquet(data, output_file, compression=None):
+    """Écrit les colonnes en Parquet (zstd par défaut)"""
+    import pyarrow.parquet as pq
+    pq.write_table(_arrow_table(data), output_file, compression=compression or 'zstd')
+
+
+def _write_feather(data, output_file, compression=None):
+    """Écrit les colonnes en Feather v2 / Arrow IPC (non compressé par défaut pour le mmap)"""
+    import pyarrow.feather as feather
+    feather.write_feather(_arrow_table(data), output_file, compression=compression or 'uncompressed')
+
+
+def _write_npz(data, output_file, compression=None):
+    """Écrit les colonnes dans une archive NumPy .npz"""
+    if compression in (None, 'none', 'uncompressed'):
+        np.savez(output_file, **data)
+    else:
+        np.savez_compressed(output_file, **data)
+
+
+# Écrivains de données : format -> fonction(data, fichier, compression)
+DATA_WRITERS = {
+    'csv': _write_csv,
+    'json': _write_json,
+    'parquet': _write_parquet,
+    'feather': _write_feather,
+    'npz': _write_npz,
+}
+
+
+def _write_data(data, path, fmt, compression=None):
+    """Écrit les colonnes {nom: tableau} au format demandé et renvoie le chemin du fichier"""
+    if fmt not in DATA_WRITERS:
+        raise ValueError(f"Unsupported output format: {fmt} (expected one of {', '.join(DATA_WRITERS)})")
+    output_file = f'{path}.{fmt}'
+    DATA_WRITERS[fmt](data, output_file, compression)
+    return output_file
+
+
+def _partition_dir(output_dir, region, seed):
+    """Dossier de partition Hive d'une région et d'une graine (region=…/seed=…)"""
+    return os.path.join(output_dir, f'region={_region_slug(region)}', f'seed={seed}')
+
+
+def load_dataset(root, memory_map=True):
+    """Charge un jeu de données partitionné (Parquet ou Feather) en une seule table Arrow"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    tables = []
+    for directory, _, files in sorted(os.walk(root)):
+        # Colonnes de partition déduites du chemin (clé=valeur)
+        partitions = [part.split('=', 1) for part in os.path.relpath(directory, root).split(os.sep) if '=' in part]
+        
+        # Une partition écrite dans deux formats compterait ses lignes deux fois
+        formats = {os.path.splitext(name)[1] for name in files} & {'.feather', '.parquet'}
+        if len(formats) > 1:
+            raise ValueError(f"Partition {directory} mixes Parquet and Feather files; keep one format per dataset")
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            if name.endswith('.feather'):
+                # Lecture sans copie : les buffers pointent dans le fichier mappé
+                source = pa.memory_map(path) if memory_map else pa.OSFile(path)
+                table = pa.ipc.open_file(source).read_all()
+            elif name.endswith('.parquet'):
+                table = pq.read_table(path, memory_map=memory_map)
+            else:
+                continue
+            for key, value in partitions:
+                table = table.append_column(key, pa.array([value] * table.num_rows).dictionary_encode())
+            tables.append(table)
+    
+    if not tables:
+        raise FileNotFoundError(f"No Parquet or Feather files found under {root}")
+    return pa.concat_tables(tables)
+
+
+def _run_region(region, seed, output_dir, plot, start_year=2002, end_year=2025, fmt='csv',
+                partitioned=False, compression=None, cache_dir=None, cache_size=256 * 1024 ** 2,
+                frequency='annual', compact=False, timings=False, profile=False, trace_memory=False,
+                catalog=None, correlated=False):
+    """Analyse une région sans interaction et renvoie son temps d'exécution"""
+    started = time.perf_counter()
+    
+    cache = ResultCache(cache_dir, cache_size) if cache_dir else None
+    timer = StageTimer(enabled=timings or profile or trace_memory, profile=profile, memory=trace_memory)
+    analyzer = TexasRealEstateAnalyzer(region, seed=seed, start_year=start_year, end_year=end_year,
+                                       cache=cache, frequency=frequency, compact=compact, timer=timer,
+                                       catalog=catalog, correlation=correlated or None)
+    data = analyzer.generate_financial_arrays()
+    
+    # Jeu de données partitionné (region=…/seed=…) ou un fichier par région
+    suffix = '' if frequency == 'annual' else f'_{frequency}'
+    if partitioned:
+        output_dir = _partition_dir(output_dir, region, analyzer.seed)
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f'part-{start_year}-{end_year}{suffix}')
+    else:
+        path = os.path.join(output_dir, f'{_region_slug(region)}_texas_data_{start_year}_{end_year}{suffix}')
+    with timer.stage('write'):
+        output_file = _write_data(data, path, fmt, compression)
+    
+    if plot:
+        import pandas as pd
+        analyzer.create_financial_analysis(pd.DataFrame(data), show=False, output_dir=output_dir, insights=False)
+    
+    # Rapport de temps par étape, à côté des données
+    if timer.enabled:
+        timer.write(f'{path}_timings.json', region=region, seed=analyzer.seed, start_year=start_year,
+                    end_year=end_year, frequency=frequency, format=fmt)
+    
+    cache_stats = cache.stats() if cache is not None else None
+    return region, output_file, time.perf_counter() - started, cache_stats
+
+
+def run_batch(regions, workers=None, seed=None, output_dir='.', plot=True,
+              start_year=2002, end_year=2025, fmt='csv', partitioned=False, compression=None,
+              cache_dir=None, cache_size=256 * 1024 ** 2, frequency='annual', compact=False,
+              timings=False, profile=False, trace_memory=False, catalog=None, correlated=False):
+    """Analyse plusieurs régions en parallèle dans un pool de processus"""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Graine racine commune : chaque région tire ses propres flux (voir _stream)
+    seed = np.random.SeedSequence(seed).entropy
+    
+    print(f"🤠 Batch analysis of {len(regions)} Texas regions (seed {seed})")
+    print("=" * 70)
+    
+    started = time.perf_counter()
+    durations = {}
+    hits = misses = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_region, region, seed, output_dir, plot, start_year, end_year, fmt,
+                                   partitioned, compression, cache_dir, cache_size, frequency, compact,
+                                   timings, profile, trace_memory, catalog, correlated)
+                   for region in regions]
+        for future in as_completed(futures):
+            region, output_file, elapsed, cache_stats = future.result()
+            durations[region] = elapsed
+            if cache_stats:
+                hits += cache_stats['hits']
+                misses += cache_stats['misses']
+            print(f"✅ {region}: {output_file} ({elapsed:.2f}s)")
+    
+    total = time.perf_counter() - started
+    print(f"\n⏱️  {len(regions)} regions in {total:.2f}s wall time "
+          f"({sum(durations.values()):.2f}s of region work)")
+    if cache_dir:
+        print(f"🗄️  Cache: {hits} hits, {misses} misses")
+    
+    return durations
+
+
+def run_panel(regions=None, seed=None, output_dir='.', start_year=2002, end_year=2025, fmt='csv',
+              compression=None, frequency='annual', compact=False, labels=False, timings=False,
+              profile=False, trace_memory=False, catalog=None, correlated=False):
+    """Simule toutes les régions en une passe vectorisée et les écrit dans une seule table longue"""
+    started = time.perf_counter()
+    
+    timer = StageTimer(enabled=timings or profile or trace_memory, profile=profile, memory=trace_memory)
+    panel = TexasRegionPanel(regions, catalog=catalog, seed=seed, start_year=start_year, end_year=end_year,
+                             frequency=frequency, compact=compact, timer=timer, correlation=correlated or None)
+    data = panel.generate_panel_arrays(labels)
+    
+    suffix = '' if frequency == 'annual' else f'_{frequency}'
+    path = os.path.join(output_dir, f'texas_panel_{start_year}_{end_year}{suffix}')
+    with timer.stage('write'):
+        output_file = _write_data(data, path, fmt, compression)
+    
+    if timer.enabled:
+        timer.write(f'{path}_timings.json', regions=len(panel.regions), seed=panel.seed, start_year=start_year,
+                    end_year=end_year, frequency=frequency, format=fmt)
+    
+    return output_file, time.perf_counter() - started
+
+
+def run_sensitivity(region, n=4096, method='spearman', spread=0.5, seed=None, output_dir='.',
+                    start_year=2002, end_year=2025, frequency='annual', catalog=None, correlated=False):
+    """Analyse de sensibilité globale d'une région, écrite en CSV (un paramètre par ligne)"""
+    started = time.perf_counter()
+    
+    sweep = ParameterSweep(region, spread=spread, catalog=catalog, seed=seed, start_year=start_year,
+                           end_year=end_year, frequency=frequency, correlation=correlated or None)
+    table = sweep.sensitivity(n, method, seed)
+    table.index = [sweep.shock_label(name) if name.startswith('shock:') else name for name in table.index]
+    table.index.name = 'parameter'
+    
+    suffix = '' if frequency == 'annual' else f'_{frequency}'
+    path = os.path.join(output_dir, f"{_region_slug(region)}_texas_sensitivity_{method}_{start_year}_{end_year}{suffix}.csv")
+    table.to_csv(path)
+    return table, path, time.perf_counter() - started
+
+
+def run_stress(regions=None, n_scenarios=10_000, seed=None, output_dir='.', start_year=2002, end_year=2025,
+               window=None, frequency='annual', catalog=None, correlated=False):
+    """Tests de résistance de plusieurs régions (mêmes chocs synthétiques), métriques écrites en CSV"""
+    import pandas as pd
+    
+    started = time.perf_counter()
+    
+    # Graine et chocs communs : chaque scénario est le même futur pour toutes les régions
+    seed = np.random.SeedSequence(seed).entropy
+    stress = StressScenarios(window=window, seed=seed)
+    regions = list(TEXAS_REGIONS if regions is None else regions)
+    
+    metrics = {}
+    for region in regions:
+        analyzer = TexasRealEstateAnalyzer(region, seed=seed, start_year=start_year, end_year=end_year,
+                                           frequency=frequency, catalog=catalog, correlation=correlated or None)
+        metrics[region] = analyzer.stress_test(n_scenarios, stress)['metrics']
+    table = pd.DataFrame.from_dict(metrics, orient='index')
+    table.index.name = 'region'
+    
+    suffix = '' if frequency == 'annual' else f'_{frequency}'
+    path = os.path.join(output_dir, f'texas_stress_{start_year}_{end_year}{suffix}.csv')
+    table.to_csv(path)
+    return table, path, time.perf_counter() - started
+
+
+def build_ensemble_store(path, regions=None, n_scenarios=10_000, seed=None, start_year=2002, end_year=2025,
+                         frequency='annual', compact=False, catalog=None, correlated=False,
+                         chunk_size=SCENARIO_CHUNK):
+    """Simule un ensemble par région, bloc par bloc, directement dans un entrepôt projeté en mémoire"""
+    started = time.perf_counter()
+    
+    seed = np.random.SeedSequence(seed).entropy
+    regions = list(TEXAS_REGIONS if regions is None else regions)
+    os.makedirs(path, exist_ok=True)
+    
+    files, years, periods = {}, None, None
+    for region in regions:
+        analyzer = TexasRealEstateAnalyzer(region, seed=seed, start_year=start_year, end_year=end_year,
+                                           frequency=frequency, compact=compact, catalog=catalog,
+                                           correlation=correlated or None)
+        years, periods = analyzer._period_grid()
+        
+        # Fichier .npy (colonne × période × scénario) rempli bloc par bloc, sans tout garder en mémoire
+        files[region] = f'{_region_slug(region)}.npy'
+        block = np.lib.format.open_memmap(os.path.join(path, files[region]), mode='w+',
+                                          dtype=analyzer.dtype, shape=(len(COLUMN_GRAPH), len(years), n_scenarios))
+        for first, draws in analyzer.iter_ensemble(n_scenarios, chunk_size):
+            block[:, :, first:first + len(draws)] = draws.transpose(2, 1, 0)
+        block.flush()
+        del block
+    
+    # Index écrit en dernier (et renommé atomiquement) : un entrepôt indexé est complet
+    index = {
+        'format': ENSEMBLE_STORE_FORMAT,
+        'code_version': _code_version(),
+        'seed': seed,
+        'files': files,
+        'columns': list(COLUMN_GRAPH),
+        'years': years.tolist(),
+        'periods': periods.tolist() if frequency != 'annual' else None,
+        'n_scenarios': n_scenarios,
+        'dtype': np.dtype(COMPACT_FLOAT if compact else np.float64).name,
+        'start_year': start_year,
+        'end_year': end_year,
+        'frequency': frequency,
+        'correlated': bool(correlated),
+    }
+    temporary = os.path.join(path, f'{ENSEMBLE_INDEX}.tmp')
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(temporary, os.path.join(path, ENSEMBLE_INDEX))
+    
+    return EnsembleStore(path), time.perf_counter() - started
+
+
+# Version du format des fichiers de fragments (shard) d'ensembles
+SHARD_FORMAT = 1
+
+
+def shard_units(regions, n_scenarios, n_shards, shard_id):
+    """Unités (région, bloc de scénarios) du fragment shard_id : tranche contiguë de la liste région par région"""
+    if not 0 <= shard_id < n_shards:
+        raise ValueError(f"Shard id {shard_id} out of range for {n_shards} shards")
+    n_chunks = -(-n_scenarios // SCENARIO_CHUNK)
+    units = [(region, chunk) for region in regions for chunk in range(n_chunks)]
+    return units[shard_id * len(units) // n_shards:(shard_id + 1) * len(units) // n_shards]
+
+
+def run_shard(regions, n_scenarios, n_shards, shard_id, seed, output_dir='.', start_year=2002, end_year=2025,
+              frequency='annual', catalog=None, correlated=False, bins=256):
+    """Calcule un fragment d'un ensemble (régions × scénarios) et l'écrit dans un fichier autodescriptif"""
+    if seed is None:
+        raise ValueError("Sharded runs need an explicit --seed shared by every shard")
+    started = time.perf_counter()
+    regions = list(regions)
+    units = shard_units(regions, n_scenarios, n_shards, shard_id)
+    
+    # Accumulateurs par région : moments de chaque bloc (fusionnés dans l'ordre des blocs
+    # à la fin) et esquisse de quantiles (comptes entiers, fusion exacte)
+    arrays = {}
+    touched = list(dict.fromkeys(region for region, _ in units))
+    for r, region in enumerate(touched):
+        analyzer = TexasRealEstateAnalyzer(region, seed=seed, start_year=start_year, end_year=end_year,
+                                           frequency=frequency, catalog=catalog, correlation=correlated or None)
+        chunks = [chunk for name, chunk in units if name == region]
+        moments, sketch = analyzer._shard_accumulators(chunks, n_scenarios, bins)
+        arrays[f'count_{r}'] = np.array([m.count for m in moments])
+        arrays[f'mean_{r}'] = np.stack([m.mean for m in moments])
+        arrays[f'm2_{r}'] = np.stack([m.m2 for m in moments])
+        for field in ('lo', 'hi', 'counts', 'min', 'max'):
+            arrays[f'sketch_{field}_{r}'] = getattr(sketch, field)
+    
+    metadata = {
+        'format': SHARD_FORMAT,
+        'code_version': _code_version(),
+        'seed': seed,
+        'regions': regions,
+        'n_scenarios': n_scenarios,
+        'chunk': SCENARIO_CHUNK,
+        'shards': n_shards,
+        'shard_id': shard_id,
+        'start_year': start_year,
+        'end_year': end_year,
+        'frequency': frequency,
+        'catalog': os.fspath(catalog) if isinstance(catalog, (str, os.PathLike)) else None,
+        'correlated': bool(correlated),
+        'bins': bins,
+        'units': [[region, chunk] for region, chunk in units],
+        'touched': touched,
+    }
+    
+    # Écriture atomique (fichier temporaire renommé) : un fragment visible est complet
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f'texas_shard_{shard_id:04d}_of_{n_shards:04d}.npz')
+    temporary = f'{path}.tmp.npz'
+    np.savez(temporary, metadata=np.array(json.dumps(metadata, ensure_ascii=False)), **arrays)
+    os.replace(temporary, path)
+    return path, time.perf_counter() - started
+
+
+# Champs de métadonnées qui doivent être identiques dans tous les fragments d'un même calcul
+SHARD_SHARED_FIELDS = ('format', 'code_version', 'seed', 'regions', 'n_scenarios', 'chunk', 'shards',
+                       'start_year', 'end_year', 'frequency', 'catalog', 'correlated', 'bins')
+
+
+def merge_shards(paths, percentiles=(5, 50, 95)):
+    """Fusionne des fragments en résumés par région, identiques à stream_ensemble sur un seul nœud"""
+    if isinstance(paths, (str, os.PathLike)):
+        directory = os.fspath(paths)
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                       if name.startswith('texas_shard_') and name.endswith('.npz') and '.tmp' not in name)
+    if not paths:
+        raise ValueError("No shard files to merge")
+    
+    shards = []
+    for path in paths:
+        with np.load(path) as archive:
+            shards.append((json.loads(str(archive['metadata'])), {name: archive[name] for name in archive.files}))
+    
+    # Fragments cohérents et couverture complète des unités (région, bloc), sans doublon
+    reference = shards[0][0]
+    for metadata, _ in shards:
+        different = [field for field in SHARD_SHARED_FIELDS if metadata[field] != reference[field]]
+        if different:
+            raise ValueError(f"Shard {metadata['shard_id']} does not match shard {reference['shard_id']}: "
+                             f"{', '.join(different)}")
+    ids = sorted(metadata['shard_id'] for metadata, _ in shards)
+    if ids != list(range(reference['shards'])):
+        missing = sorted(set(range(reference['shards'])) - set(ids))
+        raise ValueError(f"Shards missing or duplicated (missing: {missing or 'none'}, found: {ids})")
+    
+    # Moments de chaque bloc et esquisses, regroupés par région
+    blocks, sketches = {}, {}
+    for metadata, arrays in shards:
+        for r, region in enumerate(metadata['touched']):
+            chunks = [chunk for name, chunk in metadata['units'] if name == region]
+            for k, chunk in enumerate(chunks):
+                blocks.setdefault(region, {})[chunk] = (arrays[f'count_{r}'][k], arrays[f'mean_{r}'][k],
+                                                        arrays[f'm2_{r}'][k])
+            sketch = QuantileSketch(arrays[f'sketch_lo_{r}'], arrays[f'sketch_hi_{r}'], reference['bins'])
+            for field in ('counts', 'min', 'max'):
+                setattr(sketch, field, arrays[f'sketch_{field}_{r}'])
+            sketches[region] = sketch if region not in sketches else sketches[region].merge(sketch)
+    
+    # Grille des périodes lue dans les métadonnées : la fusion n'a besoin ni du catalogue ni des régions
+    n_chunks = -(-reference['n_scenarios'] // reference['chunk'])
+    years, periods = _period_grid(reference['start_year'], reference['end_year'],
+                                  FREQUENCIES[reference['frequency']])
+    summaries = {}
+    for region in reference['regions']:
+        if sorted(blocks.get(region, {})) != list(range(n_chunks)):
+            raise ValueError(f"Incomplete shards for {region}: chunks {sorted(blocks.get(region, {}))}")
+        
+        # Fusion dans l'ordre des blocs : mêmes opérations que RunningMoments.update bloc par bloc
+        moments = RunningMoments((len(years), len(COLUMN_GRAPH)))
+        for chunk in range(n_chunks):
+            block = RunningMoments(moments.mean.shape)
+            block.count, block.mean, block.m2 = blocks[region][chunk]
+            block.count = int(block.count)
+            moments.merge(block)
+        summaries[region] = _stream_summary(reference['seed'], moments, sketches[region], percentiles, years,
+                                            periods)
+    
+    return summaries
+
+
+def summary_table(summaries):
+    """Table longue (région, période) des résumés : <colonne>_mean, <colonne>_std et <colonne>_P<q>"""
+    import pandas as pd
+    
+    frames = []
+    for region, summary in summaries.items():
+        parts = [summary['mean'].add_suffix('_mean'), summary['std'].add_suffix('_std')]
+        bands = summary['percentiles'].copy()
+        bands.columns = [f'{column}_{label}' for column, label in bands.columns]
+        frame = pd.concat(parts + [bands], axis=1)
+        frames.append(frame)
+    table = pd.concat(frames, keys=list(summaries), names=['region']).reset_index()
+    return table
+
+
+def _parse_regions(value, regions_file=None, catalog=None):
+    """Liste de régions à partir de 'all', d'une liste séparée par des virgules ou d'un fichier"""
+    if regions_file:
+        with open(regions_file, encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip()]
+    if value == 'all':
+        return load_region_catalog(catalog).regions if catalog else list(TEXAS_REGIONS)
+    return [region.strip() for region in value.split(',') if region.strip()]
+
+
+# Budget de démarrage du chemin données seules (temps cumulé des imports, en ms)
+STARTUP_BUDGET_MS = 250
+
+# Modules lourds qui ne doivent jamais être chargés sur le chemin données seules
+HEAVY_MODULES = ('pandas', 'matplotlib', 'seaborn', 'pyarrow')
+
+
+def measure_startup(region="Dallas-Fort Worth", repeat=3, budget_ms=STARTUP_BUDGET_MS):
+    """Mesure le démarrage du chemin données seules avec python -X importtime"""
+    import subprocess
+    
+    best = None
+    with tempfile.TemporaryDirectory() as output_dir:
+        command = [sys.executable, '-X', 'importtime', os.path.abspath(__file__),
+                   '--region', region, '--no-plot', '--seed', '0', '--out', output_dir]
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = subprocess.run(command, capture_output=True, text=True, check=True)
+            wall_ms = (time.perf_counter() - started) * 1000
+            
+            # Lignes "import time: self [us] | cumulative | package" ; seuls les
+            # imports de premier niveau (sans indentation) sont additionnés
+            imports = {}
+            for line in result.stderr.splitlines():
+                if not line.startswith('import time:') or 'cumulative' in line:
+                    continue
+                _, cumulative, package = line.split('|')
+                if not package[1:].startswith(' '):
+                    imports[package.strip()] = int(cumulative) / 1000
+            
+            if best is None or wall_ms < best['wall_ms']:
+                best = {'wall_ms': wall_ms, 'imports': imports}
+    
+    imported = {name.split('.')[0] for name in best['imports']}
+    report = {
+        'region': region,
+        'wall_ms': round(best['wall_ms'], 1),
+        'import_ms': round(sum(best['imports'].values()), 1),
+        'budget_ms': budget_ms,
+        'top_imports': sorted(best['imports'].items(), key=lambda item: -item[1])[:5],
+        'heavy_modules': [name for name in HEAVY_MODULES if name in imported],
+    }
+    report['within_budget'] = report['import_ms'] <= budget_ms and not report['heavy_modules']
+    return report
+
+
+def _parse_years(value):
+    """Horizon 'DÉBUT-FIN' (ex. 2002-2040) -> (début, fin)"""
+    try:
+        start, end = (int(part) for part in value.split('-'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid year range: {value!r} (expected START-END)")
+    if end < start:
+        raise argparse.ArgumentTypeError(f"invalid year range: {value!r} (END before START)")
+    return start, end
+
+
+def _cli_parents(suppress=False):
+    """Parents des options (ensemble, commun) ; suppress : sans valeur par défaut, pour les sous-commandes"""
+    # Options des ensembles (sensibilité, stress, fragments, magasin) : horizon, graine, catalogue
+    ensemble = argparse.ArgumentParser(add_help=False)
+    ensemble.add_argument('--years', type=_parse_years, default=(2002, 2025),
+                          help="simulation horizon as START-END (default: 2002-2025)")
+    ensemble.add_argument('--freq', choices=list(FREQUENCIES), default='annual',
+                          help="series frequency (default: annual)")
+    ensemble.add_argument('--seed', type=int, default=None, help="root random seed")
+    ensemble.add_argument('--out', default='.', help="output directory")
+    ensemble.add_argument('--catalog', default=None, metavar='FILE',
+                          help="region catalog (.json or .csv) instead of the built-in Texas regions")
+    ensemble.add_argument('--correlated', action='store_true',
+                          help="draw correlated noise across columns (correlation model of the region type)")
+    
+    # Options communes au mode région unique et au mode batch
+    common = argparse.ArgumentParser(add_help=False, parents=[ensemble])
+    common.add_argument('--no-plot', action='store_true',
+                        help="write data only (matplotlib is never imported)")
+    common.add_argument('--format', choices=list(DATA_WRITERS), default='csv', help="data output format")
+    common.add_argument('--compression', default=None,
+                        help="codec for parquet/feather/npz (default: zstd for parquet, none otherwise)")
+    common.add_argument('--partitioned', action='store_true',
+                        help="write into one dataset partitioned as region=<slug>/seed=<seed>/")
+    common.add_argument('--cache', default=None, metavar='DIR',
+                        help="on-disk result cache directory (used for runs with --seed)")
+    common.add_argument('--cache-size', type=float, default=256,
+                        help="cache size bound in MB, least recently used entries are evicted (default: 256)")
+    common.add_argument('--compact', action='store_true',
+                        help="store series as float32 and the calendar as small ints")
+    common.add_argument('--timings', action='store_true',
+                        help="write a per-stage JSON timing report next to each data file")
+    common.add_argument('--profile', action='store_true',
+                        help="add cProfile hot spots of each top-level stage to the timing report")
+    common.add_argument('--trace-memory', action='store_true',
+                        help="add tracemalloc peak memory of each stage to the timing report")
+    
+    # Sous-commandes : une option absente ne remplace pas la valeur donnée avant la sous-commande
+    if suppress:
+        for action in common._actions:
+            action.default = argparse.SUPPRESS
+    return ensemble, common
+
+
+def main(argv=None):
+    """Fonction principale pour le Texas"""
+    # Options communes au mode région unique et aux sous-commandes (copies sans valeur par
+    # défaut pour les sous-commandes, qui gardent ainsi les options données avant elles)
+    _, common = _cli_parents()
+    sub_ensemble, sub_common = _cli_parents(suppress=True)
+    
+    parser = argparse.ArgumentParser(description="Texas real estate analysis", parents=[common])
+    parser.add_argument('--region', help="region to analyze without prompting")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    batch = subparsers.add_parser('batch', parents=[sub_common], help="analyze many regions in a process pool")
+    batch.add_argument('--regions', default='all',
+                       help="'all' or a comma-separated list of region names")
+    batch.add_argument('--regions-file', help="file with one region name per line")
+    batch.add_argument('--workers', type=int, default=None,
+                       help="number of worker processes (default: CPU count)")
+    
+    panel = subparsers.add_parser('panel', parents=[sub_common],
+                                  help="simulate many regions in one vectorized pass into one long table")
+    panel.add_argument('--regions', default='all',
+                       help="'all' or a comma-separated list of region names")
+    panel.add_argument('--regions-file', help="file with one region name per line")
+    panel.add_argument('--labels', action='store_true',
+                       help="add the type and segment_immobilier columns next to region")
+    
+    sensitivity = subparsers.add_parser('sensitivity', parents=[sub_ensemble],
+                                        help="rank which parameters drive prices, budgets and affordability")
+    sensitivity.add_argument('--region', required=True, help="region to analyze")
+    sensitivity.add_argument('--samples', type=int, default=4096,
+                             help="parameter sets (base sample size for sobol, a power of 2) (default: 4096)")
+    sensitivity.add_argument('--method', choices=['spearman', 'sobol'], default='spearman',
+                             help="rank correlations on a Latin hypercube or Sobol indices (default: spearman)")
+    sensitivity.add_argument('--spread', type=float, default=0.5,
+                             help="relative range swept around each parameter (default: 0.5)")
+    
+    stress = subparsers.add_parser('stress', parents=[sub_ensemble],
+                                   help="layer random oil, tech and rate shocks on the projection, report tail risk")
+    stress.add_argument('--regions', default='all',
+                        help="'all' or a comma-separated list of region names")
+    stress.add_argument('--regions-file', help="file with one region name per line")
+    stress.add_argument('--scenarios', type=int, default=10_000, help="scenarios per region (default: 10000)")
+    stress.add_argument('--window', type=_parse_years, default=None,
+                        help="years in which shocks may start, as START-END (default: the simulated horizon)")
+    
+    shard = subparsers.add_parser('shard', parents=[sub_ensemble],
+                                  help="compute one shard of a large regions x scenarios ensemble")
+    shard.add_argument('--shards', type=int, required=True, help="total number of shards")
+    shard.add_argument('--shard-id', type=int, required=True, help="shard to compute (0 to shards-1)")
+    shard.add_argument('--regions', default='all',
+                       help="'all' or a comma-separated list of region names")
+    shard.add_argument('--regions-file', help="file with one region name per line")
+    shard.add_argument('--scenarios', type=int, default=100_000, help="scenarios per region (default: 100000)")
+    shard.add_argument('--bins', type=int, default=256, help="quantile sketch bins per cell (default: 256)")
+    
+    merge = subparsers.add_parser('merge', help="merge shard files into per-region ensemble summaries")
+    merge.add_argument('shard_dir', help="directory holding the texas_shard_*.npz files")
+    merge.add_argument('--out', default=argparse.SUPPRESS, help="output directory")
+    merge.add_argument('--percentiles', default='5,50,95', help="comma-separated percentiles (default: 5,50,95)")
+    
+    store = subparsers.add_parser('store', parents=[sub_ensemble],
+                                  help="persist per-region ensembles in a memory-mapped store for fast queries")
+    store.add_argument('--regions', default='all',
+                       help="'all' or a comma-separated list of region names")
+    store.add_argument('--regions-file', help="file with one region name per line")
+    store.add_argument('--scenarios', type=int, default=10_000, help="scenarios per region (default: 10000)")
+    store.add_argument('--compact', action='store_true', default=argparse.SUPPRESS, help="store draws as float32")
+    
+    query = subparsers.add_parser('query', help="query percentiles, means or exceedance from an ensemble store")
+    query.add_argument('store_dir', help="ensemble store directory (with index.json)")
+    query.add_argument('--region', required=True, help="region to query")
+    query.add_argument('--column', required=True, help="column to query (e.g. Median_Home_Price)")
+    query.add_argument('--year', type=int, default=None, help="year (default: every period of the horizon)")
+    query.add_argument('--period', type=int, default=None, help="period within the year (quarter or month)")
+    statistic = query.add_mutually_exclusive_group(required=True)
+    statistic.add_argument('--percentile', type=float, help="percentile to return, in %% (e.g. 90)")
+    statistic.add_argument('--mean', action='store_true', help="return the mean over scenarios")
+    statistic.add_argument('--exceed', type=float, metavar='THRESHOLD',
+                           help="return the probability of exceeding THRESHOLD")
+    
+    startup = subparsers.add_parser('startup', help="measure the data-only startup time against its budget")
+    startup.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS,
+                         help=f"import time budget in ms (default: {STARTUP_BUDGET_MS})")
+    startup.add_argument('--repeat', type=int, default=3, help="runs to keep the best of")
+    
+    args = parser.parse_args(argv)
+    
+    # Options données avant une sous-commande qui ne les accepte pas : refusées plutôt qu'ignorées
+    if args.command is not None:
+        accepted = {action.dest for action in subparsers.choices[args.command]._actions}
+        misplaced = [action.option_strings[0] for action in parser._actions
+                     if action.option_strings and action.dest not in accepted
+                     and getattr(args, action.dest, action.default) != action.default]
+        if misplaced:
+            parser.error(f"{args.command} does not accept {', '.join(misplaced)}")
+    if args.command == 'shard' and args.seed is None:
+        shard.error("--seed is required: every shard of a run must share it")
+    start_year, end_year = args.years
+    
+    if args.command == 'batch':
+        regions = _parse_regions(args.regions, args.regions_file, args.catalog)
+        run_batch(regions, workers=args.workers, seed=args.seed, output_dir=args.out,
+                  plot=not args.no_plot, start_year=start_year, end_year=end_year, fmt=args.format,
+                  partitioned=args.partitioned, compression=args.compression,
+                  cache_dir=args.cache, cache_size=int(args.cache_size * 1024 ** 2), frequency=args.freq,
+                  compact=args.compact, timings=args.timings, profile=args.profile,
+                  trace_memory=args.trace_memory, catalog=args.catalog, correlated=args.correlated)
+    elif args.command == 'panel':
+        os.makedirs(args.out, exist_ok=True)
+        regions = _parse_regions(args.regions, args.regions_file, args.catalog)
+        output_file, elapsed = run_panel(regions, seed=args.seed, output_dir=args.out, start_year=start_year,
+                                         end_year=end_year, fmt=args.format, compression=args.compression,
+                                         frequency=args.freq, compact=args.compact, labels=args.labels,
+                                         timings=args.timings, profile=args.profile,
+                                         trace_memory=args.trace_memory, catalog=args.catalog,
+                                         correlated=args.correlated)
+        print(f"💾 Panel of {len(regions)} regions saved: {output_file} ({elapsed:.2f}s)")
+    elif args.command == 'sensitivity':
+        os.makedirs(args.out, exist_ok=True)
+        table, output_file, elapsed = run_sensitivity(args.region, args.samples, args.method, args.spread,
+                                                      args.seed, args.out, start_year, end_year, args.freq,
+                                                      args.catalog, args.correlated)
+        print(table.round(3).head(10).to_string())
+        print(f"💾 Sensitivity saved: {output_file} ({elapsed:.2f}s)")
+    elif args.command == 'stress':
+        os.makedirs(args.out, exist_ok=True)
+        regions = _parse_regions(args.regions, args.regions_file, args.catalog)
+        table, output_file, elapsed = run_stress(regions, args.scenarios, args.seed, args.out, start_year, end_year,
+                                                 args.window, args.freq, args.catalog, args.correlated)
+        columns = ['home_price_drawdown_p90', 'home_price_drawdown_worst_decile', 'final_home_price_p10']
+        print(table[columns].round(3).to_string())
+        print(f"💾 Stress metrics saved: {output_file} ({elapsed:.2f}s)")
+    elif args.command == 'shard':
+        regions = _parse_regions(args.regions, args.regions_file, args.catalog)
+        output_file, elapsed = run_shard(regions, args.scenarios, args.shards, args.shard_id, args.seed, args.out,
+                                         start_year, end_year, args.freq, args.catalog, args.correlated, args.bins)
+        print(f"💾 Shard {args.shard_id}/{args.shards} saved: {output_file} ({elapsed:.2f}s)")
+    elif args.command == 'merge':
+        os.makedirs(args.out, exist_ok=True)
+        percentiles = [float(q) for q in args.percentiles.split(',')]
+        summaries = merge_shards(args.shard_dir, percentiles)
+        output_file = os.path.join(args.out, 'texas_ensemble_summary.csv')
+        summary_table(summaries).to_csv(output_file, index=False)
+        print(f"💾 Merged {len(summaries)} regions: {output_file}")
+    elif args.command == 'store':
+        regions = _parse_regions(args.regions, args.regions_file, args.catalog)
+        suffix = '' if args.freq == 'annual' else f'_{args.freq}'
+        path = os.path.join(args.out, f'texas_store_{start_year}_{end_year}{suffix}')
+        store, elapsed = build_ensemble_store(path, regions, args.scenarios, args.seed, start_year, end_year,
+                                              args.freq, args.compact, args.catalog, args.correlated)
+        print(f"💾 Ensemble store of {len(regions)} regions x {args.scenarios:,} scenarios saved: {path} "
+              f"({elapsed:.2f}s)")
+    elif args.command == 'query':
+        started = time.perf_counter()
+        store = EnsembleStore(args.store_dir)
+        if args.percentile is not None:
+            value = store.percentile(args.region, args.column, args.percentile, args.year, args.period)
+        elif args.mean:
+            value = store.mean(args.region, args.column, args.year, args.period)
+        else:
+            value = store.exceedance(args.region, args.column, args.exceed, args.year, args.period)
+        print(json.dumps(np.asarray(value).tolist()))
+        print(f"⏱️  {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+    elif args.command == 'startup':
+        report = measure_startup(repeat=args.repeat, budget_ms=args.budget)
+        print(json.dumps(report, indent=2))
+        if not report['within_budget']:
+            sys.exit(1)
+    elif args.region:
+        os.makedirs(args.out, exist_ok=True)
+        _, output_file, elapsed, cache_stats = _run_region(
+            args.region, args.seed, args.out, not args.no_plot, start_year, end_year, args.format,
+            args.partitioned, args.compression, args.cache, int(args.cache_size * 1024 ** 2), args.freq,
+            args.compact, args.timings, args.profile, args.trace_memory, args.catalog, args.correlated)
+        print(f"💾 Data saved: {output_file} ({elapsed:.2f}s)")
+        if cache_stats:
+            print(f"🗄️  Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                  f"{cache_stats['entries']} entries ({cache_stats['bytes'] / 1024 ** 2:.1f} MB)")
+    else:
+        interactive_main()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()